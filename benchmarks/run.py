@@ -0,0 +1,175 @@
+"""Benchmark throughput of fastqc-summary on synthetic FastQC archives.
+
+Times parsing, each summary, end-to-end summarization of single archives through `main()`,
+and batch summarization of many archives, then records the results to a JSON file
+so that throughput can be compared between releases.
+
+Typical usage examples:
+    $ uv run python -m benchmarks.run
+    $ uv run python -m benchmarks.run --scenario long-read --archives 200 --workers 8 -o bench.json
+"""
+
+import argparse
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass
+from importlib.metadata import version
+import io
+import json
+import os
+from pathlib import Path
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable
+from unittest.mock import patch
+
+from benchmarks.synthetic import write_archive
+from fastqc_summary import main
+from fastqc_summary.batch import summarize_archive, summarize_many
+from fastqc_summary.parser import parse_modules
+from fastqc_summary.summaries import SUMMARIES
+
+# archive shapes covering short-read to long-read data
+SCENARIOS = {
+    "short-read": {"read_length": 50},
+    "illumina": {"read_length": 150, "overrepresented": 100},
+    "contaminated": {"read_length": 150, "overrepresented": 5_000, "kmers": 2_000},
+    "long-read": {"read_length": 100_000, "length_bins": 5_000, "overrepresented": 1_000},
+}
+
+@dataclass
+class Timing:
+    """Timing of one benchmark."""
+    scenario: str
+    benchmark: str
+    repeats: int
+    best_seconds: float
+    median_seconds: float
+    items: int
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.best_seconds if self.best_seconds else float("inf")
+
+
+def time_call(func: Callable[[], object], repeats: int) -> list[float]:
+    """Time repeated calls of a function with a monotonic high resolution clock."""
+    seconds = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        seconds.append(time.perf_counter() - start)
+
+    return seconds
+
+
+def run_scenario(scenario: str, archives: int, workers: int, repeats: int, workdir: Path) -> list[Timing]:
+    """Run every benchmark for one scenario."""
+    params = SCENARIOS[scenario]
+    paths = [
+        str(write_archive(workdir / scenario / f"sample{i:05d}_fastqc.zip", seed=i, **params))
+        for i in range(archives)
+    ]
+    single = paths[0]
+    timings = []
+
+    def record(benchmark: str, func: Callable[[], object], items: int = 1) -> None:
+        seconds = time_call(func, repeats)
+        timings.append(Timing(scenario, benchmark, repeats, min(seconds), statistics.median(seconds), items))
+
+    record("parse_modules", lambda: list(parse_modules(single)))
+
+    modules = {module.name: module for module in parse_modules(single)}
+    for summary in SUMMARIES.values():
+        # summaries cache converted columns on the module, so time them on fresh copies of the modules
+        def summarize_fresh(summary=summary) -> None:
+            fresh = [modules[name] for name in summary.modules]
+            summary.function(*(type(m)(m.name, m.status, m.columns, m.data, m.properties) for m in fresh))
+
+        record(summary.function.__name__, summarize_fresh)
+
+    record("summarize_archive", lambda: summarize_archive(single))
+    record("summarize_archive[all]", lambda: summarize_archive(single, summary_names=list(SUMMARIES)))
+
+    def run_main() -> None:
+        with patch("sys.argv", ["fastqc-summary", single]), redirect_stdout(io.StringIO()):
+            main()
+
+    record("main", run_main)
+    record("summarize_many[serial]", lambda: list(summarize_many(paths)), items=archives)
+    if workers > 1:
+        record(f"summarize_many[{workers} workers]", lambda: list(summarize_many(paths, workers=workers)), items=archives)
+
+    return timings
+
+
+def get_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark fastqc-summary on synthetic FastQC archives.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--scenario", choices=list(SCENARIOS), action="append", help="Scenario to run. [None] runs every scenario.")
+    parser.add_argument("--archives", type=int, default=50, help="Number of archives to summarize in batch benchmarks.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of workers for batch benchmarks.")
+    parser.add_argument("--repeats", type=int, default=5, help="Number of times to repeat each benchmark.")
+    parser.add_argument("-o", "--output", type=str, default="bench_output.json", help="Path to JSON file to record results to.")
+    parser.add_argument("--baseline", type=str, default=None, help="Path to JSON file of results from a previous run to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Fraction a benchmark may slow down relative to the baseline before failing.")
+
+    return parser.parse_args(argv)
+
+
+def main_benchmarks(argv: list[str] | None = None) -> None:
+    args = get_args(argv)
+
+    timings = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for scenario in args.scenario or SCENARIOS:
+            for timing in run_scenario(scenario, args.archives, args.workers, args.repeats, Path(workdir)):
+                timings.append(timing)
+                print(
+                    f"{timing.scenario:>14} {timing.benchmark:<32} "
+                    f"best {timing.best_seconds * 1000:10.3f} ms  {timing.items_per_second:12.1f} items/s",
+                    file=sys.stderr,
+                )
+
+    results = {
+        "fastqc_summary_version": version("fastqc-summary"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timings": [{**asdict(timing), "items_per_second": timing.items_per_second} for timing in timings],
+    }
+    with open(args.output, "w") as output_json:
+        json.dump(results, output_json, indent=2)
+
+    if args.baseline is not None:
+        regressions = compare(results["timings"], args.baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+def compare(timings: list[dict], baseline: str, tolerance: float) -> list[str]:
+    """Compare timings against a baseline and describe every benchmark that slowed down beyond the tolerance."""
+    with open(baseline, "r") as baseline_json:
+        baseline_timings = {(t["scenario"], t["benchmark"]): t for t in json.load(baseline_json)["timings"]}
+
+    regressions = []
+    for timing in timings:
+        previous = baseline_timings.get((timing["scenario"], timing["benchmark"]))
+        if previous is None:
+            continue
+
+        slowdown = timing["best_seconds"] / previous["best_seconds"] - 1
+        if slowdown > tolerance:
+            regressions.append(f"{timing['scenario']} {timing['benchmark']} is {slowdown:.0%} slower than baseline")
+
+    return regressions
+
+
+if __name__ == "__main__":
+    main_benchmarks()
@@ -0,0 +1,115 @@
+"""Benchmark the startup time of fastqc-summary.
+
+Measures the import time of the modules loaded on each path through the app with `python -X importtime`,
+including the modules `main()` imports before exiting on `--help`,
+and the wall clock time of whole invocations of the app in fresh interpreters,
+then fails if importing the modules of the single archive fast path exceeds a budget.
+
+Typical usage examples:
+    $ uv run python -m benchmarks.startup
+    $ uv run python -m benchmarks.startup --budget-ms 25 --repeats 20
+"""
+
+import argparse
+import os
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import write_archive
+
+# code run by each path through the app, importing its modules
+IMPORTS = {
+    "package": "import fastqc_summary",
+    "single archive": "import fastqc_summary.batch",
+    "full CLI": "import fastqc_summary.cli",
+    "help": "import sys; from fastqc_summary import main; sys.argv = ['fastqc-summary', '--help']; main()",
+}
+
+FAST_PATH = "single archive"
+
+
+def import_times(code: str) -> dict[str, tuple[int, int]]:
+    """Run code in a fresh interpreter and parse the self and cumulative microseconds of every import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+
+    return times
+
+
+def _total_us(times: dict[str, tuple[int, int]]) -> int:
+    return sum(self_us for self_us, _ in times.values())
+
+
+def time_invocation(argv: list[str], repeats: int) -> list[float]:
+    """Time whole invocations of the app in fresh interpreters."""
+    command = [sys.executable, "-c", "import sys; from fastqc_summary import main; sys.argv[0] = 'fastqc-summary'; main()", *argv]
+    environment = {key: value for key, value in os.environ.items() if key != "FASTQC_SUMMARY_CACHE_DIR"}
+
+    seconds = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(command, capture_output=True, check=True, env=environment)
+        seconds.append(time.perf_counter() - start)
+
+    return seconds
+
+
+def get_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the startup time of fastqc-summary.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--repeats", type=int, default=10, help="Number of times to repeat each measurement.")
+    parser.add_argument("--budget-ms", type=float, default=30.0, help="Budget in milliseconds for importing the modules of the single archive fast path.")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports of the fast path to list.")
+
+    return parser.parse_args(argv)
+
+
+def main_startup(argv: list[str] | None = None) -> None:
+    args = get_args(argv)
+
+    # the best of repeated imports is the least noisy, counting every import of the path, including deferred ones
+    best = {}
+    for path, code in IMPORTS.items():
+        runs = [import_times(code) for _ in range(args.repeats)]
+        best[path] = min(runs, key=_total_us)
+        print(f"{path:>16} import {len(best[path]):4d} modules best {_total_us(best[path]) / 1000:8.2f} ms", file=sys.stderr)
+
+    fast_path = best[FAST_PATH]
+    print(f"Slowest imports of the {FAST_PATH} path by self time:", file=sys.stderr)
+    for name, (self_us, _) in sorted(fast_path.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"{self_us / 1000:8.2f} ms  {name}", file=sys.stderr)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        archive = str(write_archive(Path(workdir) / "sample_fastqc.zip", read_length=150, seed=0))
+        for name, invocation in [("single archive", [archive]), ("help", ["--help"])]:
+            seconds = time_invocation(invocation, args.repeats)
+            print(
+                f"{name:>16} run    best {min(seconds) * 1000:8.2f} ms  median {statistics.median(seconds) * 1000:8.2f} ms",
+                file=sys.stderr,
+            )
+
+    fast_path_ms = _total_us(fast_path) / 1000
+    if fast_path_ms > args.budget_ms:
+        print(f"Regression: importing the {FAST_PATH} path takes {fast_path_ms:.2f} ms, over the {args.budget_ms:.2f} ms budget", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_startup()
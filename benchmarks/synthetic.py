@@ -0,0 +1,165 @@
+"""Generate synthetic FastQC ZIP archives for benchmarking.
+
+Synthetic archives follow the layout of archives written by FastQC, i.e. a '<sample>_fastqc/fastqc_data.txt' file
+inside of a '<sample>_fastqc.zip' archive, with every module FastQC writes.
+The number of rows in the modules scales with the read length, the number of overrepresented sequences,
+and the number of sequence length bins so that short-read and long-read archives can be simulated.
+
+Typical usage examples:
+    >>> from benchmarks.synthetic import write_archive
+    >>> write_archive("bench/long_fastqc.zip", read_length=100_000, length_bins=5_000)
+"""
+
+from pathlib import Path
+import random
+import zipfile
+
+STATUSES = ("pass", "warn", "fail")
+
+ADAPTERS = ("Illumina Universal Adapter", "Illumina Small RNA 3' Adapter", "Nextera Transposase Sequence", "SOLID Small RNA Adapter")
+
+
+def make_fastqc_data(
+    read_length: int = 150,
+    read_count: int = 10_000_000,
+    overrepresented: int = 0,
+    length_bins: int = 1,
+    kmers: int = 20,
+    seed: int = 0,
+) -> str:
+    """Make the contents of a synthetic fastqc_data.txt file.
+
+    Args:
+        read_length: Maximum read length. Per base modules have one row per base.
+        read_count: Total count of reads.
+        overrepresented: Number of rows in the Overrepresented sequences module.
+        length_bins: Number of rows in the Sequence Length Distribution module.
+            Lengths are binned, e.g. '35-39', when there are fewer bins than read lengths.
+        kmers: Number of rows in the Kmer Content module.
+        seed: Seed for the random values in the modules.
+
+    Returns:
+        The contents of a fastqc_data.txt file.
+    """
+    rng = random.Random(seed)
+    lines = ["##FastQC\t0.12.1"]
+
+    def module(name: str, header: str, rows: list[str]) -> None:
+        lines.append(f">>{name}\t{rng.choice(STATUSES)}")
+        lines.append(f"#{header}")
+        lines.extend(rows)
+        lines.append(">>END_MODULE")
+
+    module("Basic Statistics", "Measure\tValue", [
+        "Filename\tsynthetic.fastq.gz",
+        "File type\tConventional base calls",
+        "Encoding\tSanger / Illumina 1.9",
+        f"Total Sequences\t{read_count}",
+        "Total Bases\t1.5 Gbp",
+        "Sequences flagged as poor quality\t0",
+        f"Sequence length\t1-{read_length}" if length_bins > 1 else f"Sequence length\t{read_length}",
+        "%GC\t47",
+    ])
+    module(
+        "Per base sequence quality",
+        "Base\tMean\tMedian\tLower Quartile\tUpper Quartile\t10th Percentile\t90th Percentile",
+        [f"{base}\t{rng.uniform(20, 40)}\t33.0\t30.0\t35.0\t27.0\t37.0" for base in range(1, read_length + 1)],
+    )
+    module(
+        "Per sequence quality scores",
+        "Quality\tCount",
+        [f"{quality}\t{float(rng.randrange(read_count // 20))}" for quality in range(2, 41)],
+    )
+    module(
+        "Per base sequence content",
+        "Base\tG\tA\tT\tC",
+        [f"{base}\t25.0\t25.0\t25.0\t25.0" for base in range(1, read_length + 1)],
+    )
+    module(
+        "Per sequence GC content",
+        "GC Content\tCount",
+        [f"{gc}\t{float(rng.randrange(read_count // 50))}" for gc in range(0, 101)],
+    )
+    module(
+        "Per base N content",
+        "Base\tN-Count",
+        [f"{base}\t0.0" for base in range(1, read_length + 1)],
+    )
+    module(
+        "Sequence Length Distribution",
+        "Length\tCount",
+        _length_rows(read_length, read_count, length_bins),
+    )
+    lines.append(f">>Sequence Duplication Levels\t{rng.choice(STATUSES)}")
+    lines.append("#Total Deduplicated Percentage\t91.5")
+    lines.append("#Duplication Level\tPercentage of deduplicated\tPercentage of total")
+    lines.extend(f"{level}\t{rng.random()}\t{rng.random()}" for level in [*range(1, 10), ">10", ">50", ">100", ">500", ">1k", ">5k", ">10k+"])
+    lines.append(">>END_MODULE")
+    module(
+        "Overrepresented sequences",
+        "Sequence\tCount\tPercentage\tPossible Source",
+        [f"{_sequence(rng, 50)}\t{rng.randrange(1000, 100_000)}\t{rng.random()}\tNo Hit" for _ in range(overrepresented)],
+    )
+    module(
+        "Adapter Content",
+        "Position\t" + "\t".join(ADAPTERS),
+        [f"{base}" + "\t0.0" * len(ADAPTERS) for base in range(1, read_length + 1)],
+    )
+    module(
+        "Kmer Content",
+        "Sequence\tCount\tPValue\tObs/Exp Max\tMax Obs/Exp Position",
+        [f"{_sequence(rng, 7)}\t{rng.randrange(1000, 20_000)}\t0.0\t{rng.uniform(5, 30)}\t1" for _ in range(kmers)],
+    )
+
+    return "\n".join(lines) + "\n"
+
+
+def _length_rows(read_length: int, read_count: int, length_bins: int) -> list[str]:
+    if length_bins <= 1:
+        return [f"{read_length}\t{float(read_count)}"]
+
+    width = max(1, read_length // length_bins)
+    count = read_count / length_bins
+    rows = []
+    for lower in range(1, read_length + 1, width):
+        upper = min(lower + width - 1, read_length)
+        length = f"{lower}-{upper}" if upper > lower else f"{lower}"
+        rows.append(f"{length}\t{count:.1f}")
+
+    return rows
+
+
+def _sequence(rng: random.Random, length: int) -> str:
+    return "".join(rng.choice("ACGT") for _ in range(length))
+
+
+def make_summary(fastqc_data: str, filename: str = "synthetic.fastq.gz") -> str:
+    """Make the contents of the summary.txt file matching a synthetic fastqc_data.txt file."""
+    rows = []
+    for line in fastqc_data.splitlines():
+        if line.startswith(">>") and not line.startswith(">>END_MODULE"):
+            name, status = line[2:].split("\t")
+            rows.append(f"{status.upper()}\t{name}\t{filename}")
+
+    return "\n".join(rows) + "\n"
+
+
+def write_archive(path: str | Path, **params) -> Path:
+    """Write a synthetic FastQC ZIP archive.
+
+    Args:
+        path: Path to write the FastQC ZIP archive to. Should end with '_fastqc.zip'.
+        **params: Parameters passed on to `make_fastqc_data()`.
+
+    Returns:
+        Path to the FastQC ZIP archive.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    sample = path.name.removesuffix(".zip")
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        fastqc_data = make_fastqc_data(**params)
+        archive.writestr(f"{sample}/summary.txt", make_summary(fastqc_data))
+        archive.writestr(f"{sample}/fastqc_data.txt", fastqc_data)
+
+    return path
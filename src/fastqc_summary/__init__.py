@@ -1,15 +1,16 @@
-import json
+"""FastQC Summary CLI app.
+
+Imports of the rest of the package are deferred into `main()` so that starting the app stays fast,
+since the app is often started once per FastQC archive, e.g. by workflow managers.
+"""
+
+import os
 import sys
+from typing import Iterable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from fastqc_summary.writers import SummaryWriter
 
-from fastqc_summary.cli import get_args
-from fastqc_summary.parser import (
-    Module,
-    parse_modules,
-)
-from fastqc_summary.summaries import (
-    summarize_base_count,
-    summarize_read_count,
-)
 
 def main() -> None:
     """FastQC summary application logic.
@@ -17,24 +18,271 @@ def main() -> None:
     `main()` serves as the entrypoint for the FastQC summary CLI application.
     It parses and validates command-line arguments, computes summaries on FastQC data, and writes those summaries.
 
+    A single FastQC archive is summarized as one JSON object by default.
+    In batch mode, each FastQC archive is summarized as one record keyed by sample name and written as soon as it is ready.
+    Bundles of FastQC archives are summarized in batch mode without extracting them to disk.
+    The summaries of the FastQC archives of each sample, e.g. its mates and lanes, can be merged into one record per sample.
+    A cohort report of statistics over every summarized FastQC archive can be aggregated in the same pass.
+    FastQC archives can be gated on quality control rules, exiting with status 1 if any sample fails.
+    The status of every FastQC module can be written instead of summaries, without parsing any module data.
+    In watch mode, only new or modified FastQC archives in a directory are summarized and their records are appended to the output.
+    The time spent in each phase of summarizing each FastQC archive can be recorded alongside.
+    The 'serve' subcommand serves summaries over HTTP from a long-running process instead.
+
     `main()` takes no argument and returns no values.
     """
+    if sys.argv[1:2] == ["serve"]:
+        _main_serve(sys.argv[2:])
+        return
+
+    # summarize a single FastQC archive with default options without loading the full CLI
+    if _main_single(sys.argv[1:]):
+        return
+
+    from contextlib import ExitStack
+
+    from fastqc_summary.cli import get_args
+    from fastqc_summary.printerr import printerr
 
+    # arguments are parsed before anything else is imported, so that e.g. `--help` stays fast,
+    # and the modules of each feature are only imported when its flags are set
     args = get_args()
 
-    # map the modules needed to compute the summaries to an in memory representation of the modules
-    modules = dict.fromkeys(("Basic Statistics", "Sequence Length Distribution"), None)
-    for module in parse_modules(args.fastqc_archive):
-        if module.name in modules.keys():
-            modules[module.name] = module
-
-    # compute the summaries
-    summaries = {}
-    summaries.update(summarize_read_count(modules["Basic Statistics"]))
-    summaries.update(summarize_base_count(modules["Sequence Length Distribution"]))
-
-    if isinstance(args.output, str):
-        with open(args.output, "w") as output_json:
-            json.dump(summaries, output_json)
-    elif args.output == sys.stdout:
-        json.dump(summaries, args.output)
+    from fastqc_summary.writers import make_writer
+
+    gate = tally = None
+    if args.gate is not None:
+        from fastqc_summary.gate import GateTally, load_gate
+
+        gate = load_gate(args.gate, args.fail_fast)
+        tally = GateTally()
+
+    # merged means and medians are weighted by read count, so read counts are computed even when not selected
+    summary_names = args.summary_names
+    merger = None
+    if args.merge_samples is not None:
+        from fastqc_summary.merge import read_sample_sheet, SampleGrouper, SampleMerger
+
+        grouper = SampleGrouper(args.merge_samples, read_sample_sheet(args.sample_sheet) if args.sample_sheet else None)
+        # the FastQC archives in bundles are only known once they are read, so samples are then merged at the end
+        expected = grouper.expected(args.fastqc_archives) if not args.bundles else None
+        drop = [] if "read_count" in summary_names else ["read_count"]
+        summary_names = [*summary_names, *drop]
+        merger = SampleMerger(grouper, expected, drop=drop)
+
+    # unreadable FastQC archives are reported as they fail, and fail the run once every other record is written
+    failed = []
+
+    def on_error(fastqc_archive: str, error: Exception) -> None:
+        failed.append(fastqc_archive)
+        print(f"Error: Could not summarize '{fastqc_archive}': {error or type(error).__name__}", file=sys.stderr)
+
+    recorder = on_timings = None
+    if args.timings:
+        from fastqc_summary.timings import TimingsRecorder
+
+        recorder = TimingsRecorder()
+        on_timings = recorder.add
+
+    profiler = None
+    if args.profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    with ExitStack() as stack:
+        cache = exporter = state = None
+        if args.cache_dir:
+            from fastqc_summary.cache import SummaryCache
+
+            cache = stack.enter_context(SummaryCache(args.cache_dir, args.cache_size))
+        if args.export_dir:
+            from fastqc_summary.export import ModuleExporter
+
+            exporter = stack.enter_context(ModuleExporter(args.export_dir, args.export_modules, args.export_format))
+        if args.watch_dir:
+            from fastqc_summary.watch import watch, WatchState
+
+            state = stack.enter_context(WatchState(args.state_file))
+
+        # compute the summaries
+        if state is not None:
+            results = watch(
+                args.watch_dir,
+                state,
+                poll=args.poll,
+                workers=args.workers,
+                executor=args.executor,
+                cache=cache,
+                refresh=args.refresh,
+                length_mode=args.length_mode,
+                exporter=exporter,
+                summary_names=args.summary_names,
+                on_timings=on_timings,
+                max_rows=args.max_rows,
+                gate=gate,
+                on_error=on_error,
+            )
+        elif args.statuses:
+            from fastqc_summary.bundle import read_input_statuses
+
+            results = read_input_statuses(
+                args.fastqc_archives,
+                bundles=set(args.bundles),
+                workers=args.workers,
+                executor=args.executor,
+                ordered=args.ordered,
+                on_error=on_error,
+            )
+        else:
+            from fastqc_summary.bundle import summarize_inputs
+
+            results = summarize_inputs(
+                args.fastqc_archives,
+                bundles=set(args.bundles),
+                workers=args.workers,
+                executor=args.executor,
+                cache=cache,
+                refresh=args.refresh,
+                length_mode=args.length_mode,
+                ordered=args.ordered,
+                exporter=exporter,
+                summary_names=summary_names,
+                on_timings=on_timings,
+                max_rows=args.max_rows,
+                gate=gate,
+                on_error=on_error,
+            )
+
+        # merge the summaries of each sample as soon as all of its FastQC archives are summarized
+        if merger is not None:
+            results = merger.fold(results)
+
+        # tally the verdicts of the gate per sample
+        if tally is not None:
+            results = tally.fold(results)
+
+        # fold the summaries into cohort statistics as they are written
+        aggregator = None
+        if args.report:
+            from fastqc_summary.aggregate import CohortAggregator
+
+            aggregator = CohortAggregator(args.group_by)
+            results = aggregator.fold(results)
+        if recorder is not None:
+            results = recorder.fold(results)
+
+        # status maps differ between FastQC archives, e.g. of empty FASTQ files, so tables of statuses have a fixed header,
+        # and modules of other FastQC versions are collected in one last column
+        columns = other = None
+        if args.statuses:
+            from fastqc_summary.constants import FASTQC_MODULES
+
+            columns = [*FASTQC_MODULES, *(["archives"] if merger is not None else [])]
+            other = "other"
+
+        # watch mode appends the records of new FastQC archives to the existing output
+        mode = "a" if state is not None else "w"
+        try:
+            if isinstance(args.output, str):
+                with open(args.output, mode) as output_file:
+                    write_summaries(results, make_writer(args.output_format, output_file, args.flush_every, columns, other))
+            elif args.output == sys.stdout:
+                write_summaries(results, make_writer(args.output_format, args.output, args.flush_every, columns, other))
+        except KeyboardInterrupt:
+            # polling runs until interrupted
+            if args.poll is None:
+                raise
+
+        if aggregator is not None:
+            import json
+
+            with open(args.report, "w") as report_file:
+                json.dump(aggregator.report(), report_file, indent=2)
+
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+
+    if recorder is not None:
+        import json
+
+        if args.timings == "-":
+            json.dump(recorder.report(), sys.stderr, indent=2)
+            sys.stderr.write("\n")
+        else:
+            with open(args.timings, "w") as timings_file:
+                json.dump(recorder.report(), timings_file, indent=2)
+
+    # fail the run once every record is written
+    if failed:
+        printerr(f"{len(failed)} FastQC archives could not be summarized: {', '.join(failed)}")
+    if tally is not None and tally.failed:
+        printerr(f"{len(tally.failed)} of {sum(tally.counts.values())} samples failed the QC gate: {', '.join(tally.failed)}")
+
+
+def _main_serve(argv: list[str]) -> None:
+    """Serve summaries over HTTP until interrupted."""
+    from fastqc_summary.cli import get_serve_args
+    from fastqc_summary.serve import make_server, SummaryService
+
+    args = get_serve_args(argv)
+
+    with SummaryService(args.root, args.workers, args.executor, args.lru_size) as service:
+        server = make_server(service, args.host, args.port, args.socket_path, args.verbose)
+        address = args.socket_path or f"http://{server.server_address[0]}:{server.server_address[1]}"
+        print(f"Serving FastQC summaries of '{args.root}' on {address}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+def _main_single(argv: list[str]) -> bool:
+    """Summarize a single FastQC archive with default options, the most common call, without parsing arguments.
+
+    Returns:
+        True if the FastQC archive was summarized, or False if the arguments need the full CLI.
+    """
+    # options and missing files are handled by the full CLI
+    if len(argv) != 1 or argv[0].startswith("-") or not os.path.exists(argv[0]):
+        return False
+
+    import json
+
+    from fastqc_summary.batch import summarize_archive
+    from fastqc_summary.bundle import is_bundle
+
+    if is_bundle(argv[0]):
+        return False
+
+    # a cache hit only reads the central directory of the FastQC archive and one row of the cache
+    cache_dir = os.environ.get("FASTQC_SUMMARY_CACHE_DIR")
+    if cache_dir:
+        from fastqc_summary.batch import summarize_many
+        from fastqc_summary.cache import SummaryCache
+
+        with SummaryCache(cache_dir) as cache:
+            [(_, summaries)] = summarize_many([argv[0]], cache=cache)
+    else:
+        summaries = summarize_archive(argv[0])
+
+    json.dump(summaries, sys.stdout)
+    sys.stdout.flush()
+
+    return True
+
+
+def write_summaries(results: Iterable[tuple[str, dict[str, int]]], writer: "SummaryWriter") -> None:
+    """Write summaries as they are computed.
+
+    Args:
+        results: An iterable of tuples of sample name and summaries.
+        writer: A writer of summaries.
+    """
+    with writer:
+        for sample, summaries in results:
+            writer.write(sample, summaries)
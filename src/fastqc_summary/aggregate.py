@@ -0,0 +1,203 @@
+"""Aggregate summaries of many FastQC archives into cohort statistics.
+
+Summaries are folded into running statistics as they stream out of a batch run,
+so the cohort report comes out of the same pass as the per-archive summaries.
+Samples can be grouped by a regular expression on the sample name, e.g. by project or lane.
+
+Means and variances are updated with Welford's online algorithm.
+Quantiles are exact; the values they need, and the indexes of their samples to flag outliers by,
+are held in compact typed arrays of 16 bytes per sample and summary. Sample names are held once per cohort.
+
+Typical usage examples:
+    >>> from fastqc_summary.aggregate import CohortAggregator
+    >>> from fastqc_summary.batch import summarize_many
+    >>> aggregator = CohortAggregator(group_by=r"_(L\\d{3})_")
+    >>> for sample, summaries in aggregator.fold(summarize_many(["a_L001_fastqc.zip", "b_L002_fastqc.zip"])):
+    >>>     print(sample, summaries)
+    >>> report = aggregator.report()
+"""
+
+from array import array
+import math
+import re
+from typing import Iterable, Iterator, Sequence
+
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+UNGROUPED = "ungrouped"
+"""Group of samples whose names do not match the group regular expression."""
+
+
+class RunningStats:
+    """Running statistics of one summary over many samples.
+
+    Samples are added by their index into a list of sample names, which can be shared by the statistics of many summaries.
+
+    Attributes:
+        samples: Names of the samples.
+        count: Number of values.
+        total: Sum of the values, exact for integer summaries such as read counts.
+        mean: Mean of the values.
+        minimum: Smallest value.
+        maximum: Largest value.
+    """
+
+    def __init__(self, samples: Sequence[str] = ()) -> None:
+        self.samples = samples
+        self.count = 0
+        self.total = 0
+        self.mean = 0.0
+        self.minimum = None
+        self.maximum = None
+        self._m2 = 0.0
+        self._values = array("d")
+        self._indexes = array("q")
+
+    def add(self, sample: int, value: float) -> None:
+        """Add the value of a sample, by its index into the sample names."""
+        self.count += 1
+        self.total += value
+
+        # Welford's online update of the mean and the sum of squared deviations
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        self._values.append(value)
+        self._indexes.append(sample)
+
+    @property
+    def variance(self) -> float | None:
+        """Sample variance of the values, or None for fewer than two values."""
+        return self._m2 / (self.count - 1) if self.count > 1 else None
+
+    def quantiles(self, probabilities: Sequence[float] = DEFAULT_QUANTILES) -> dict[str, float]:
+        """Compute exact quantiles of the values by linear interpolation between the closest ranks."""
+        ordered = sorted(self._values)
+        return {str(p): _quantile(ordered, p) for p in probabilities} if ordered else {}
+
+    def outliers(self, iqr_factor: float = 1.5) -> list[str]:
+        """Find the samples with values beyond Tukey's fences, `iqr_factor` interquartile ranges outside the quartiles."""
+        if self.count < 4:
+            return []
+
+        ordered = sorted(self._values)
+        lower_quartile, upper_quartile = _quantile(ordered, 0.25), _quantile(ordered, 0.75)
+        spread = iqr_factor * (upper_quartile - lower_quartile)
+        low, high = lower_quartile - spread, upper_quartile + spread
+
+        return [self.samples[index] for index, value in zip(self._indexes, self._values) if not low <= value <= high]
+
+    def as_dict(self, probabilities: Sequence[float] = DEFAULT_QUANTILES, iqr_factor: float = 1.5) -> dict:
+        """Report the statistics as a JSON serializable dict."""
+        variance = self.variance
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.mean if self.count else None,
+            "variance": variance,
+            "std": math.sqrt(variance) if variance is not None else None,
+            "min": self.minimum,
+            "max": self.maximum,
+            "quantiles": self.quantiles(probabilities),
+            "outliers": self.outliers(iqr_factor),
+        }
+
+
+def _quantile(ordered: Sequence[float], probability: float) -> float:
+    position = probability * (len(ordered) - 1)
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class CohortAggregator:
+    """Fold summaries of many FastQC archives into cohort statistics per group of samples.
+
+    Numeric summaries are aggregated. Missing summaries, e.g. None for modules left out of FastQC reports, are skipped.
+
+    Attributes:
+        group_by: A regular expression matched against sample names to group samples by, or None for no groups.
+            The group is the text of the capture groups joined by '_', or of the whole match if there are none.
+        quantiles: Probabilities of the quantiles to report.
+        outlier_iqr: Interquartile ranges beyond the quartiles at which values are flagged as outliers.
+    """
+
+    def __init__(
+        self,
+        group_by: str | re.Pattern | None = None,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+        outlier_iqr: float = 1.5,
+    ) -> None:
+        if any(not 0 <= p <= 1 for p in quantiles):
+            raise ValueError(f"Quantiles must be between 0 and 1, got {list(quantiles)}.")
+
+        self.group_by = re.compile(group_by) if isinstance(group_by, str) else group_by
+        self.quantiles = tuple(quantiles)
+        self.outlier_iqr = outlier_iqr
+        self._cohort = {}
+        self._groups = {}
+        self._samples = []
+        self._group_samples = {}
+
+    def group(self, sample: str) -> str | None:
+        """Find the group of a sample, or None when samples are not grouped."""
+        if self.group_by is None:
+            return None
+
+        match = self.group_by.search(sample)
+        if match is None:
+            return UNGROUPED
+
+        return "_".join(g for g in match.groups() if g is not None) if match.groups() else match.group(0)
+
+    def add(self, sample: str, summaries: dict) -> None:
+        """Add the summaries of a FastQC archive to the running statistics of the cohort and of its group."""
+        index = len(self._samples)
+        self._samples.append(sample)
+        targets = [self._cohort]
+
+        group = self.group(sample)
+        if group is not None:
+            targets.append(self._groups.setdefault(group, {}))
+            self._group_samples[group] = self._group_samples.get(group, 0) + 1
+
+        for key, value in summaries.items():
+            # only numbers are aggregated, bools are excluded even though they are ints
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            for stats in targets:
+                if key not in stats:
+                    stats[key] = RunningStats(self._samples)
+                stats[key].add(index, value)
+
+    def fold(self, results: Iterable[tuple[str, dict]]) -> Iterator[tuple[str, dict]]:
+        """Add summaries to the running statistics as they stream past, yielding them unchanged."""
+        for sample, summaries in results:
+            self.add(sample, summaries)
+            yield sample, summaries
+
+    def report(self) -> dict:
+        """Report the statistics of the cohort and of each group.
+
+        Returns:
+            A JSON serializable dict with the number of samples and the statistics of each summary,
+            for the whole cohort and for each group when samples are grouped.
+        """
+        report = {"cohort": self._report(self._cohort, len(self._samples))}
+        if self.group_by is not None:
+            report["groups"] = {
+                group: self._report(stats, self._group_samples[group])
+                for group, stats in sorted(self._groups.items())
+            }
+
+        return report
+
+    def _report(self, stats: dict[str, RunningStats], samples: int) -> dict:
+        return {
+            "samples": samples,
+            "summaries": {key: s.as_dict(self.quantiles, self.outlier_iqr) for key, s in stats.items()},
+        }
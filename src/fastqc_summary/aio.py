@@ -0,0 +1,112 @@
+"""Summarize FastQC archives from asyncio applications.
+
+The summaries are computed without blocking the event loop.
+The bytes of each FastQC archive are prefetched with bounded concurrency in a thread,
+then decompressed, parsed, and summarized in an executor, so that storage latency overlaps with parsing.
+
+Typical usage examples:
+    >>> import asyncio
+    >>> from concurrent.futures import ProcessPoolExecutor
+    >>> import multiprocessing
+    >>> from fastqc_summary.aio import summarize_many_async
+    >>> async def run(paths):
+    >>>     with ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn")) as executor:
+    >>>         async for sample, summaries in summarize_many_async(paths, concurrency=16, executor=executor):
+    >>>             print(sample, summaries)
+    >>> asyncio.run(run(["a_fastqc.zip", "b_fastqc.zip"]))
+"""
+
+import asyncio
+from concurrent.futures import Executor
+import io
+from pathlib import Path
+from typing import AsyncIterator, Collection, Iterable
+
+from fastqc_summary.batch import sample_name, summarize_archive
+from fastqc_summary.parser import find_fastqc_data_path
+from fastqc_summary.summaries import DEFAULT_SUMMARIES
+
+
+async def summarize_many_async(
+    fastqc_archives: Iterable[str],
+    concurrency: int = 8,
+    executor: Executor | None = None,
+    length_mode: str = "midpoint",
+    summary_names: Collection[str] = DEFAULT_SUMMARIES,
+) -> AsyncIterator[tuple[str, dict[str, int]]]:
+    """Compute the summaries for many FastQC archives without blocking the event loop.
+
+    At most `concurrency` archives are in flight at once, which bounds both the number of concurrent reads
+    and the number of archives held in memory.
+    Summaries are yielded as soon as each archive is summarized, so they may be out of input order.
+
+    Args:
+        fastqc_archives: Paths to FastQC ZIP archive files, FastQC output directories, or FastQC data files.
+        concurrency: Maximum number of archives to read and summarize at once.
+        executor: Executor to parse and summarize archives in. Leave as None to use the default executor of the event loop.
+            Use a process pool to parse archives in parallel. Prefer a pool that spawns workers,
+            since prefetching uses threads and forking a multi-threaded process is unsafe.
+        length_mode: Length of reads in binned lengths, one of [lower, midpoint, upper].
+        summary_names: Names of registered summaries to compute.
+
+    Yields:
+        A tuple of the sample name and the summaries for each archive.
+
+    Raises:
+        ValueError: The concurrency is invalid.
+    """
+    if concurrency < 1:
+        raise ValueError(f"Concurrency must be at least 1, got {concurrency}.")
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def summarize(fastqc_archive: str) -> tuple[str, dict[str, int]]:
+        async with semaphore:
+            fastqc_bytes = await asyncio.to_thread(read_fastqc_bytes, fastqc_archive)
+            summaries = await loop.run_in_executor(executor, summarize_bytes, fastqc_bytes, length_mode, summary_names)
+
+        return sample_name(fastqc_archive), summaries
+
+    tasks = [asyncio.create_task(summarize(fastqc_archive)) for fastqc_archive in fastqc_archives]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        # stop outstanding work if the consumer stops early or an archive fails
+        for task in tasks:
+            task.cancel()
+
+
+def read_fastqc_bytes(fastqc_archive: str) -> bytes:
+    """Read the raw bytes of a FastQC input.
+
+    Args:
+        fastqc_archive: Path to a FastQC ZIP archive file, FastQC output directory, or FastQC data file.
+
+    Returns:
+        The bytes of the FastQC ZIP archive or FastQC data file.
+    """
+    path = Path(fastqc_archive)
+    if path.is_dir():
+        path = find_fastqc_data_path(path)
+
+    return path.read_bytes()
+
+
+def summarize_bytes(
+    fastqc_bytes: bytes,
+    length_mode: str = "midpoint",
+    summary_names: Collection[str] = DEFAULT_SUMMARIES,
+) -> dict[str, int]:
+    """Compute the summaries of a FastQC input held in memory.
+
+    Args:
+        fastqc_bytes: The bytes of a FastQC ZIP archive or FastQC data file.
+        length_mode: Length of reads in binned lengths, one of [lower, midpoint, upper].
+        summary_names: Names of registered summaries to compute.
+
+    Returns:
+        A dict mapping summary keys to summary values.
+    """
+    return summarize_archive(io.BytesIO(fastqc_bytes), length_mode, summary_names)
@@ -0,0 +1,430 @@
+"""Summarize many FastQC archives in one process.
+
+Batch mode fans the work of summarizing FastQC archives out over a pool of workers so that
+large runs, e.g. every sample on a sequencing flowcell, are summarized by a single invocation of the app.
+
+Typical usage examples:
+    >>> from fastqc_summary.batch import summarize_many
+    >>> for sample, summaries in summarize_many(["a_fastqc.zip", "b_fastqc.zip"], workers=4):
+    >>>     print(sample, summaries)
+"""
+
+from contextlib import contextmanager
+from functools import partial
+import json
+from pathlib import Path
+from typing import Callable, Collection, Iterable, Iterator, TYPE_CHECKING
+
+from fastqc_summary.parser import (
+    FastqcSource,
+    index_modules,
+    Module,
+    ModuleSpan,
+    parse_modules,
+    read_module,
+    read_statuses,
+)
+from fastqc_summary.summaries import (
+    compute_summaries,
+    DEFAULT_SUMMARIES,
+    required_modules,
+)
+
+# worker pools, the cache, gates, and timings are only imported when used, keeping summarizing a single archive fast to start
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from fastqc_summary.cache import SummaryCache
+    from fastqc_summary.export import ModuleExporter
+    from fastqc_summary.gate import QCGate
+    from fastqc_summary.timings import ArchiveTimings
+
+EXECUTORS = ("process", "thread")
+
+MODULE_INDEX_OPTIONS = "module-index"
+"""Options of the cache entries holding module indexes rather than summaries."""
+
+
+def sample_name(fastqc_archive: str) -> str:
+    """Derive a sample name from the path to a FastQC archive.
+
+    The sample name is the file name with the '_fastqc.zip' suffix written by FastQC removed.
+    For extracted FastQC output, the sample name is taken from the '_fastqc' output directory instead.
+
+    Args:
+        fastqc_archive: Path to a FastQC ZIP archive file, FastQC output directory, or FastQC data file.
+
+    Returns:
+        The sample name.
+    """
+    path = Path(fastqc_archive)
+    name = path.name
+
+    # name bare FastQC data files after the FastQC output directory they are in
+    if name in ("fastqc_data.txt", "fastqc_data.txt.gz") and path.parent.name:
+        name = path.resolve().parent.name
+
+    for suffix in ("_fastqc.zip", ".zip", "_fastqc"):
+        if name.endswith(suffix):
+            return name.removesuffix(suffix)
+
+    return name
+
+
+def summarize_archive(
+    fastqc_archive: FastqcSource,
+    length_mode: str = "midpoint",
+    summary_names: Collection[str] = DEFAULT_SUMMARIES,
+) -> dict[str, int]:
+    """Compute the summaries for a single FastQC archive.
+
+    Only the modules needed by the selected summaries are parsed.
+
+    Args:
+        fastqc_archive: A FastQC input, e.g. path to a FastQC ZIP archive file or an already open ZIP archive.
+        length_mode: Length of reads in binned lengths, one of [lower, midpoint, upper].
+        summary_names: Names of registered summaries to compute.
+
+    Returns:
+        A dict mapping summary keys to summary values.
+    """
+    summaries, _, _ = _summarize_archive(fastqc_archive, length_mode, summary_names)
+
+    return summaries
+
+
+def get_module(fastqc_archive: str, name: str, cache: "SummaryCache | None" = None) -> Module:
+    """Get a single module of a FastQC archive.
+
+    With a cache, the archive is indexed once and the index is cached alongside its summaries,
+    so later lookups jump straight to the module instead of scanning the modules before it.
+    Without a cache, the archive is parsed up to the module.
+
+    Args:
+        fastqc_archive: Path to a FastQC ZIP archive file, FastQC output directory, or FastQC data file.
+        name: Name of the module, e.g. 'Adapter Content'.
+        cache: A summary cache to read the module index from and write it to.
+
+    Returns:
+        A representation of the module.
+
+    Raises:
+        KeyError: The FastQC archive has no module with the given name.
+    """
+    if cache is None:
+        module = next(parse_modules(fastqc_archive, wanted={name}), None)
+        if module is None:
+            raise KeyError(f"Module '{name}' not found in FastQC archive '{fastqc_archive}'.")
+        return module
+
+    key = cache.key(fastqc_archive, MODULE_INDEX_OPTIONS)
+    cached = cache.get(key)
+    if cached is not None:
+        # spans are cached as JSON lists
+        index = {module_name: ModuleSpan(*span) for module_name, span in cached.items()}
+    else:
+        index = index_modules(fastqc_archive)
+        cache.put(key, index)
+
+    if name not in index:
+        raise KeyError(f"Module '{name}' not found in FastQC archive '{fastqc_archive}'.")
+
+    return read_module(fastqc_archive, index[name])
+
+
+def _summarize_archive(
+    fastqc_archive: FastqcSource,
+    length_mode: str = "midpoint",
+    summary_names: Collection[str] = DEFAULT_SUMMARIES,
+    export_modules: Collection[str] = (),
+    profile: bool = False,
+    max_rows: int | None = None,
+    gate: "QCGate | None" = None,
+) -> tuple[dict[str, int], dict[str, dict[str, list]], "ArchiveTimings | None"]:
+    tables = {}
+    profiler = None
+    if profile:
+        from fastqc_summary.timings import ArchiveProfiler
+        profiler = ArchiveProfiler()
+
+    def tabulate(modules: Iterable[Module]) -> Iterator[Module]:
+        # tabulate exported modules in the same pass
+        for module in modules:
+            if module.name in export_modules:
+                # export is imported here so that runs without exports do not pay for importing csv and gzip
+                from fastqc_summary.export import module_table
+
+                if profiler is not None:
+                    profiler.push("export")
+                tables[module.name] = module_table(module)
+                if profiler is not None:
+                    profiler.pop()
+            yield module
+
+    wanted = {*required_modules(summary_names), *export_modules, *(gate.modules if gate is not None else ())}
+    modules = parse_modules(fastqc_archive, wanted=wanted, profiler=profiler, max_rows=max_rows)
+    if profiler is not None:
+        # time spent pulling modules is charged to parsing rather than summarizing
+        modules = profiler.modules(modules)
+        profiler.push("summarize")
+
+    if gate is None:
+        summaries = compute_summaries(tabulate(modules), summary_names, length_mode=length_mode)
+    else:
+        from fastqc_summary.gate import evaluate_archive
+        summaries = evaluate_archive(gate, tabulate(modules), summary_names, length_mode)
+
+    if profiler is None:
+        return summaries, tables, None
+
+    profiler.pop()
+
+    return summaries, tables, profiler.timings
+
+
+def summarize_many(
+    fastqc_archives: Iterable[str],
+    workers: int = 1,
+    executor: str = "process",
+    cache: "SummaryCache | None" = None,
+    refresh: bool = False,
+    length_mode: str = "midpoint",
+    ordered: bool = True,
+    exporter: "ModuleExporter | None" = None,
+    summary_names: Collection[str] = DEFAULT_SUMMARIES,
+    on_timings: "Callable[[ArchiveTimings], None] | None" = None,
+    max_rows: int | None = None,
+    gate: "QCGate | None" = None,
+    on_error: "Callable[[str, Exception], None] | None" = None,
+) -> Iterator[tuple[str, dict[str, int]]]:
+    """Compute the summaries for many FastQC archives.
+
+    Archives are summarized serially in the calling process when `workers` is 1.
+    Otherwise they are fanned out over a pool of `workers` processes or threads.
+    Summaries are yielded in the same order as the input archives,
+    or as soon as each archive is summarized when `ordered` is False.
+
+    When a cache is supplied, cached summaries of unchanged archives are reused without parsing the archives,
+    and newly computed summaries are added to the cache. Archives are looked up as they are handed to the workers,
+    and an archive that cannot be looked up, e.g. a corrupt ZIP archive, is summarized to report its error.
+
+    When an exporter is supplied, the tables of the exported modules are tabulated in the same pass as the summaries
+    and written by the exporter. Every archive is parsed so that its tables can be exported.
+
+    Args:
+        fastqc_archives: Paths to FastQC ZIP archive files.
+        workers: Number of workers to summarize archives with.
+        executor: Kind of worker pool to use, one of [process, thread].
+        cache: A summary cache to read summaries from and write summaries to.
+        refresh: Recompute summaries of cached archives and overwrite their cache entries.
+        length_mode: Length of reads in binned lengths, one of [lower, midpoint, upper].
+        ordered: Yield summaries in the same order as the input archives.
+        exporter: A writer of tables of modules to export.
+        summary_names: Names of registered summaries to compute.
+        on_timings: A hook called with the timings of each summarized archive, before its summaries are yielded.
+            Leave as None to not time archives. Cached summaries are not timed.
+        max_rows: Number of rows of a module above which its rows are spilled to disk, bounding the memory of each worker.
+            Leave as None to keep every row in memory.
+        gate: Quality control rules to evaluate against each archive while it is parsed, see `fastqc_summary.gate`.
+            The verdict and the outcome of each rule are added to the summaries. Leave as None to not gate archives.
+        on_error: A hook called with the path and the error of each archive that could not be summarized,
+            which is then left out of the results while the other archives are still summarized.
+            Leave as None to raise the error of the first archive that could not be summarized instead.
+
+    Yields:
+        A tuple of the sample name and the summaries for each archive.
+
+    Raises:
+        ValueError: The number of workers or kind of worker pool is invalid.
+    """
+    if workers < 1:
+        raise ValueError(f"Number of workers must be at least 1, got {workers}.")
+    if executor not in EXECUTORS:
+        raise ValueError(f"Executor must be one of {list(EXECUTORS)}, got '{executor}'.")
+
+    fastqc_archives = list(fastqc_archives)
+    summary_names = tuple(summary_names)
+    options = summary_options(length_mode, summary_names, gate)
+    refresh = refresh or exporter is not None
+    keys = [None] * len(fastqc_archives)
+    cached = [None] * len(fastqc_archives)
+    misses = []
+    hits = []
+    released = 0
+
+    def look_up() -> Iterator[str]:
+        # archives are looked up one by one as they are handed to the workers, so workers start on the first miss
+        for i, fastqc_archive in enumerate(fastqc_archives):
+            if cache is not None:
+                try:
+                    keys[i] = cache.key(fastqc_archive, options)
+                except Exception:
+                    # an archive that cannot be keyed is a miss, and summarizing it reports why it cannot be read
+                    pass
+            if keys[i] is not None and not refresh:
+                cached[i] = cache.get(keys[i])
+            if cached[i] is not None:
+                hits.append(i)
+                continue
+            misses.append(i)
+            yield fastqc_archive
+
+    export_modules = exporter.modules if exporter is not None else ()
+    summarize = partial(
+        _catch_errors,
+        _summarize_archive,
+        length_mode=length_mode,
+        summary_names=summary_names,
+        export_modules=export_modules,
+        profile=on_timings is not None,
+        max_rows=max_rows,
+        gate=gate,
+    )
+    with _summarize_all(summarize, look_up(), workers, executor, ordered, len(fastqc_archives)) as results:
+        for j, (result, error) in results:
+            # cached summaries are available as soon as they are looked up when order does not matter
+            if not ordered:
+                for i in hits:
+                    yield sample_name(fastqc_archives[i]), cached[i]
+                hits.clear()
+
+            i = misses[j]
+            if error is not None:
+                if on_error is None:
+                    raise error
+                on_error(fastqc_archives[i], error)
+                # failed archives are released in input order like the others, but not yielded
+                cached[i] = _FAILED
+            else:
+                summaries, tables, timings = result
+                if on_timings is not None:
+                    timings.sample = sample_name(fastqc_archives[i])
+                    on_timings(timings)
+                if keys[i] is not None:
+                    cache.put(keys[i], summaries)
+                if exporter is not None:
+                    exporter.write(sample_name(fastqc_archives[i]), tables)
+
+                if not ordered:
+                    yield sample_name(fastqc_archives[i]), summaries
+                    continue
+                cached[i] = summaries
+
+            # release every archive that is ready in input order and drop it so that memory stays bounded
+            while ordered and released < len(fastqc_archives) and cached[released] is not None:
+                if cached[released] is not _FAILED:
+                    yield sample_name(fastqc_archives[released]), cached[released]
+                cached[released] = None
+                released += 1
+
+    # cached summaries after the last summarized archive
+    if ordered:
+        for i in range(released, len(fastqc_archives)):
+            yield sample_name(fastqc_archives[i]), cached[i]
+    else:
+        for i in hits:
+            yield sample_name(fastqc_archives[i]), cached[i]
+
+
+def read_many_statuses(
+    fastqc_archives: Iterable[str],
+    workers: int = 1,
+    executor: str = "process",
+    ordered: bool = True,
+    on_error: "Callable[[str, Exception], None] | None" = None,
+) -> Iterator[tuple[str, dict[str, str]]]:
+    """Read the status of every module of many FastQC archives without parsing their module data.
+
+    Statuses are read from the summary.txt file of each FastQC archive, or its module headers, see `read_statuses()`,
+    and are fanned out over a pool of workers like `summarize_many()`.
+
+    Args:
+        fastqc_archives: Paths to FastQC ZIP archive files.
+        workers: Number of workers to read archives with.
+        executor: Kind of worker pool to use, one of [process, thread].
+        ordered: Yield statuses in the same order as the input archives.
+        on_error: A hook called with the path and the error of each archive that could not be read, see `summarize_many()`.
+            Leave as None to raise the error instead.
+
+    Yields:
+        A tuple of the sample name and the status of each module by module name for each archive.
+
+    Raises:
+        ValueError: The number of workers or kind of worker pool is invalid.
+    """
+    if workers < 1:
+        raise ValueError(f"Number of workers must be at least 1, got {workers}.")
+    if executor not in EXECUTORS:
+        raise ValueError(f"Executor must be one of {list(EXECUTORS)}, got '{executor}'.")
+
+    fastqc_archives = list(fastqc_archives)
+    with _summarize_all(
+        partial(_catch_errors, read_statuses), fastqc_archives, workers, executor, ordered, len(fastqc_archives)
+    ) as results:
+        for i, (statuses, error) in results:
+            if error is None:
+                yield sample_name(fastqc_archives[i]), statuses
+            elif on_error is None:
+                raise error
+            else:
+                on_error(fastqc_archives[i], error)
+
+
+def summary_options(
+    length_mode: str = "midpoint",
+    summary_names: Collection[str] = DEFAULT_SUMMARIES,
+    gate: "QCGate | None" = None,
+) -> str:
+    """Serialize the options summaries are computed with, so that summaries computed with other options are not reused."""
+    options = {"length_mode": length_mode, "summaries": tuple(summary_names)}
+    if gate is not None:
+        options["gate"] = gate.options()
+
+    return json.dumps(options, sort_keys=True)
+
+
+_FAILED = object()
+"""Placeholder for the summaries of archives that could not be summarized."""
+
+
+def _catch_errors(function: Callable[..., tuple], fastqc_archive: "FastqcSource | bytes", **options) -> tuple:
+    # errors are returned rather than raised, so that one unreadable archive does not end the map over a pool
+    try:
+        return function(fastqc_archive, **options), None
+    except Exception as e:
+        return None, e
+
+
+@contextmanager
+def _summarize_all(
+    summarize: Callable[[str], tuple],
+    fastqc_archives: Iterable[str],
+    workers: int,
+    executor: str,
+    ordered: bool,
+    count: int,
+) -> Iterator[Iterator[tuple[int, tuple]]]:
+    # avoid the overhead of a pool when there is nothing to fan out
+    if workers == 1 or count < 2:
+        yield enumerate(map(summarize, fastqc_archives))
+        return
+
+    with _make_executor(executor, workers) as pool:
+        if ordered:
+            # hand out archives in chunks to amortize the cost of inter-process communication
+            chunksize = max(1, count // (workers * 4))
+            yield enumerate(pool.map(summarize, fastqc_archives, chunksize=chunksize))
+        else:
+            from concurrent.futures import as_completed
+
+            futures = {pool.submit(summarize, fastqc_archive): j for j, fastqc_archive in enumerate(fastqc_archives)}
+            yield ((futures[future], future.result()) for future in as_completed(futures))
+
+
+def _make_executor(executor: str, workers: int) -> "Executor":
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    if executor == "thread":
+        return ThreadPoolExecutor(max_workers=workers)
+
+    return ProcessPoolExecutor(max_workers=workers)
@@ -0,0 +1,287 @@
+"""Summarize FastQC archives delivered together in a bundle without extracting them to disk.
+
+A bundle is a tar archive, optionally compressed, or a ZIP archive holding many '_fastqc.zip' files,
+e.g. the QC deliverable of a sequencing core.
+The members of a bundle are read one after the other in a single pass over the bundle,
+and each FastQC archive is opened from an in-memory buffer and summarized.
+At most a few FastQC archives per worker are held in memory at a time.
+
+Typical usage examples:
+    >>> from fastqc_summary.bundle import summarize_bundle
+    >>> for sample, summaries in summarize_bundle("run_fastqc.tar.gz", workers=4):
+    >>>     print(sample, summaries)
+"""
+
+from collections import deque
+from functools import partial
+from itertools import groupby
+import io
+from pathlib import Path
+from typing import Callable, Collection, Iterable, Iterator, TYPE_CHECKING
+import zipfile
+
+from fastqc_summary.batch import (
+    _catch_errors,
+    _make_executor,
+    _summarize_archive,
+    EXECUTORS,
+    read_many_statuses,
+    sample_name,
+    summarize_many,
+)
+from fastqc_summary.parser import read_statuses
+from fastqc_summary.summaries import DEFAULT_SUMMARIES
+
+if TYPE_CHECKING:
+    from fastqc_summary.cache import SummaryCache
+    from fastqc_summary.export import ModuleExporter
+    from fastqc_summary.gate import QCGate
+    from fastqc_summary.timings import ArchiveTimings
+
+BUNDLE_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+FASTQC_ARCHIVE_SUFFIX = "_fastqc.zip"
+
+
+def is_bundle(path: str | Path) -> bool:
+    """Check whether a path is a bundle of FastQC archives rather than a FastQC input.
+
+    Tar archives are identified by their suffix.
+    ZIP archives are only opened when they are not named like a FastQC ZIP archive, and are bundles when they hold
+    '_fastqc.zip' files but no FastQC data of their own.
+
+    Args:
+        path: Path to a file.
+
+    Returns:
+        True if the file is a bundle of FastQC archives.
+    """
+    name = Path(path).name
+    if name.endswith(BUNDLE_SUFFIXES):
+        return True
+    if not name.endswith(".zip") or name.endswith(FASTQC_ARCHIVE_SUFFIX) or not Path(path).is_file():
+        return False
+
+    try:
+        with zipfile.ZipFile(path, "r") as archive:
+            names = archive.namelist()
+    except zipfile.BadZipFile:
+        # invalid FastQC inputs are reported when they are summarized
+        return False
+
+    return (
+        not any(member.endswith("fastqc_data.txt") for member in names)
+        and any(member.endswith(FASTQC_ARCHIVE_SUFFIX) for member in names)
+    )
+
+
+def read_bundle(bundle: str | Path) -> Iterator[tuple[str, bytes]]:
+    """Read the FastQC archives in a bundle one after the other.
+
+    Tar archives are read as a stream, so compressed tar archives are decompressed once rather than once per member.
+
+    Args:
+        bundle: Path to a tar or ZIP archive of FastQC ZIP archive files.
+
+    Yields:
+        A tuple of the member name and the contents of each FastQC ZIP archive in the bundle.
+    """
+    if Path(bundle).name.endswith(BUNDLE_SUFFIXES):
+        # tarfile is imported here so that runs without bundles do not pay for importing it
+        import tarfile
+
+        with tarfile.open(bundle, "r|*") as tar:
+            for member in tar:
+                if member.isfile() and member.name.endswith(FASTQC_ARCHIVE_SUFFIX):
+                    with tar.extractfile(member) as fastqc_archive:
+                        yield member.name, fastqc_archive.read()
+        return
+
+    with zipfile.ZipFile(bundle, "r") as archive:
+        for info in archive.infolist():
+            if not info.is_dir() and info.filename.endswith(FASTQC_ARCHIVE_SUFFIX):
+                yield info.filename, archive.read(info)
+
+
+def summarize_bundle(
+    bundle: str | Path,
+    workers: int = 1,
+    executor: str = "process",
+    length_mode: str = "midpoint",
+    ordered: bool = True,
+    exporter: "ModuleExporter | None" = None,
+    summary_names: Collection[str] = DEFAULT_SUMMARIES,
+    on_timings: "Callable[[ArchiveTimings], None] | None" = None,
+    max_rows: int | None = None,
+    gate: "QCGate | None" = None,
+    on_error: "Callable[[str, Exception], None] | None" = None,
+) -> Iterator[tuple[str, dict[str, int]]]:
+    """Compute the summaries for every FastQC archive in a bundle.
+
+    FastQC archives are read from the bundle while earlier ones are summarized,
+    with at most two FastQC archives per worker waiting to be summarized.
+    FastQC archives in bundles have no path of their own, so their summaries are not cached.
+
+    Args:
+        bundle: Path to a tar or ZIP archive of FastQC ZIP archive files.
+        workers: Number of workers to summarize archives with.
+        executor: Kind of worker pool to use, one of [process, thread].
+        length_mode: Length of reads in binned lengths, one of [lower, midpoint, upper].
+        ordered: Yield summaries in the same order as the FastQC archives in the bundle.
+        exporter: A writer of tables of modules to export.
+        summary_names: Names of registered summaries to compute.
+        on_timings: A hook called with the timings of each summarized archive. Leave as None to not time archives.
+        max_rows: Number of rows of a module above which its rows are spilled to disk. Leave as None to keep every row in memory.
+        gate: Quality control rules to evaluate against each FastQC archive. Leave as None to not gate FastQC archives.
+        on_error: A hook called with the member name and the error of each FastQC archive that could not be summarized,
+            which is then left out of the results. Leave as None to raise the error instead.
+
+    Yields:
+        A tuple of the sample name and the summaries for each FastQC archive in the bundle.
+
+    Raises:
+        ValueError: The number of workers or kind of worker pool is invalid.
+    """
+    if workers < 1:
+        raise ValueError(f"Number of workers must be at least 1, got {workers}.")
+    if executor not in EXECUTORS:
+        raise ValueError(f"Executor must be one of {list(EXECUTORS)}, got '{executor}'.")
+
+    summarize = partial(
+        _catch_errors,
+        _summarize_member,
+        length_mode=length_mode,
+        summary_names=tuple(summary_names),
+        export_modules=exporter.modules if exporter is not None else (),
+        profile=on_timings is not None,
+        max_rows=max_rows,
+        gate=gate,
+    )
+    for member, (result, error) in _summarize_members(summarize, read_bundle(bundle), workers, executor, ordered):
+        if error is not None:
+            if on_error is None:
+                raise error
+            on_error(member, error)
+            continue
+
+        summaries, tables, timings = result
+        sample = sample_name(member)
+        if on_timings is not None:
+            timings.sample = sample
+            on_timings(timings)
+        if exporter is not None:
+            exporter.write(sample, tables)
+
+        yield sample, summaries
+
+
+def summarize_inputs(
+    fastqc_archives: Iterable[str],
+    bundles: Collection[str] = (),
+    cache: "SummaryCache | None" = None,
+    refresh: bool = False,
+    **options,
+) -> Iterator[tuple[str, dict[str, int]]]:
+    """Compute the summaries for FastQC archives and bundles of FastQC archives in input order.
+
+    Runs of FastQC archives between bundles are summarized together by `summarize_many()`.
+
+    Args:
+        fastqc_archives: Paths to FastQC inputs and bundles.
+        bundles: The paths that are bundles, e.g. found with `is_bundle()`.
+        cache: A summary cache for FastQC archives outside of bundles.
+        refresh: Recompute summaries of cached archives and overwrite their cache entries.
+        **options: Options passed on to `summarize_many()` and `summarize_bundle()`.
+
+    Yields:
+        A tuple of the sample name and the summaries for each FastQC archive.
+    """
+    for in_bundles, paths in groupby(fastqc_archives, key=lambda path: path in bundles):
+        if not in_bundles:
+            yield from summarize_many(list(paths), cache=cache, refresh=refresh, **options)
+            continue
+        for bundle in paths:
+            yield from summarize_bundle(bundle, **options)
+
+
+def read_input_statuses(
+    fastqc_archives: Iterable[str],
+    bundles: Collection[str] = (),
+    workers: int = 1,
+    executor: str = "process",
+    ordered: bool = True,
+    on_error: "Callable[[str, Exception], None] | None" = None,
+) -> Iterator[tuple[str, dict[str, str]]]:
+    """Read the status of every module of FastQC archives and bundles of FastQC archives in input order.
+
+    Runs of FastQC archives between bundles are read together by `read_many_statuses()`.
+    The FastQC archives in a bundle are read one after the other, as reading their statuses costs less than handing them to a worker.
+
+    Args:
+        fastqc_archives: Paths to FastQC inputs and bundles.
+        bundles: The paths that are bundles, e.g. found with `is_bundle()`.
+        workers: Number of workers to read FastQC archives outside of bundles with.
+        executor: Kind of worker pool to use, one of [process, thread].
+        ordered: Yield statuses of FastQC archives outside of bundles in input order.
+        on_error: A hook called with the path or member name and the error of each FastQC archive that could not be read.
+            Leave as None to raise the error instead.
+
+    Yields:
+        A tuple of the sample name and the status of each module by module name for each FastQC archive.
+    """
+    for in_bundles, paths in groupby(fastqc_archives, key=lambda path: path in bundles):
+        if not in_bundles:
+            yield from read_many_statuses(list(paths), workers=workers, executor=executor, ordered=ordered, on_error=on_error)
+            continue
+        for bundle in paths:
+            for member, fastqc_archive in read_bundle(bundle):
+                statuses, error = _catch_errors(read_statuses, io.BytesIO(fastqc_archive))
+                if error is None:
+                    yield sample_name(member), statuses
+                elif on_error is None:
+                    raise error
+                else:
+                    on_error(member, error)
+
+
+def _summarize_member(fastqc_archive: bytes, **options) -> tuple:
+    return _summarize_archive(io.BytesIO(fastqc_archive), **options)
+
+
+def _summarize_members(
+    summarize: Callable[[bytes], tuple],
+    members: Iterator[tuple[str, bytes]],
+    workers: int,
+    executor: str,
+    ordered: bool,
+) -> Iterator[tuple[str, tuple]]:
+    # avoid the overhead of a pool when there is nothing to fan out
+    if workers == 1:
+        for member, fastqc_archive in members:
+            yield member, summarize(fastqc_archive)
+        return
+
+    # bound the FastQC archives in flight so that memory does not grow with the size of the bundle
+    with _make_executor(executor, workers) as pool:
+        pending = deque()
+        for member, fastqc_archive in members:
+            pending.append((member, pool.submit(summarize, fastqc_archive)))
+            while len(pending) >= workers * 2:
+                yield from _take_done(pending, ordered)
+        while pending:
+            yield from _take_done(pending, ordered)
+
+
+def _take_done(pending: deque, ordered: bool) -> Iterator[tuple[str, tuple]]:
+    # take the oldest FastQC archive in order, or every FastQC archive that is done otherwise
+    if ordered:
+        member, future = pending.popleft()
+        yield member, future.result()
+        return
+
+    from concurrent.futures import FIRST_COMPLETED, wait
+
+    done, _ = wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+    for item in [item for item in pending if item[1] in done]:
+        pending.remove(item)
+        yield item[0], item[1].result()
@@ -0,0 +1,213 @@
+"""Persistent on-disk cache of FastQC archive summaries.
+
+Summaries are stored in a small SQLite database inside a cache directory.
+Entries are keyed by the path to the FastQC archive along with its size, modification time,
+and the CRC of the fastqc_data.txt file inside of the archive so that changed archives are always re-summarized.
+Entries are also keyed by the options the summaries were computed with.
+A cache hit only reads the central directory of the archive and never decompresses or parses the FastQC data.
+Module indexes of FastQC archives, see `get_module()`, are cached the same way under their own options.
+
+Typical usage examples:
+    >>> from fastqc_summary.cache import SummaryCache
+    >>> with SummaryCache(".fastqc-summary-cache") as cache:
+    >>>     key = cache.key("SRR1067505_1_fastqc.zip")
+    >>>     summaries = cache.get(key)
+"""
+
+import json
+import os
+from pathlib import Path
+import time
+from typing import NamedTuple
+import zipfile
+
+from fastqc_summary.parser import (
+    find_fastqc_data_file,
+    find_fastqc_data_path,
+    ZIP_MAGICS,
+)
+
+CACHE_FILE_NAME = "summaries.sqlite"
+
+COMMIT_EVERY = 1000
+"""Number of writes, i.e. new entries and recorded uses, to batch into one transaction."""
+
+COMMIT_INTERVAL = 1.0
+"""Seconds after which batched writes are committed, so that other processes sharing the cache see them."""
+
+
+class CacheKey(NamedTuple):
+    """Identity of a FastQC archive in the summary cache."""
+    path: str
+    options: str
+    size: int
+    mtime_ns: int
+    crc: int
+
+
+class SummaryCache:
+    """Size-bounded, least recently used cache of FastQC archive summaries.
+
+    Writes are batched into transactions of up to `COMMIT_EVERY` writes, and uses of entries are recorded in the same batches,
+    so that neither lookups nor inserts commit once per FastQC archive. Batched writes are committed on `flush()` and `close()`.
+    Entries are only evicted once the cache holds more than `max_entries` entries,
+    and then down to 1% below `max_entries`, so that a full cache does not evict on every insert.
+
+    Attributes:
+        path: Path to the SQLite database file backing the cache.
+        max_entries: Maximum number of entries to keep. The least recently used entries are evicted first.
+    """
+
+    def __init__(self, cache_dir: str | Path, max_entries: int = 100_000) -> None:
+        if max_entries < 1:
+            raise ValueError(f"Cache size must be at least 1, got {max_entries}.")
+
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        self.path = Path(cache_dir) / CACHE_FILE_NAME
+        self.max_entries = max_entries
+        # sqlite3 is imported here so that runs without a cache do not pay for importing it
+        import sqlite3
+
+        self._connection = sqlite3.connect(self.path)
+        # write-ahead logging keeps frequent small commits cheap
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS summaries (
+                path TEXT NOT NULL,
+                options TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                crc INTEGER NOT NULL,
+                summaries TEXT NOT NULL,
+                accessed REAL NOT NULL,
+                PRIMARY KEY (path, options)
+            )
+            """
+        )
+        # evicting the least recently used entries walks this index rather than sorting the table
+        self._connection.execute("CREATE INDEX IF NOT EXISTS summaries_accessed ON summaries (accessed)")
+        self._connection.commit()
+        self._entries = len(self)
+        self._accessed: dict[tuple[str, str], float] = {}
+        self._writes = 0
+        self._committed = time.monotonic()
+
+    def __enter__(self) -> "SummaryCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Commit batched writes and close the connection to the cache database."""
+        self.flush()
+        self._connection.close()
+
+    def flush(self) -> None:
+        """Commit batched writes, including the uses of entries since the last commit."""
+        self._flush_accessed()
+        self._connection.commit()
+        self._writes = 0
+        self._committed = time.monotonic()
+
+    @staticmethod
+    def key(fastqc_archive: str, options: str = "") -> CacheKey:
+        """Compute the cache key of a FastQC archive.
+
+        Only the file metadata and the central directory of the ZIP archive are read.
+        Unzipped FastQC data is identified by the metadata of the fastqc_data.txt file alone.
+
+        Args:
+            fastqc_archive: Path to a FastQC ZIP archive file, FastQC output directory, or FastQC data file.
+            options: A serialization of the options the summaries are computed with.
+
+        Returns:
+            The cache key of the FastQC archive.
+        """
+        path = Path(fastqc_archive).resolve()
+        if path.is_dir():
+            stat = find_fastqc_data_path(path).stat()
+            return CacheKey(path=str(path), options=options, size=stat.st_size, mtime_ns=stat.st_mtime_ns, crc=0)
+
+        # identify and read the archive through a single file handle
+        with open(path, "rb") as fastqc_file:
+            stat = os.fstat(fastqc_file.fileno())
+            crc = 0
+            if fastqc_file.read(4).startswith(ZIP_MAGICS):
+                with zipfile.ZipFile(fastqc_file, "r") as archive:
+                    crc = archive.getinfo(find_fastqc_data_file(archive)).CRC
+
+        return CacheKey(path=str(path), options=options, size=stat.st_size, mtime_ns=stat.st_mtime_ns, crc=crc)
+
+    def get(self, key: CacheKey) -> dict | None:
+        """Get the cached summaries of a FastQC archive.
+
+        Args:
+            key: Cache key of the FastQC archive.
+
+        Returns:
+            The cached summaries, or None if the archive is not cached or has changed since it was cached.
+        """
+        row = self._connection.execute(
+            "SELECT summaries FROM summaries WHERE path = ? AND options = ? AND size = ? AND mtime_ns = ? AND crc = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            return None
+
+        # mark the entry as recently used with the next batch of writes
+        self._accessed[(key.path, key.options)] = time.time()
+        self._wrote()
+
+        return json.loads(row[0])
+
+    def put(self, key: CacheKey, summaries: dict) -> None:
+        """Cache the summaries of a FastQC archive.
+
+        Any existing entry for the same path and options is replaced.
+        Once the cache holds more than `max_entries` entries, the least recently used entries are evicted in a batch.
+
+        Args:
+            key: Cache key of the FastQC archive.
+            summaries: Summaries of the FastQC archive.
+        """
+        self._connection.execute(
+            "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (*key, json.dumps(summaries), time.time()),
+        )
+        self._accessed.pop((key.path, key.options), None)
+        # replaced entries overcount, so the entries are counted again before evicting
+        self._entries += 1
+        if self._entries > self.max_entries:
+            self._evict()
+        self._wrote()
+
+    def _evict(self) -> None:
+        self._entries = len(self)
+        if self._entries <= self.max_entries:
+            return
+
+        # recorded uses decide which entries are least recently used
+        self._flush_accessed()
+        excess = self._entries - self.max_entries + self.max_entries // 100
+        self._connection.execute(
+            "DELETE FROM summaries WHERE rowid IN (SELECT rowid FROM summaries ORDER BY accessed LIMIT ?)",
+            (excess,),
+        )
+        self._entries -= excess
+
+    def _flush_accessed(self) -> None:
+        self._connection.executemany(
+            "UPDATE summaries SET accessed = ? WHERE path = ? AND options = ?",
+            [(accessed, path, options) for (path, options), accessed in self._accessed.items()],
+        )
+        self._accessed.clear()
+
+    def _wrote(self) -> None:
+        self._writes += 1
+        if self._writes >= COMMIT_EVERY or time.monotonic() - self._committed >= COMMIT_INTERVAL:
+            self.flush()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
@@ -4,22 +4,61 @@ Typical usage examples:
     >>> import zipfile
     >>> from fastqc_summary.cli import get_args
     >>> args = get_args()
-    >>> with zipfile.ZipFile(args.fastqc_archive, "r") as zf:
-    >>>     files = zf.namelist()
+    >>> for fastqc_archive in args.fastqc_archives:
+    >>>     with zipfile.ZipFile(fastqc_archive, "r") as zf:
+    >>>         files = zf.namelist()
 """
 
 import argparse
+import glob
 import io
+import os
 from pathlib import Path
+import re
 import sys
 from typing import NamedTuple
-import zipfile
+
+from fastqc_summary.constants import (
+    DEFAULT_EXPORT_MODULES,
+    DEFAULT_SUMMARIES,
+    ILLUMINA_PATTERN,
+    STATE_FILE_NAME,
+    SUMMARY_NAMES,
+)
 
 
 class Args(NamedTuple):
     """Command-line arguments."""
-    fastqc_archive: str
+    fastqc_archives: list[str]
+    bundles: list[str]
     output: str | io.TextIOWrapper
+    batch: bool
+    workers: int
+    executor: str
+    cache_dir: str | None
+    cache_size: int
+    refresh: bool
+    length_mode: str
+    summary_names: list[str]
+    output_format: str
+    flush_every: int
+    ordered: bool
+    export_dir: str | None
+    export_modules: list[str]
+    export_format: str
+    watch_dir: str | None
+    state_file: str | None
+    poll: float | None
+    report: str | None
+    group_by: str | None
+    timings: str | None
+    profile: str | None
+    max_rows: int | None
+    merge_samples: str | None
+    sample_sheet: str | None
+    gate: str | None
+    fail_fast: bool
+    statuses: bool
 
 
 def get_args(argv: list[str] | None = None) -> Args:
@@ -36,7 +75,6 @@ def get_args(argv: list[str] | None = None) -> Args:
     Raises:
         SystemExit: A required argument was not provided or other fatal error occurred during argument parsing.
         FileNotFoundError: Input file could not be found.
-        BadZipFile: Input file was not a valid ZIP file.
     """
     parser = argparse.ArgumentParser(
         description="CLI app that summarizes FastQC results.",
@@ -46,7 +84,173 @@ def get_args(argv: list[str] | None = None) -> Args:
     parser.add_argument(
         "fastqc_archive",
         type=str,
-        help="Path to FastQC ZIP archive file. This is the '_fastqc.zip' file written by FastQC.",
+        nargs="*",
+        help=(
+            "Path to FastQC ZIP archive file. This is the '_fastqc.zip' file written by FastQC. "
+            "An extracted '_fastqc' output directory, 'fastqc_data.txt' file, or 'fastqc_data.txt.gz' file may be used instead. "
+            "Provide multiple paths or a quoted glob pattern to summarize archives in batch mode. "
+            "A tar or ZIP bundle of '_fastqc.zip' files may also be used, and is summarized without extracting it."
+        ),
+    )
+    parser.add_argument(
+        "-m",
+        "--manifest",
+        type=str,
+        default=None,
+        help="Path to a file listing FastQC ZIP archive files, one per line. Implies batch mode.",
+    )
+    parser.add_argument(
+        "--watch",
+        type=str,
+        default=None,
+        help=(
+            "Path to a directory to incrementally summarize '_fastqc.zip' files in. "
+            "Only FastQC archives that are new or modified since the last run are summarized, and their records are appended to the output."
+        ),
+    )
+    parser.add_argument(
+        "--state-file",
+        type=str,
+        default=None,
+        help=f"Path to the state file recording FastQC archives already summarized in watch mode. [None] uses '{STATE_FILE_NAME}' in the watched directory.",
+    )
+    parser.add_argument(
+        "--poll",
+        type=float,
+        default=None,
+        help="Seconds to wait between passes over the watched directory. [None] makes a single pass and exits.",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of workers to summarize FastQC archives with in batch mode. 0 uses every available CPU.",
+    )
+    parser.add_argument(
+        "--executor",
+        type=str,
+        choices=["process", "thread"],
+        default="process",
+        help="Kind of worker pool to summarize FastQC archives with in batch mode.",
+    )
+    parser.add_argument(
+        "-s",
+        "--summaries",
+        type=str,
+        default=",".join(DEFAULT_SUMMARIES),
+        help=f"Comma-separated names of summaries to compute, or 'all'. Available summaries: {', '.join(SUMMARY_NAMES)}.",
+    )
+    parser.add_argument(
+        "--statuses",
+        action="store_true",
+        help=(
+            "Write the PASS, WARN, or FAIL status of every FastQC module of each FastQC archive instead of summaries. "
+            "Statuses are read from the 'summary.txt' file of each FastQC archive, or from the module headers of its FastQC data, "
+            "without parsing any module data."
+        ),
+    )
+    parser.add_argument(
+        "--length-mode",
+        type=str,
+        choices=["lower", "midpoint", "upper"],
+        default="midpoint",
+        help="Length of reads in binned sequence lengths, e.g. '35-39', used to compute the base count.",
+    )
+    parser.add_argument(
+        "--export-dir",
+        type=str,
+        default=None,
+        help="Path to a directory to export long-format tables of FastQC modules to, one file per module.",
+    )
+    parser.add_argument(
+        "--export-module",
+        type=str,
+        action="append",
+        default=None,
+        help=(
+            "Name of a FastQC module to export, e.g. 'Per base sequence quality'. Repeat to export multiple modules. "
+            "[None] exports 'Per base sequence quality', 'Per sequence GC content', and 'Adapter Content'."
+        ),
+    )
+    parser.add_argument(
+        "--export-format",
+        type=str,
+        choices=["auto", "parquet", "tsv"],
+        default="auto",
+        help="Format of exported tables. [auto] writes Parquet if pyarrow is installed and gzip-compressed TSV otherwise.",
+    )
+    parser.add_argument(
+        "--gate",
+        type=str,
+        default=None,
+        metavar="RULES",
+        help=(
+            "Path to a JSON, or YAML with PyYAML installed, file of quality control rules on summaries and module statuses, "
+            "e.g. [{\"summary\": \"read_count\", \"op\": \">=\", \"value\": 20000000}]. "
+            "Adds the verdict and the outcome of each rule to the records, and exits with status 1 if any sample fails."
+        ),
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop parsing a FastQC archive as soon as it fails a fatal rule of the --gate, skipping the undecided rules.",
+    )
+    parser.add_argument(
+        "--merge-samples",
+        type=str,
+        nargs="?",
+        const=ILLUMINA_PATTERN,
+        default=None,
+        metavar="REGEX",
+        help=(
+            "Merge the summaries of the FastQC archives of each sample, e.g. its mates and lanes, into one record per sample. "
+            "Samples are found from Illumina file naming, e.g. 'Sample1_S1_L001_R1_001', "
+            "or from the 'sample' capture group of a regular expression matched against archive names."
+        ),
+    )
+    parser.add_argument(
+        "--sample-sheet",
+        type=str,
+        default=None,
+        help=(
+            "Path to a CSV or TSV sample sheet with 'file' and 'sample' columns, or an Illumina sample sheet with 'Sample_ID' "
+            "and 'Sample_Name' columns, to look up the sample of each FastQC archive in. Implies --merge-samples."
+        ),
+    )
+    parser.add_argument(
+        "--max-module-rows",
+        type=int,
+        default=None,
+        help=(
+            "Number of rows of a FastQC module above which its rows are spilled to a temporary file while parsing, "
+            "bounding the memory of each worker for huge modules such as Overrepresented sequences. [None] keeps every row in memory."
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=os.environ.get("FASTQC_SUMMARY_CACHE_DIR"),
+        help=(
+            "Path to a directory to cache summaries in so that unchanged FastQC archives are not re-summarized. "
+            "Defaults to the FASTQC_SUMMARY_CACHE_DIR environment variable. [None] disables the cache."
+        ),
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=100_000,
+        help="Maximum number of FastQC archives to keep in the cache. The least recently used archives are evicted first.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read summaries from or write summaries to the cache.",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Recompute summaries of cached FastQC archives and overwrite them in the cache.",
     )
     parser.add_argument(
         "-o",
@@ -55,17 +259,342 @@ def get_args(argv: list[str] | None = None) -> Args:
         default=None,
         help="Path to output file to write summaries to. [None, '-', '/dev/stdout'] write to stdout.",
     )
+    parser.add_argument(
+        "-f",
+        "--format",
+        type=str,
+        choices=["json", "ndjson", "tsv", "csv"],
+        default=None,
+        help="Format to write summaries in. [None] writes JSON for a single FastQC archive and NDJSON in batch mode.",
+    )
+    parser.add_argument(
+        "--report",
+        type=str,
+        default=None,
+        help=(
+            "Path to a JSON file to write a cohort report to, with the count, sum, mean, variance, range, quantiles, "
+            "and outliers of each summary over every summarized FastQC archive."
+        ),
+    )
+    parser.add_argument(
+        "--group-by",
+        type=str,
+        default=None,
+        help=(
+            "Regular expression matched against sample names to group samples by in the cohort report, e.g. '_(L\\d{3})_' for lanes. "
+            "The group is the text of the capture groups, or of the whole match if there are none."
+        ),
+    )
+    parser.add_argument(
+        "--timings",
+        type=str,
+        default=None,
+        help=(
+            "Path to a JSON file to write the wall clock and CPU time of each phase of summarizing each FastQC archive to, "
+            "along with the lines, bytes, and modules parsed. ['-'] writes to stderr."
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default=None,
+        help=(
+            "Path to a file to write cProfile statistics of the run to, e.g. for 'python -m pstats'. "
+            "Only the main process is profiled, so profile with one worker or the thread executor."
+        ),
+    )
+    parser.add_argument(
+        "--flush-every",
+        type=int,
+        default=1,
+        help="Number of summary records to write between flushes of the output.",
+    )
+    parser.add_argument(
+        "--unordered",
+        action="store_true",
+        help="Write summaries as soon as each FastQC archive is summarized instead of in input order.",
+    )
 
     args = parser.parse_args(argv)
 
-    # validate the FastQC ZIP archive file
-    if not Path(args.fastqc_archive).exists():
-        raise FileNotFoundError(f"FastQC archive file '{args.fastqc_archive}' could not be found.")
-    if not zipfile.is_zipfile(args.fastqc_archive):
-        raise zipfile.BadZipFile(f"FastQC archive file '{args.fastqc_archive}' is not a valid ZIP file.")
+    # at least one FastQC ZIP archive file must be supplied, either directly, through a manifest, or by watching a directory
+    if args.watch is not None and (args.fastqc_archive or args.manifest is not None):
+        parser.error("argument --watch: not allowed with fastqc_archive or -m/--manifest")
+    if not args.fastqc_archive and args.manifest is None and args.watch is None:
+        parser.error("the following arguments are required: fastqc_archive")
+
+    # validate watch mode
+    if args.watch is None and (args.state_file is not None or args.poll is not None):
+        parser.error("arguments --state-file and --poll: only allowed with --watch")
+    if args.poll is not None and args.poll <= 0:
+        parser.error(f"argument --poll: must be greater than 0, got {args.poll}")
+    if args.watch is not None:
+        if not Path(args.watch).is_dir():
+            raise FileNotFoundError(f"Watch directory '{args.watch}' could not be found.")
+        if args.state_file is None:
+            args.state_file = str(Path(args.watch) / STATE_FILE_NAME)
+
+    # collect the FastQC ZIP archive files
+    fastqc_archives = []
+    batch = len(args.fastqc_archive) > 1 or args.manifest is not None or args.watch is not None
+    for fastqc_archive in args.fastqc_archive:
+        matches = expand_glob(fastqc_archive)
+        batch = batch or matches != [fastqc_archive]
+        fastqc_archives.extend(matches)
+    if args.manifest is not None:
+        fastqc_archives.extend(read_manifest(args.manifest))
+
+    # validate the FastQC ZIP archive files exist
+    # their contents are validated when they are opened to be summarized so that each is only opened once
+    for fastqc_archive in fastqc_archives:
+        if not Path(fastqc_archive).exists():
+            raise FileNotFoundError(f"FastQC archive file '{fastqc_archive}' could not be found.")
+
+    # bundles of FastQC archives are summarized in batch mode
+    # bundle is imported here, after parsing, so that `--help` and argument errors do not pay for importing the summarizers
+    from fastqc_summary.bundle import is_bundle
+
+    bundles = [fastqc_archive for fastqc_archive in fastqc_archives if is_bundle(fastqc_archive)]
+    batch = batch or bool(bundles)
+
+    # validate workers
+    if args.workers < 0:
+        parser.error(f"argument -j/--workers: must be at least 0, got {args.workers}")
+    if args.workers == 0:
+        args.workers = os.cpu_count() or 1
+
+    # validate summaries
+    summary_names = list(SUMMARY_NAMES) if args.summaries == "all" else [name.strip() for name in args.summaries.split(",")]
+    unknown = [name for name in summary_names if name not in SUMMARY_NAMES]
+    if unknown or not summary_names:
+        parser.error(f"argument -s/--summaries: unknown summaries {unknown}, choose from {list(SUMMARY_NAMES)} or 'all'")
+
+    # validate cohort report
+    if args.group_by is not None:
+        if args.report is None:
+            parser.error("argument --group-by: only allowed with --report")
+        try:
+            re.compile(args.group_by)
+        except re.error as e:
+            parser.error(f"argument --group-by: invalid regular expression '{args.group_by}': {e}")
+
+    # validate quality control gate
+    if args.gate is not None and not Path(args.gate).is_file():
+        raise FileNotFoundError(f"Rules file '{args.gate}' could not be found.")
+    if args.fail_fast and args.gate is None:
+        parser.error("argument --fail-fast: only allowed with --gate")
+
+    # validate sample merging
+    if args.sample_sheet is not None:
+        if not Path(args.sample_sheet).is_file():
+            raise FileNotFoundError(f"Sample sheet '{args.sample_sheet}' could not be found.")
+        args.merge_samples = args.merge_samples or ILLUMINA_PATTERN
+    if args.merge_samples is not None:
+        if args.watch is not None:
+            parser.error("argument --merge-samples: not allowed with --watch")
+        try:
+            re.compile(args.merge_samples)
+        except re.error as e:
+            parser.error(f"argument --merge-samples: invalid regular expression '{args.merge_samples}': {e}")
+        # merged samples are written as records
+        batch = True
+
+    # validate status-only mode
+    if args.statuses:
+        conflicts = {
+            "--watch": args.watch,
+            "--export-dir": args.export_dir,
+            "--report": args.report,
+            "--gate": args.gate,
+            "--timings": args.timings,
+            "--max-module-rows": args.max_module_rows,
+        }
+        conflicting = [flag for flag, value in conflicts.items() if value is not None]
+        if conflicting:
+            parser.error(f"argument --statuses: not allowed with {', '.join(conflicting)}")
+
+    # validate row cap
+    if args.max_module_rows is not None and args.max_module_rows < 0:
+        parser.error(f"argument --max-module-rows: must be at least 0, got {args.max_module_rows}")
+
+    # validate cache
+    if args.cache_size < 1:
+        parser.error(f"argument --cache-size: must be at least 1, got {args.cache_size}")
+    if args.no_cache:
+        args.cache_dir = None
 
     # validate output path
     if args.output in [None, "-", "/dev/stdout"]:
         args.output = sys.stdout
 
-    return Args(fastqc_archive=args.fastqc_archive, output=args.output)
+    # validate output format
+    if args.format is None:
+        args.format = "ndjson" if batch else "json"
+    if args.format == "json" and batch:
+        parser.error("argument -f/--format: json holds a single FastQC archive, use ndjson, tsv, or csv in batch mode")
+    if args.watch is not None and args.format != "ndjson":
+        parser.error("argument -f/--format: watch mode appends records, use ndjson")
+    if args.flush_every < 1:
+        parser.error(f"argument --flush-every: must be at least 1, got {args.flush_every}")
+
+    return Args(
+        fastqc_archives=fastqc_archives,
+        bundles=bundles,
+        output=args.output,
+        batch=batch,
+        workers=args.workers,
+        executor=args.executor,
+        cache_dir=args.cache_dir,
+        cache_size=args.cache_size,
+        refresh=args.refresh,
+        length_mode=args.length_mode,
+        summary_names=summary_names,
+        output_format=args.format,
+        flush_every=args.flush_every,
+        ordered=not args.unordered,
+        export_dir=args.export_dir,
+        export_modules=args.export_module or list(DEFAULT_EXPORT_MODULES),
+        export_format=args.export_format,
+        watch_dir=args.watch,
+        state_file=args.state_file,
+        poll=args.poll,
+        report=args.report,
+        group_by=args.group_by,
+        timings=args.timings,
+        profile=args.profile,
+        max_rows=args.max_module_rows,
+        merge_samples=args.merge_samples,
+        sample_sheet=args.sample_sheet,
+        gate=args.gate,
+        fail_fast=args.fail_fast,
+        statuses=args.statuses,
+    )
+
+
+class ServeArgs(NamedTuple):
+    """Command-line arguments of the serve subcommand."""
+    host: str
+    port: int
+    socket_path: str | None
+    root: str
+    workers: int
+    executor: str
+    lru_size: int
+    verbose: bool
+
+
+def get_serve_args(argv: list[str] | None = None) -> ServeArgs:
+    """Get command-line arguments of the serve subcommand.
+
+    Args:
+        argv: A list of args to explicitly supply to the parser, without the 'serve' subcommand. Leave as None for typical usage.
+
+    Returns:
+        An instance of a ServeArgs NamedTuple object.
+
+    Raises:
+        SystemExit: An invalid argument was provided.
+        FileNotFoundError: Root directory could not be found.
+    """
+    parser = argparse.ArgumentParser(
+        prog="fastqc-summary serve",
+        description="Serve summaries of FastQC results over HTTP from warm workers.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Host to listen on.")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on.")
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=None,
+        help="Path to a Unix socket to listen on instead of a host and port.",
+    )
+    parser.add_argument(
+        "--root",
+        type=str,
+        default=".",
+        help="Directory that requested paths are relative to. Paths outside of it are refused.",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of warm workers to summarize FastQC archives with. 0 uses every available CPU.",
+    )
+    parser.add_argument(
+        "--executor",
+        type=str,
+        choices=["process", "thread"],
+        default="process",
+        help="Kind of worker pool to summarize FastQC archives with.",
+    )
+    parser.add_argument(
+        "--lru-size",
+        type=int,
+        default=1024,
+        help="Maximum number of recent summaries to keep in memory. The least recently used summaries are evicted first.",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log every request to stderr.")
+
+    args = parser.parse_args(argv)
+
+    if not Path(args.root).is_dir():
+        raise FileNotFoundError(f"Root directory '{args.root}' could not be found.")
+    if args.workers < 0:
+        parser.error(f"argument -j/--workers: must be at least 0, got {args.workers}")
+    if args.workers == 0:
+        args.workers = os.cpu_count() or 1
+    if args.lru_size < 1:
+        parser.error(f"argument --lru-size: must be at least 1, got {args.lru_size}")
+
+    return ServeArgs(
+        host=args.host,
+        port=args.port,
+        socket_path=args.socket,
+        root=args.root,
+        workers=args.workers,
+        executor=args.executor,
+        lru_size=args.lru_size,
+        verbose=args.verbose,
+    )
+
+
+def expand_glob(pattern: str) -> list[str]:
+    """Expand a glob pattern into the sorted paths it matches.
+
+    Paths that exist or do not contain glob characters are returned as is.
+    Patterns that match nothing are also returned as is so that they are reported as missing files.
+
+    Args:
+        pattern: A path or glob pattern.
+
+    Returns:
+        A list of paths.
+    """
+    if Path(pattern).exists() or glob.escape(pattern) == pattern:
+        return [pattern]
+
+    return sorted(glob.glob(pattern, recursive=True)) or [pattern]
+
+
+def read_manifest(manifest: str) -> list[str]:
+    """Read paths to FastQC ZIP archive files from a manifest file.
+
+    The manifest lists one path per line. Blank lines and lines starting with '#' are ignored.
+
+    Args:
+        manifest: Path to a manifest file.
+
+    Returns:
+        A list of paths.
+
+    Raises:
+        FileNotFoundError: Manifest file could not be found.
+    """
+    if not Path(manifest).exists():
+        raise FileNotFoundError(f"Manifest file '{manifest}' could not be found.")
+
+    with open(manifest, "r") as manifest_file:
+        lines = (line.strip() for line in manifest_file)
+        return [line for line in lines if line and not line.startswith("#")]
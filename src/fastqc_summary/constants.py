@@ -0,0 +1,43 @@
+"""Names and defaults shared by the command-line interface and the rest of the package.
+
+These live apart from the modules that use them, so that parsing command-line arguments,
+e.g. for `--help`, does not import the parser, the summaries, or worker pools.
+"""
+
+DEFAULT_SUMMARIES = ("read_count", "base_count")
+
+SUMMARY_NAMES = (
+    "read_count",
+    "base_count",
+    "mean_quality",
+    "median_quality",
+    "q30_fraction",
+    "mean_gc",
+    "deduplicated_percentage",
+    "max_adapter_fraction",
+    "overrepresented_fraction",
+)
+"""Names of the built-in summaries, in registration order, see `fastqc_summary.summaries.SUMMARIES`."""
+
+FASTQC_MODULES = (
+    "Basic Statistics",
+    "Per base sequence quality",
+    "Per tile sequence quality",
+    "Per sequence quality scores",
+    "Per base sequence content",
+    "Per sequence GC content",
+    "Per base N content",
+    "Sequence Length Distribution",
+    "Sequence Duplication Levels",
+    "Overrepresented sequences",
+    "Adapter Content",
+    "Kmer Content",
+)
+"""Names of the modules of FastQC reports, in report order."""
+
+DEFAULT_EXPORT_MODULES = ("Per base sequence quality", "Per sequence GC content", "Adapter Content")
+
+STATE_FILE_NAME = ".fastqc-summary-state.ndjson"
+
+ILLUMINA_PATTERN = r"^(?P<sample>.+?)(?:_S\d+)?(?:_L\d{3}(?:_R[12])?|_R[12])(?:_\d{3})?$"
+"""Illumina FASTQ file naming, '<sample>_S<number>_L<lane>_R<mate>_001', where the sample number, lane, and chunk are optional."""
@@ -0,0 +1,203 @@
+"""Export FastQC module tables from many FastQC archives.
+
+The tables of selected FastQC modules are written in long format, one file per module,
+with a `sample` column identifying the FastQC archive each row came from.
+Each row holds the value of one column of one row of the module, e.g. the mean quality at one base position:
+
+| sample | Base | variable | value |
+| --- | --- | --- | --- |
+| SRR1067505_1 | 1 | Mean | 32.2 |
+
+Tables are written as Parquet files when pyarrow is installed, and as gzip-compressed TSV files otherwise.
+Rows of Parquet tables are buffered and written in large row groups spanning many FastQC archives.
+
+Typical usage examples:
+    >>> from fastqc_summary.export import ModuleExporter, module_table
+    >>> from fastqc_summary.parser import parse_modules
+    >>> with ModuleExporter("export", ["Per base sequence quality"]) as exporter:
+    >>>     modules = parse_modules("SRR1067505_1_fastqc.zip", wanted=exporter.modules)
+    >>>     exporter.write("SRR1067505_1", {module.name: module_table(module) for module in modules})
+"""
+
+import csv
+import gzip
+from pathlib import Path
+import re
+from typing import Collection
+
+from fastqc_summary.constants import DEFAULT_EXPORT_MODULES
+from fastqc_summary.parser import Module
+
+EXPORT_FORMATS = ("auto", "parquet", "tsv")
+
+ROW_GROUP_SIZE = 500_000
+"""Rows of a module table buffered per Parquet row group, from hundreds to thousands of FastQC archives."""
+
+
+def module_table(module: Module) -> dict[str, list]:
+    """Reshape the data of a module into a long-format table.
+
+    The first column of the module is kept as the key of each row.
+    Every other column is melted into `variable` and `value` columns.
+    Values that are not numbers, e.g. the possible source of an overrepresented sequence, are None.
+
+    Args:
+        module: A FastQC module.
+
+    Returns:
+        A dict mapping column names to columns of the long-format table.
+    """
+    key_name, *variables = module.columns or [""]
+    keys = module.values(0) if module.data else ()
+
+    table = {key_name: [], "variable": [], "value": []}
+    for index, variable in enumerate(variables, start=1):
+        table[key_name].extend(keys)
+        table["variable"].extend([variable] * len(keys))
+        table["value"].extend(map(_to_float, module.values(index)))
+
+    return table
+
+
+def _to_float(value: str) -> float | None:
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def module_slug(name: str) -> str:
+    """Make a file name friendly slug from a module name, e.g. 'Adapter Content' to 'adapter_content'."""
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+class ModuleExporter:
+    """Writer of long-format tables of FastQC modules from many FastQC archives.
+
+    Attributes:
+        export_dir: Path to a directory to write one table per module to.
+        modules: Names of modules to export.
+        export_format: Format of the tables, one of [parquet, tsv].
+        row_group_size: Rows of each module buffered before they are written as one Parquet row group.
+    """
+
+    def __init__(
+        self,
+        export_dir: str | Path,
+        modules: Collection[str] = DEFAULT_EXPORT_MODULES,
+        export_format: str = "auto",
+        row_group_size: int = ROW_GROUP_SIZE,
+    ) -> None:
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Export format must be one of {list(EXPORT_FORMATS)}, got '{export_format}'.")
+        if export_format == "auto":
+            export_format = "parquet" if _has_pyarrow() else "tsv"
+        if export_format == "parquet" and not _has_pyarrow():
+            raise ImportError("Parquet export requires pyarrow. Install pyarrow or export to TSV instead.")
+
+        Path(export_dir).mkdir(parents=True, exist_ok=True)
+        self.export_dir = Path(export_dir)
+        self.modules = tuple(modules)
+        self.export_format = export_format
+        self.row_group_size = row_group_size
+        self._writers = {}
+        self._buffers = {}
+
+    def __enter__(self) -> "ModuleExporter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def path(self, module_name: str) -> Path:
+        """Path to the table of a module."""
+        extension = ".parquet" if self.export_format == "parquet" else ".tsv.gz"
+        return self.export_dir / f"{module_slug(module_name)}{extension}"
+
+    def write(self, sample: str, tables: dict[str, dict[str, list]]) -> None:
+        """Append the module tables of a FastQC archive.
+
+        Args:
+            sample: Sample name of the FastQC archive.
+            tables: A dict mapping module names to long-format tables of the modules.
+        """
+        for module_name, table in tables.items():
+            if module_name not in self.modules:
+                continue
+
+            rows = len(table["variable"])
+            if not rows:
+                continue
+
+            table = {"sample": [sample] * rows, **table}
+            if self.export_format == "parquet":
+                self._write_parquet(module_name, table)
+            else:
+                self._write_tsv(module_name, table)
+
+    def close(self) -> None:
+        """Finish writing every table, writing the rows still buffered."""
+        for module_name in list(self._buffers):
+            self._flush_parquet(module_name)
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+    def _write_parquet(self, module_name: str, table: dict[str, list]) -> None:
+        # rows of many FastQC archives are buffered so that tables have few large row groups
+        buffer = self._buffers.setdefault(module_name, {column: [] for column in table})
+        for column, values in zip(buffer.values(), table.values()):
+            column.extend(values)
+
+        if len(buffer["variable"]) >= self.row_group_size:
+            self._flush_parquet(module_name)
+
+    def _flush_parquet(self, module_name: str) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = self._buffers.pop(module_name)
+        key_name = list(table)[1]
+        schema = pa.schema([
+            ("sample", pa.string()),
+            (key_name, pa.string()),
+            ("variable", pa.string()),
+            ("value", pa.float64()),
+        ])
+        if module_name not in self._writers:
+            self._writers[module_name] = pq.ParquetWriter(self.path(module_name), schema)
+
+        self._writers[module_name].write_table(pa.table(table, schema=schema), row_group_size=self.row_group_size)
+
+    def _write_tsv(self, module_name: str, table: dict[str, list]) -> None:
+        if module_name not in self._writers:
+            self._writers[module_name] = _TsvTableWriter(self.path(module_name), list(table))
+
+        self._writers[module_name].write(table)
+
+
+class _TsvTableWriter:
+    def __init__(self, path: Path, header: list[str]) -> None:
+        self._file = gzip.open(path, "wt", newline="")
+        self._writer = csv.writer(self._file, delimiter="\t", lineterminator="\n")
+        self._writer.writerow(header)
+
+    def write(self, table: dict[str, list]) -> None:
+        self._writer.writerows(zip(*(_format_column(column) for column in table.values())))
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _format_column(column: list) -> list:
+    # missing values are written as empty fields
+    return ["" if value is None else value for value in column]
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+
+    return True
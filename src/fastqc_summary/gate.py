@@ -0,0 +1,339 @@
+"""Gate FastQC archives on quality control rules over the statuses of modules and computed summaries.
+
+Rules are read from a JSON file, or from a YAML file when PyYAML is installed, e.g.:
+
+    {
+        "rules": [
+            {"summary": "read_count", "op": ">=", "value": 20000000},
+            {"module": "Adapter Content", "op": "!=", "value": "fail"},
+            {"summary": "mean_quality", "op": ">=", "value": 30, "fatal": false, "name": "mean quality"}
+        ]
+    }
+
+Module statuses are ordered from pass to warn to fail, so that e.g. `{"module": ..., "op": "<=", "value": "warn"}` passes
+modules that did not fail. A missing module or summary, e.g. None for modules left out of FastQC reports, fails its rule.
+
+Rules are decided while the FastQC archive is parsed: a status rule as soon as its module is parsed,
+and a summary rule as soon as every module its summary needs is parsed.
+In fail-fast mode, parsing stops as soon as a fatal rule fails, and the rules left undecided are skipped.
+
+Typical usage examples:
+    >>> from fastqc_summary.batch import summarize_many
+    >>> from fastqc_summary.gate import GateTally, load_gate
+    >>> tally = GateTally()
+    >>> for sample, summaries in tally.fold(summarize_many(["a_fastqc.zip"], gate=load_gate("rules.json", fail_fast=True))):
+    >>>     print(sample, summaries["qc_gate"])
+"""
+
+from dataclasses import asdict, dataclass
+import json
+import operator
+from pathlib import Path
+from typing import Collection, Iterable, Iterator
+
+from fastqc_summary.parser import Module
+from fastqc_summary.summaries import compute_summaries, required_modules, SUMMARIES
+
+OPERATORS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge, "==": operator.eq, "!=": operator.ne}
+
+STATUSES = ("pass", "warn", "fail")
+"""Statuses of FastQC modules, from best to worst."""
+
+OUTCOMES = ("pass", "skipped", "warn", "fail")
+"""Outcomes of rules and verdicts of the gate, from best to worst. Rules are only skipped once a fatal rule failed."""
+
+VERDICT_KEY = "qc_gate"
+"""Key of the verdict of the gate in summaries, one of [pass, warn, fail]."""
+
+RULE_KEY_PREFIX = "qc:"
+"""Prefix of the keys of the outcome of each rule in summaries, one of [pass, fail, skipped]."""
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A quality control rule on the status of a module or on a summary.
+
+    Attributes:
+        name: A name for the rule, used as its key in the results.
+        op: Comparison operator, one of [<, <=, >, >=, ==, !=].
+        value: Value to compare against, a number for summaries or a status for modules.
+        summary: Name of the summary the rule checks, or None for a status rule.
+        module: Name of the module whose status the rule checks, or None for a summary rule.
+        fatal: Whether failing the rule fails the FastQC archive, rather than only warning.
+    """
+    name: str
+    op: str
+    value: float | str
+    summary: str | None = None
+    module: str | None = None
+    fatal: bool = True
+
+    def check(self, actual: float | str | None) -> bool:
+        """Check a summary value or module status against the rule. Missing values fail."""
+        if actual is None:
+            return False
+        if self.module is not None:
+            # statuses are compared by how bad they are
+            return OPERATORS[self.op](STATUSES.index(actual), STATUSES.index(self.value))
+
+        return OPERATORS[self.op](actual, self.value)
+
+
+@dataclass(frozen=True)
+class QCGate:
+    """A set of quality control rules evaluated against each FastQC archive.
+
+    Attributes:
+        rules: The rules to evaluate.
+        fail_fast: Stop parsing a FastQC archive as soon as a fatal rule fails.
+    """
+    rules: tuple[Rule, ...]
+    fail_fast: bool = False
+
+    @property
+    def summary_names(self) -> tuple[str, ...]:
+        """Names of the summaries the rules check."""
+        return tuple(dict.fromkeys(rule.summary for rule in self.rules if rule.summary is not None))
+
+    @property
+    def modules(self) -> set[str]:
+        """Names of the modules the rules need, for their statuses or for their summaries."""
+        return {rule.module for rule in self.rules if rule.module is not None} | required_modules(self.summary_names)
+
+    def options(self) -> dict:
+        """Serialize the gate, e.g. so that summaries gated by other rules are not reused from a cache."""
+        return {"rules": [asdict(rule) for rule in self.rules], "fail_fast": self.fail_fast}
+
+
+def make_gate(rules: Iterable[dict], fail_fast: bool = False) -> QCGate:
+    """Make a gate from rules given as dicts, as in a rules file.
+
+    Args:
+        rules: Rules with a 'summary' or 'module' key, an 'op', and a 'value', and an optional 'name' and 'fatal'.
+        fail_fast: Stop parsing a FastQC archive as soon as a fatal rule fails.
+
+    Returns:
+        The gate.
+
+    Raises:
+        ValueError: A rule is invalid.
+    """
+    gate_rules = []
+    for spec in rules:
+        if not isinstance(spec, dict) or ("summary" in spec) == ("module" in spec):
+            raise ValueError(f"Rule must have either a 'summary' or a 'module' key, got {spec}.")
+        unknown = set(spec) - {"name", "summary", "module", "op", "value", "fatal"}
+        if unknown:
+            raise ValueError(f"Rule has unknown keys {sorted(unknown)}, got {spec}.")
+        if spec.get("op") not in OPERATORS:
+            raise ValueError(f"Rule operator must be one of {list(OPERATORS)}, got {spec}.")
+        if "value" not in spec:
+            raise ValueError(f"Rule must have a 'value', got {spec}.")
+        if "summary" in spec and spec["summary"] not in SUMMARIES:
+            raise ValueError(f"Rule summary must be one of {list(SUMMARIES)}, got {spec}.")
+        if "summary" in spec and (isinstance(spec["value"], bool) or not isinstance(spec["value"], (int, float))):
+            raise ValueError(f"Rule value of a summary must be a number, got {spec}.")
+        if "module" in spec and spec["value"] not in STATUSES:
+            raise ValueError(f"Rule value of a module must be one of {list(STATUSES)}, got {spec}.")
+
+        target = spec.get("summary") or f"{spec['module']} status"
+        gate_rules.append(Rule(
+            name=str(spec.get("name") or f"{target} {spec['op']} {spec['value']}"),
+            op=spec["op"],
+            value=spec["value"],
+            summary=spec.get("summary"),
+            module=spec.get("module"),
+            fatal=bool(spec.get("fatal", True)),
+        ))
+
+    names = [rule.name for rule in gate_rules]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Rule names must be unique, got duplicates {duplicates}.")
+
+    return QCGate(tuple(gate_rules), fail_fast)
+
+
+def load_gate(rules_file: str | Path, fail_fast: bool = False) -> QCGate:
+    """Load a gate from a JSON or YAML rules file.
+
+    The rules file holds a list of rules, or an object with the list under 'rules', see `make_gate()`.
+    Files ending in '.yaml' or '.yml' are read as YAML, which requires PyYAML.
+
+    Args:
+        rules_file: Path to a rules file.
+        fail_fast: Stop parsing a FastQC archive as soon as a fatal rule fails.
+
+    Returns:
+        The gate.
+
+    Raises:
+        FileNotFoundError: Rules file could not be found.
+        ImportError: Rules file is YAML and PyYAML is not installed.
+        ValueError: Rules file or a rule is invalid.
+    """
+    path = Path(rules_file)
+    if not path.is_file():
+        raise FileNotFoundError(f"Rules file '{rules_file}' could not be found.")
+
+    if path.suffix in (".yaml", ".yml"):
+        # PyYAML is optional, so it is imported only for YAML rules files
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("YAML rules files require PyYAML. Install PyYAML or write the rules as JSON instead.") from None
+        spec = yaml.safe_load(path.read_text())
+    else:
+        try:
+            spec = json.loads(path.read_text())
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Rules file '{rules_file}' is not valid JSON: {e}") from None
+
+    rules = spec.get("rules") if isinstance(spec, dict) else spec
+    if not isinstance(rules, list) or not rules:
+        raise ValueError(f"Rules file '{rules_file}' must hold a non-empty list of rules.")
+
+    return make_gate(rules, fail_fast)
+
+
+class GateEvaluation:
+    """Evaluation of a gate against the modules of one FastQC archive as they are parsed.
+
+    Attributes:
+        gate: The gate to evaluate.
+        length_mode: Length of reads in binned lengths for summaries, one of [lower, midpoint, upper].
+        modules: Modules added so far by name.
+        outcomes: Outcomes of the rules decided so far by name, one of [pass, fail].
+        stopped: Whether parsing was stopped early by a failed fatal rule.
+    """
+
+    def __init__(self, gate: QCGate, length_mode: str = "midpoint") -> None:
+        self.gate = gate
+        self.length_mode = length_mode
+        self.modules: dict[str, Module] = {}
+        self.outcomes: dict[str, str] = {}
+        self.stopped = False
+        self._summaries = {}
+
+    def add(self, module: Module) -> bool:
+        """Add a parsed module and decide the rules that it completes.
+
+        Returns:
+            True if parsing should stop, i.e. in fail-fast mode once a fatal rule failed.
+        """
+        self.modules[module.name] = module
+        for rule in self.gate.rules:
+            if rule.name in self.outcomes:
+                continue
+            if rule.module == module.name:
+                self._decide(rule, module.status)
+            elif rule.summary is not None and self._complete(rule.summary):
+                self._decide(rule, self._summary(rule.summary))
+
+        self.stopped = self.gate.fail_fast and self._failed(fatal=True)
+        return self.stopped
+
+    def summaries(self, names: Collection[str]) -> dict:
+        """Compute summaries from the added modules, with the verdict of the gate and the outcome of each rule.
+
+        Rules still undecided are decided from the absence of their modules, or skipped when parsing was stopped early.
+        When parsing was stopped early, summaries needing modules that were not parsed are None.
+        Summaries already computed to decide rules are reused.
+
+        Raises:
+            ValueError: A module needed by a summary that is not optional was not found.
+        """
+        pending = [name for name in names if name not in self._summaries and (not self.stopped or self._complete(name))]
+        self._summaries.update(compute_summaries(self.modules.values(), pending, length_mode=self.length_mode))
+        summaries = {name: self._summaries.get(name) for name in names}
+
+        for rule in self.gate.rules:
+            if rule.name in self.outcomes:
+                continue
+            if self.stopped:
+                self.outcomes[rule.name] = "skipped"
+            elif rule.module is not None:
+                self._decide(rule, None)
+            else:
+                self._decide(rule, self._summary(rule.summary))
+
+        verdict = "fail" if self._failed(fatal=True) else "warn" if self._failed(fatal=False) else "pass"
+        return {
+            **summaries,
+            VERDICT_KEY: verdict,
+            **{f"{RULE_KEY_PREFIX}{rule.name}": self.outcomes[rule.name] for rule in self.gate.rules},
+        }
+
+    def _summary(self, name: str) -> float | None:
+        if name not in self._summaries:
+            # a summary missing its modules fails its rule rather than the whole run, even when it is not optional
+            if not self._complete(name):
+                return None
+            self._summaries.update(compute_summaries(self.modules.values(), [name], length_mode=self.length_mode))
+        return self._summaries[name]
+
+    def _complete(self, name: str) -> bool:
+        return all(module in self.modules for module in SUMMARIES[name].modules)
+
+    def _decide(self, rule: Rule, actual: float | str | None) -> None:
+        self.outcomes[rule.name] = "pass" if rule.check(actual) else "fail"
+
+    def _failed(self, fatal: bool) -> bool:
+        return any(rule.fatal == fatal and self.outcomes.get(rule.name) == "fail" for rule in self.gate.rules)
+
+
+def evaluate_archive(
+    gate: QCGate,
+    modules: Iterable[Module],
+    summary_names: Collection[str],
+    length_mode: str = "midpoint",
+) -> dict:
+    """Compute summaries and evaluate a gate in a single pass over the modules of a FastQC archive.
+
+    In fail-fast mode, the modules are no longer pulled once a fatal rule fails, so the FastQC data is no longer read.
+
+    Args:
+        gate: The gate to evaluate.
+        modules: Parsed modules, e.g. from `parse_modules()`, including the modules the gate needs.
+        summary_names: Names of summaries to compute.
+        length_mode: Length of reads in binned lengths, one of [lower, midpoint, upper].
+
+    Returns:
+        A dict mapping summary keys to summary values, with the verdict under 'qc_gate' and the outcome of each rule
+        under its name prefixed by 'qc:'.
+    """
+    evaluation = GateEvaluation(gate, length_mode)
+    modules = iter(modules)
+    try:
+        for module in modules:
+            if evaluation.add(module):
+                break
+    finally:
+        # stop reading the FastQC data
+        if hasattr(modules, "close"):
+            modules.close()
+
+    return evaluation.summaries(summary_names)
+
+
+class GateTally:
+    """Tally of the verdicts of a gate over many FastQC archives.
+
+    Attributes:
+        counts: Number of FastQC archives with each verdict.
+        failed: Sample names of the FastQC archives that failed the gate.
+    """
+
+    def __init__(self) -> None:
+        self.counts = dict.fromkeys(("pass", "warn", "fail"), 0)
+        self.failed: list[str] = []
+
+    def fold(self, results: Iterable[tuple[str, dict]]) -> Iterator[tuple[str, dict]]:
+        """Tally verdicts as summaries stream past, yielding them unchanged."""
+        for sample, summaries in results:
+            verdict = summaries.get(VERDICT_KEY)
+            if verdict in self.counts:
+                self.counts[verdict] += 1
+            if verdict == "fail":
+                self.failed.append(sample)
+            yield sample, summaries
@@ -0,0 +1,238 @@
+"""Merge the summaries of the FastQC archives of each sample, e.g. of its mates and lanes, into one record per sample.
+
+Illumina names FASTQ files like 'Sample1_S1_L001_R1_001.fastq.gz',
+so a paired-end sample sequenced on four lanes has eight FastQC archives.
+The sample of each FastQC archive is found from its name, or looked up in a sample sheet,
+and the summaries of the FastQC archives of a sample are merged as they stream out of a batch run,
+so the FastQC archives are still summarized concurrently and each sample is written as soon as it is complete.
+
+Each summary is merged by the rule it is registered with, see `register_summary()`:
+counts are summed, and means and medians are weighted by the read count of each FastQC archive,
+so that a lane with twice the reads counts twice as much towards the quality of the sample.
+
+Typical usage examples:
+    >>> from fastqc_summary.batch import summarize_many
+    >>> from fastqc_summary.merge import SampleMerger
+    >>> merger = SampleMerger(expected={"Sample1": 2})
+    >>> archives = ["Sample1_S1_L001_R1_001_fastqc.zip", "Sample1_S1_L001_R2_001_fastqc.zip"]
+    >>> for sample, summaries in merger.fold(summarize_many(archives, summary_names=["read_count", "mean_quality"])):
+    >>>     print(sample, summaries)
+"""
+
+from collections import Counter
+import csv
+from pathlib import Path
+import re
+from typing import Iterable, Iterator, Mapping
+
+from fastqc_summary.batch import sample_name
+from fastqc_summary.constants import ILLUMINA_PATTERN
+from fastqc_summary.gate import OUTCOMES
+from fastqc_summary.summaries import SUMMARIES, weighted_median
+
+FASTQ_SUFFIXES = (".gz", ".bz2", ".txt", ".fastq", ".fq", ".csfastq", ".sam", ".bam")
+"""Suffixes FastQC removes from FASTQ file names, in order, to name its output."""
+
+WEIGHT = "read_count"
+"""Summary that means and medians are weighted by."""
+
+
+def archive_name(path: str) -> str:
+    """Derive the name FastQC gives the archive of a FASTQ file or FastQC archive, e.g. 'Sample1_S1_L001_R1_001'."""
+    name = sample_name(path)
+    for suffix in FASTQ_SUFFIXES:
+        name = name.removesuffix(suffix)
+
+    return name
+
+
+def read_sample_sheet(sample_sheet: str | Path) -> dict[str, str]:
+    """Read a sample sheet mapping FASTQ files or sample names to samples.
+
+    The sample sheet is a CSV or TSV file with a header row, either
+    with 'file' and 'sample' columns listing the FASTQ file or FastQC archive of each sample,
+    or an Illumina sample sheet whose '[Data]' section has a 'Sample_ID' and an optional 'Sample_Name' column.
+    FastQC archives whose names start with a Sample_Name or Sample_ID, by Illumina naming, belong to that Sample_ID.
+
+    Args:
+        sample_sheet: Path to a sample sheet.
+
+    Returns:
+        A dict mapping archive names, or sample names by Illumina naming, to samples.
+
+    Raises:
+        FileNotFoundError: Sample sheet could not be found.
+        ValueError: Sample sheet has none of the expected columns.
+    """
+    if not Path(sample_sheet).is_file():
+        raise FileNotFoundError(f"Sample sheet '{sample_sheet}' could not be found.")
+
+    lines = Path(sample_sheet).read_text().splitlines()
+
+    # Illumina sample sheets hold their samples in a '[Data]' section, e.g. '[BCLConvert_Data]'
+    sections = [index for index, line in enumerate(lines) if re.match(r"\[(\w+_)?Data\]", line.strip())]
+    if sections:
+        lines = lines[sections[0] + 1:]
+        lines = lines[:next((index for index, line in enumerate(lines) if line.startswith("[")), len(lines))]
+
+    lines = [line for line in lines if line.strip() and not line.startswith("#")]
+    reader = csv.DictReader(lines, delimiter="\t" if lines and "\t" in lines[0] else ",")
+    columns = {column.strip().lower(): column for column in reader.fieldnames or ()}
+    rows = list(reader)
+
+    if "file" in columns and "sample" in columns:
+        return {archive_name(row[columns["file"]].strip()): row[columns["sample"]].strip() for row in rows}
+    if "sample_id" in columns:
+        samples = {}
+        for row in rows:
+            sample = row[columns["sample_id"]].strip()
+            samples[sample] = sample
+            if "sample_name" in columns and row[columns["sample_name"]].strip():
+                samples[row[columns["sample_name"]].strip()] = sample
+        return samples
+
+    raise ValueError(f"Sample sheet '{sample_sheet}' must have 'file' and 'sample' columns or a 'Sample_ID' column.")
+
+
+class SampleGrouper:
+    """Finder of the sample of each FastQC archive.
+
+    A FastQC archive listed in the sample sheet belongs to the sample listed for it.
+    Otherwise, the sample is the 'sample' capture group of the pattern, or the first capture group if there is none,
+    looked up in the sample sheet if there is one.
+    FastQC archives whose names do not match the pattern are samples of their own.
+
+    Attributes:
+        pattern: A regular expression matched against archive names.
+        sample_sheet: A dict mapping archive names or sample names to samples, see `read_sample_sheet()`.
+    """
+
+    def __init__(self, pattern: str | re.Pattern = ILLUMINA_PATTERN, sample_sheet: Mapping[str, str] | None = None) -> None:
+        self.pattern = re.compile(pattern) if isinstance(pattern, str) else pattern
+        self.sample_sheet = dict(sample_sheet or {})
+
+    def sample(self, name: str) -> str:
+        """Find the sample of a FastQC archive from its archive name, e.g. as yielded by `summarize_many()`."""
+        name = archive_name(name)
+        if name in self.sample_sheet:
+            return self.sample_sheet[name]
+
+        match = self.pattern.search(name)
+        if match is not None:
+            groups = match.groupdict()
+            name = groups["sample"] if "sample" in groups else (match.group(1) if match.groups() else match.group(0))
+
+        return self.sample_sheet.get(name, name)
+
+    def expected(self, fastqc_archives: Iterable[str]) -> Counter:
+        """Count the FastQC archives of each sample."""
+        return Counter(self.sample(fastqc_archive) for fastqc_archive in fastqc_archives)
+
+
+def merge_summaries(summaries: Iterable[dict]) -> dict:
+    """Merge the summaries of the FastQC archives of a sample.
+
+    Summaries are merged by the rule of the registered summary of the same name, see `register_summary()`.
+    Means and medians are weighted by read count when every FastQC archive has one, and unweighted otherwise.
+    Medians of medians, e.g. of `median_quality`, approximate the median of the pooled reads.
+    Missing summaries, e.g. None for modules left out of FastQC reports, are skipped.
+    Verdicts of a gate and outcomes of its rules, see `fastqc_summary.gate`, are merged to the worst of them.
+
+    Args:
+        summaries: Summaries of each FastQC archive of the sample.
+
+    Returns:
+        The merged summaries of the sample, with the same keys.
+    """
+    summaries = list(summaries)
+    merged = {}
+    for key in dict.fromkeys(key for archive in summaries for key in archive):
+        outcomes = [archive[key] for archive in summaries if archive.get(key) is not None]
+        if outcomes and all(outcome in OUTCOMES for outcome in outcomes):
+            merged[key] = max(outcomes, key=OUTCOMES.index)
+            continue
+
+        summary = SUMMARIES.get(key)
+        rule = summary.merge if summary is not None else "mean"
+        pairs = [
+            (archive[key], archive.get(WEIGHT))
+            for archive in summaries
+            if isinstance(archive.get(key), (int, float)) and not isinstance(archive.get(key), bool)
+        ]
+        merged[key] = _MERGERS[rule](pairs) if pairs else None
+
+    return merged
+
+
+def _sum(pairs: list[tuple[float, int | None]]) -> float:
+    return sum(value for value, _ in pairs)
+
+
+def _weights(pairs: list[tuple[float, int | None]]) -> list[float]:
+    # fall back to equal weights when any FastQC archive has no reads to weight by
+    weights = [weight for _, weight in pairs]
+    if any(not isinstance(weight, (int, float)) for weight in weights) or not sum(weights):
+        return [1.0] * len(pairs)
+    return weights
+
+
+def _mean(pairs: list[tuple[float, int | None]]) -> float:
+    weights = _weights(pairs)
+    return sum(value * weight for (value, _), weight in zip(pairs, weights)) / sum(weights)
+
+
+def _median(pairs: list[tuple[float, int | None]]) -> float:
+    return weighted_median([value for value, _ in pairs], _weights(pairs))
+
+
+def _max(pairs: list[tuple[float, int | None]]) -> float:
+    return max(value for value, _ in pairs)
+
+
+_MERGERS = {"sum": _sum, "mean": _mean, "median": _median, "max": _max}
+
+
+class SampleMerger:
+    """Fold the summaries of FastQC archives into merged summaries per sample.
+
+    A sample is yielded as soon as all of its expected FastQC archives have been summarized,
+    and samples with FastQC archives missing, or not known in advance, e.g. in bundles, are yielded at the end.
+
+    Attributes:
+        grouper: Finder of the sample of each FastQC archive.
+        expected: Number of FastQC archives of each sample, e.g. from `SampleGrouper.expected()`.
+            Leave as None to yield every sample at the end.
+        drop: Keys of summaries to leave out of merged records, e.g. read counts only computed to weight by.
+    """
+
+    def __init__(
+        self,
+        grouper: SampleGrouper | None = None,
+        expected: Mapping[str, int] | None = None,
+        drop: Iterable[str] = (),
+    ) -> None:
+        self.grouper = grouper if grouper is not None else SampleGrouper()
+        self.expected = dict(expected) if expected is not None else {}
+        self.drop = set(drop)
+        self._pending: dict[str, list[dict]] = {}
+
+    def fold(self, results: Iterable[tuple[str, dict]]) -> Iterator[tuple[str, dict]]:
+        """Merge summaries of FastQC archives as they stream past, yielding the merged summaries of each sample.
+
+        Merged summaries hold the number of FastQC archives merged under 'archives'.
+        """
+        for name, summaries in results:
+            sample = self.grouper.sample(name)
+            archives = self._pending.setdefault(sample, [])
+            archives.append(summaries)
+            if len(archives) == self.expected.get(sample):
+                yield sample, self._merge(self._pending.pop(sample))
+
+        for sample, archives in list(self._pending.items()):
+            del self._pending[sample]
+            yield sample, self._merge(archives)
+
+    def _merge(self, archives: list[dict]) -> dict:
+        merged = merge_summaries(archives)
+
+        return {**{key: value for key, value in merged.items() if key not in self.drop}, "archives": len(archives)}
@@ -2,67 +2,630 @@
 
 FastQC data is in a semistructured format in a file inside of a FastQC ZIP archive file.
 The FastQC data must be read from the fastqc_data.txt file and parsed module by module to be useful.
+The fastqc_data.txt file may also be read from an extracted FastQC output directory or directly from a plain or gzip-compressed file.
 
 Typical usage examples:
 """
 
-from dataclasses import dataclass
+from array import array
+from contextlib import contextmanager, nullcontext
+from functools import partial
+import gzip
 import io
-from typing import Iterator
+from itertools import zip_longest
+import mmap
+import os
+from pathlib import Path
+from typing import BinaryIO, Callable, Collection, Iterator, NamedTuple, Sequence, TYPE_CHECKING
 import zipfile
 
+if TYPE_CHECKING:
+    from fastqc_summary.timings import ArchiveProfiler
+
+
+FastqcSource = str | os.PathLike | zipfile.ZipFile | BinaryIO
+"""A FastQC input: a path, an open ZIP archive, or a binary file object of a ZIP archive or FastQC data file."""
+
+FASTQC_DATA_MAGIC = b"##FastQC"
+SUMMARY_FILE_NAME = "summary.txt"
+"""File FastQC writes the status of every module to, next to fastqc_data.txt."""
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZIP_MAGICS = (b"PK\x03\x04", b"PK\x05\x06")
+
 
-@dataclass
 class Module:
     """Representation of a module of FastQC data.
 
+    Rows of data are kept as unsplit tab-delimited lines, which `parse_modules()` only decodes once they are accessed.
+    Columns are split from the rows and converted to compact typed arrays lazily, the first time they are requested,
+    and are cached on the module so that summaries sharing a column only convert it once.
+
     Attributes:
         name: A name for the module.
         status: A status for the module, one of [pass, warn, fail].
         columns: Column names for the data fields.
         data: Rows of data for the module.
+        properties: Values from header lines preceding the column names, e.g. 'Total Deduplicated Percentage'.
+    """
+
+    # a plain slotted class rather than a dataclass, as importing dataclasses costs more than the rest of the parser
+    __slots__ = ("name", "status", "columns", "data", "properties", "_fields", "_arrays")
+
+    def __init__(
+        self,
+        name: str,
+        status: str,
+        columns: list[str],
+        data: Sequence[str],
+        properties: dict[str, str] | None = None,
+    ) -> None:
+        self.name = name
+        self.status = status
+        self.columns = columns
+        self.data = data
+        self.properties = properties if properties is not None else {}
+        self._fields: list[tuple[str, ...]] | None = None
+        self._arrays: dict[tuple[int, str], array] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"Module(name={self.name!r}, status={self.status!r}, columns={self.columns!r}, "
+            f"data={self.data!r}, properties={self.properties!r})"
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Module):
+            return NotImplemented
+        return (
+            (self.name, self.status, self.columns, self.data, self.properties)
+            == (other.name, other.status, other.columns, other.data, other.properties)
+        )
+
+    __hash__ = None
+
+    def values(self, column: str | int) -> tuple[str, ...]:
+        """Get the raw values of a column.
+
+        Args:
+            column: Name or index of the column.
+
+        Returns:
+            The values of the column as strings, one per row.
+
+        Raises:
+            KeyError: The module has no column with the given name.
+        """
+        index = self._column_index(column)
+
+        # split every row once and transpose the rows into columns
+        if self._fields is None:
+            self._fields = list(zip_longest(*(line.split("\t") for line in self.data), fillvalue=""))
+
+        if index >= len(self._fields):
+            return ("",) * len(self.data)
+
+        return self._fields[index]
+
+    def iter_values(self, column: str | int) -> Iterator[str]:
+        """Stream the raw values of a column row by row.
+
+        Unlike `values()`, rows are neither split up front nor kept,
+        so that large modules such as Overrepresented sequences are read in constant memory.
+
+        Args:
+            column: Name or index of the column.
+
+        Yields:
+            The value of the column in each row, or an empty string for rows without it.
+
+        Raises:
+            KeyError: The module has no column with the given name.
+        """
+        index = self._column_index(column)
+        for line in self.data:
+            fields = line.split("\t", index + 1)
+            yield fields[index] if index < len(fields) else ""
+
+    def column(self, column: str | int, typecode: str = "d", numpy: bool = False) -> "array | numpy.ndarray":
+        """Get the values of a column as a typed array.
+
+        Args:
+            column: Name or index of the column.
+            typecode: Type code of the array, 'd' for floats or 'q' for integers.
+            numpy: Return a NumPy array sharing memory with the typed array instead. Requires NumPy to be installed.
+
+        Returns:
+            The values of the column, one per row.
+
+        Raises:
+            KeyError: The module has no column with the given name.
+            ValueError: The type code is not supported or a value could not be converted.
+        """
+        if typecode not in _CONVERTERS:
+            raise ValueError(f"Type code must be one of {list(_CONVERTERS)}, got '{typecode}'.")
+
+        key = (self._column_index(column), typecode)
+        if key not in self._arrays:
+            self._arrays[key] = _CONVERTERS[typecode](self.values(key[0]))
+
+        if numpy:
+            import numpy as np
+            return np.frombuffer(self._arrays[key], dtype=np.float64 if typecode == "d" else np.int64)
+
+        return self._arrays[key]
+
+    def _column_index(self, column: str | int) -> int:
+        if isinstance(column, int):
+            return column
+        try:
+            return self.columns.index(column)
+        except ValueError:
+            raise KeyError(f"Column '{column}' not found in '{self.name}' module.") from None
+
+
+def _to_int(value: str) -> int:
+    # handle conversion of values with trailing ".0" or scientific notation to integer
+    from decimal import Decimal
+
+    return int(Decimal(value))
+
+
+def _int_array(values: Sequence[str]) -> array:
+    """Convert values to an array of integers in bulk.
+
+    Plain integers are converted directly.
+    Values with a trailing ".0" or in scientific notation, e.g. '1.8361776E7', are parsed as floats
+    when every value is short enough to be represented exactly and is a whole number.
+    Only columns failing those checks fall back to slow, exact conversion through Decimal.
+    """
+    try:
+        return array("q", map(int, values))
+    except ValueError:
+        pass
+
+    # any decimal with at most 15 significant digits round trips through a float exactly
+    if all(len(value) <= _FLOAT_EXACT_DIGITS for value in values):
+        try:
+            floats = array("d", map(float, values))
+        except ValueError:
+            floats = None
+        if floats is not None and all(map(float.is_integer, floats)):
+            return array("q", map(int, floats))
+
+    return array("q", map(_to_int, values))
+
+
+def _float_array(values: Sequence[str]) -> array:
+    return array("d", map(float, values))
+
+
+_FLOAT_EXACT_DIGITS = 15
+
+_CONVERTERS = {"d": _float_array, "q": _int_array}
+
+
+class LazyRows(Sequence[str]):
+    """Rows of data of a module, kept as the raw bytes of the module until they are accessed.
+
+    Rows are decoded on demand, so that the rows of modules which are parsed but never read,
+    e.g. large Overrepresented sequences or Kmer Content modules, are never decoded.
+    Iterating over the rows streams them one at a time without keeping them, so that summaries can consume
+    large modules row by row. Indexing decodes every row once and keeps them. Counting rows does not decode them.
+
+    The raw bytes are held in memory, or in a temporary file for modules spilled to disk by `parse_modules()`.
+    """
+
+    __slots__ = ("_buffer", "_start", "_rows", "_count")
+
+    def __init__(self, buffer: bytes | bytearray | BinaryIO = b"", start: int = 0) -> None:
+        self._buffer = buffer
+        self._start = start
+        self._rows = None
+        self._count = None
+
+    def _stream(self) -> Iterator[str]:
+        # trailing whitespace, including carriage returns, is not part of the data
+        buffer = self._buffer
+        if not isinstance(buffer, (bytes, bytearray)):
+            buffer.seek(self._start)
+            for line in buffer:
+                yield str(line, "utf-8").rstrip()
+            return
+
+        start = self._start
+        if start >= len(buffer):
+            return
+        while (end := buffer.find(b"\n", start)) != -1:
+            yield str(buffer[start:end], "utf-8").rstrip()
+            start = end + 1
+        yield str(buffer[start:], "utf-8").rstrip()
+
+    def _decoded(self) -> list[str]:
+        if self._rows is None:
+            self._rows = list(self._stream())
+            if not isinstance(self._buffer, (bytes, bytearray)):
+                self._buffer.close()
+            self._buffer = None
+        return self._rows
+
+    def __len__(self) -> int:
+        if self._rows is not None:
+            return len(self._rows)
+
+        if self._count is None:
+            buffer = self._buffer
+            if isinstance(buffer, (bytes, bytearray)):
+                self._count = buffer.count(b"\n", self._start) + 1 if len(buffer) > self._start else 0
+            else:
+                buffer.seek(self._start)
+                self._count = sum(1 for _ in buffer)
+        return self._count
+
+    def __getitem__(self, index):
+        return self._decoded()[index]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows) if self._rows is not None else self._stream()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (LazyRows, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"LazyRows({list(self)!r})"
+
+
+class ModuleSpan(NamedTuple):
+    """Location of a module in the decompressed fastqc_data.txt file.
+
+    The byte range covers the body of the module: its header lines and rows, without the module start and end lines.
     """
     name: str
     status: str
-    columns: list[str]
-    data: list[str]
+    start: int
+    end: int
+
+
+_END_MODULE = b"\n>>END_MODULE"
+
+_CHUNK_SIZE = 1 << 16
+
+
+def parse_modules(
+    source: FastqcSource,
+    wanted: Collection[str] | None = None,
+    profiler: "ArchiveProfiler | None" = None,
+    max_rows: int | None = None,
+) -> Iterator[Module]:
+    """Read and parse modules from fastqc_data.txt file.
+
+    The fastqc_data.txt file is read from a FastQC ZIP archive, an extracted FastQC output directory,
+    a bare fastqc_data.txt file, or a gzip-compressed fastqc_data.txt.gz file.
+    An already open ZIP archive or binary file object may be supplied instead of a path so that callers can reuse handles;
+    it is left open.
 
+    The FastQC data is scanned as bytes: module boundaries are located with `find()` and never split into lines.
+    Only the header lines of wanted modules are decoded while parsing; their rows are copied out as one slice
+    and decoded when they are first accessed, see `LazyRows`.
 
-def parse_modules(zip_path: str) -> Iterator[Module]:
-    """Read and parse modules from fastqc_data.txt file in a ZIP archive.
+    When `wanted` is supplied, only the named modules are built and yielded.
+    The rows of all other modules are skipped, and reading stops as soon as every wanted module has been yielded.
+
+    When `max_rows` is supplied, the rows of modules still being read once more than that many lines of them were read
+    are spilled to a temporary file, and streamed back from it when they are iterated over.
+    Memory then stays bounded by the cap and the chunk size even for huge modules,
+    e.g. the Overrepresented sequences of a contaminated library.
+    Memory mapped inputs are already paged in by the operating system, so their modules are never spilled.
 
     Args:
-        zip_path: Path to a ZIP archive file.
+        source: A FastQC input, see `read_buffer()`.
+        wanted: Names of modules to parse. Leave as None to parse every module.
+        profiler: A profiler to time reading with and to count lines and bytes read. Leave as None to not profile.
+        max_rows: Number of rows of a module above which its rows are spilled to disk. Leave as None to keep every row in memory.
 
     Yields:
         A representation of a module from fastqc_data.txt.
+
+    Raises:
+        ValueError: The maximum number of rows is invalid.
+    """
+    if max_rows is not None and max_rows < 0:
+        raise ValueError(f"Maximum number of rows must be at least 0, got {max_rows}.")
+
+    remaining = None if wanted is None else set(wanted)
+
+    # nothing to read if no modules are wanted
+    if remaining is not None and not remaining:
+        return
+
+    with read_buffer(source) as (buffer, chunks):
+        if profiler is not None:
+            buffer, chunks = profiler.buffer(buffer, chunks)
+
+        scanner = _ModuleScanner(buffer, chunks, max_rows)
+        for span, body in scanner.modules(lambda name: remaining is None or name in remaining):
+            if body is None:
+                continue
+            yield _build_module(span.name, span.status, body)
+
+            # stop reading once all wanted modules have been yielded
+            if remaining is not None:
+                remaining.discard(span.name)
+                if not remaining:
+                    return
+
+
+def index_modules(source: FastqcSource) -> dict[str, ModuleSpan]:
+    """Index the modules of a fastqc_data.txt file by name.
+
+    The whole file is scanned once for module boundaries, without copying or decoding the rows of any module.
+    The index is small and JSON serializable, so it can be stored and reused to read single modules with `read_module()`.
+
+    Args:
+        source: A FastQC input, see `read_buffer()`.
+
+    Returns:
+        The span of each module by module name.
+    """
+    with read_buffer(source) as (buffer, chunks):
+        return {span.name: span for span, _ in _ModuleScanner(buffer, chunks).modules(lambda name: False)}
+
+
+def read_statuses(source: FastqcSource) -> dict[str, str]:
+    """Read the status of every module of a FastQC input without parsing any module data.
+
+    FastQC writes the status of every module to a small summary.txt file next to fastqc_data.txt,
+    so the statuses of FastQC ZIP archives and output directories are read from it without touching fastqc_data.txt.
+    Otherwise, e.g. for bare fastqc_data.txt files or a missing or malformed summary.txt file,
+    they are taken from the module header lines of fastqc_data.txt, scanned as by `index_modules()`.
+
+    Args:
+        source: A FastQC input, see `read_buffer()`.
+
+    Returns:
+        The status of each module by module name, one of [pass, warn, fail].
+
+    Raises:
+        BadZipFile: The input is not a FastQC ZIP archive file, FastQC output directory, or FastQC data file.
+    """
+    if isinstance(source, zipfile.ZipFile):
+        return _read_zip_statuses(source)
+
+    if not isinstance(source, (str, os.PathLike)):
+        return _read_file_statuses(source)
+
+    path = Path(source)
+    if path.is_dir():
+        summary_path = find_fastqc_data_path(path).with_name(SUMMARY_FILE_NAME)
+        statuses = _parse_summary(summary_path.read_bytes()) if summary_path.is_file() else None
+        return statuses if statuses is not None else _index_statuses(path)
+
+    with open(path, "rb") as fastqc_file:
+        return _read_file_statuses(fastqc_file)
+
+
+def _read_file_statuses(fastqc_file: BinaryIO) -> dict[str, str]:
+    # only ZIP archives hold a summary.txt file, and reading them needs to seek
+    if fastqc_file.seekable():
+        position = fastqc_file.tell()
+        magic = fastqc_file.read(len(FASTQC_DATA_MAGIC))
+        fastqc_file.seek(position)
+        if magic.startswith(ZIP_MAGICS):
+            # closing the archive leaves the file open
+            with zipfile.ZipFile(fastqc_file, "r") as archive:
+                return _read_zip_statuses(archive)
+
+    return _index_statuses(fastqc_file)
+
+
+def _read_zip_statuses(archive: zipfile.ZipFile) -> dict[str, str]:
+    summary_file = find_fastqc_data_file(archive).removesuffix("fastqc_data.txt") + SUMMARY_FILE_NAME
+    try:
+        statuses = _parse_summary(archive.read(summary_file))
+    except KeyError:
+        statuses = None
+
+    return statuses if statuses is not None else _index_statuses(archive)
+
+
+def _parse_summary(summary: bytes) -> dict[str, str] | None:
+    # lines are '<STATUS>\t<module name>\t<file name>'; anything else falls back to scanning fastqc_data.txt
+    statuses = {}
+    for line in str(summary, "utf-8").splitlines():
+        if not line.strip():
+            continue
+        fields = line.rstrip().split("\t")
+        if len(fields) < 2 or fields[0].lower() not in ("pass", "warn", "fail"):
+            return None
+        statuses[fields[1]] = fields[0].lower()
+
+    return statuses or None
+
+
+def _index_statuses(source: FastqcSource) -> dict[str, str]:
+    return {name: span.status for name, span in index_modules(source).items()}
+
+
+def read_module(source: FastqcSource, span: ModuleSpan) -> Module:
+    """Read a single module of a fastqc_data.txt file straight from its span in an index.
+
+    Memory mapped files are sliced directly.
+    Compressed inputs are decompressed up to the end of the module, but data before it is neither scanned nor kept.
+
+    Args:
+        source: A FastQC input, see `read_buffer()`. It must be unchanged since it was indexed.
+        span: Span of the module, from `index_modules()`.
+
+    Returns:
+        A representation of the module.
     """
-    with (
-        zipfile.ZipFile(zip_path, "r") as archive,
-        archive.open(find_fastqc_data_file(archive), "r") as fastqc_data_bytes,
-        io.TextIOWrapper(fastqc_data_bytes, encoding="utf-8") as fastqc_data_text,
-    ):
-        # initialize with an empty Module
-        module = Module(name="", status="", columns=[], data = [])
+    with read_buffer(source) as (buffer, chunks):
+        body = _read_range(buffer, chunks, span.start, span.end)
+
+    return _build_module(span.name, span.status, body)
+
+
+def _read_range(buffer: bytes | mmap.mmap, chunks: Iterator[bytes], start: int, end: int) -> bytes:
+    if end <= len(buffer):
+        return buffer[start:end]
+
+    pieces = [buffer[start:]] if start < len(buffer) else []
+    position = len(buffer)
+    for chunk in chunks:
+        chunk_start, position = position, position + len(chunk)
+        if position <= start:
+            continue
+        pieces.append(chunk[max(start - chunk_start, 0):end - chunk_start])
+        if position >= end:
+            break
 
-        for line in fastqc_data_text:
-            line = line.rstrip()
+    return b"".join(pieces)
 
-            # yield current module if end of module reached and module isn't empty
-            if line.startswith(">>END_MODULE") and module.name:
-                yield module
 
-            # start new module
-            elif line.startswith(">>") and not line.endswith("END_MODULE"):
-                module = Module(name=line.split("\t")[0][2:], status=line.split("\t")[1], columns=[], data = [])
+def _build_module(name: str, status: str, body: bytes | bytearray | BinaryIO) -> Module:
+    columns = []
+    properties = {}
 
-            # add module column names
-            elif line.startswith("#") and module.name:
-                module.columns = line[1:].split("\t")
+    # a header line followed by another header line holds a property of the module rather than its column names
+    if isinstance(body, (bytes, bytearray)):
+        offset = 0
+        while body.startswith(b"#", offset):
+            line_end = body.find(b"\n", offset)
+            line_end = len(body) if line_end == -1 else line_end
+            if columns:
+                key, *value = columns
+                properties[key] = "\t".join(value)
+            columns = str(body[offset + 1:line_end], "utf-8").rstrip().split("\t")
+            offset = line_end + 1
+    else:
+        offset = body.tell()
+        while (line := body.readline()).startswith(b"#"):
+            if columns:
+                key, *value = columns
+                properties[key] = "\t".join(value)
+            columns = str(line[1:], "utf-8").rstrip().split("\t")
+            offset = body.tell()
 
-            # add data rows to module
-            elif module.name:
-                module.data.append(line)
+    return Module(name=name, status=status, columns=columns, data=LazyRows(body, offset), properties=properties)
+
+
+class _ModuleScanner:
+    """Locate modules in FastQC data held in a buffer that grows by chunks as more data is needed.
+
+    Bytes before the current module are dropped whenever another chunk is read, and so are the rows of unwanted modules
+    as they are scanned, so at most one wanted module and one chunk are held at a time.
+    Wanted modules with more than `max_rows` rows are spilled to a temporary file as they are scanned instead,
+    so that memory stays bounded whatever the size of the modules.
+    """
+
+    def __init__(
+        self,
+        buffer: bytes | bytearray | mmap.mmap,
+        chunks: Iterator[bytes],
+        max_rows: int | None = None,
+    ) -> None:
+        self.buffer = buffer
+        self.chunks = chunks
+        self.max_rows = max_rows
+        self.eof = False
+        # number of bytes dropped from the front of the buffer, i.e. the offset of the buffer in the FastQC data
+        self.offset = 0
+
+    def _fill(self, keep: int) -> int:
+        # read another chunk, dropping the bytes before `keep` and returning how many were dropped
+        chunk = next(self.chunks, b"")
+        if not chunk:
+            self.eof = True
+            return 0
+
+        if isinstance(self.buffer, bytearray):
+            del self.buffer[:keep]
+        else:
+            self.buffer = bytearray(self.buffer[keep:])
+        self.buffer += chunk
+        self.offset += keep
+        return keep
+
+    def modules(self, want: Callable[[str], bool]) -> Iterator[tuple["ModuleSpan", bytes | bytearray | BinaryIO | None]]:
+        """Yield the span and body of each complete module, with bodies only for wanted modules.
+
+        Bodies are bytes, or temporary files positioned at their start for modules spilled to disk.
+        """
+        position = 0
+        while True:
+            buffer = self.buffer
+            start = buffer.find(b">>", position)
+
+            # '>>' only starts a module where it starts a line
+            if start > 0 and buffer[start - 1] != 0x0A:
+                position = start + 2
+                continue
+
+            header_end = buffer.find(b"\n", start) if start != -1 else -1
+            if header_end == -1:
+                if self.eof:
+                    return
+                position -= self._fill(position)
+                continue
+
+            header = str(buffer[start + 2:header_end], "utf-8").rstrip()
+            if header.startswith("END_MODULE"):
+                position = header_end + 1
+                continue
+            name, status = header.split("\t", 2)[:2]
+            wanted = want(name)
+
+            # look for the end of the module, resuming where the last search left off when reading more
+            body_start = header_end + 1
+            span_start = self.offset + body_start
+            search = header_end
+            counted = body_start
+            rows = 0
+            spill = None
+            while (end := self.buffer.find(_END_MODULE, search)) == -1:
+                if self.eof:
+                    if spill is not None:
+                        spill.close()
+                    return
+                search = max(header_end, len(self.buffer) - len(_END_MODULE) + 1)
+
+                keep = start
+                if not wanted:
+                    # rows of unwanted modules are dropped as soon as they are scanned
+                    keep = search
+                elif self.max_rows is not None:
+                    rows += self.buffer.count(b"\n", counted, search)
+                    counted = search
+                    if rows > self.max_rows:
+                        # temporary files are deleted as soon as they are closed or garbage collected
+                        if spill is None:
+                            import tempfile
+
+                            spill = tempfile.TemporaryFile()
+                        spill.write(self.buffer[body_start:search])
+                        body_start = keep = search
+
+                dropped = self._fill(keep)
+                start, header_end, search, body_start, counted = (
+                    start - dropped, header_end - dropped, search - dropped, body_start - dropped, counted - dropped
+                )
+
+            # the body of a module without rows is empty rather than ending before it starts
+            span = ModuleSpan(name, status, min(span_start, self.offset + end), self.offset + end)
+
+            if not wanted:
+                body = None
+            elif spill is not None:
+                spill.write(self.buffer[body_start:end])
+                spill.seek(0)
+                body = spill
+            else:
+                body = self.buffer[min(body_start, end):end]
+
+            yield span, body
+            position = end + len(_END_MODULE)
 
 
 def find_fastqc_data_file(archive: zipfile.ZipFile) -> str:
@@ -74,3 +637,177 @@ def find_fastqc_data_file(archive: zipfile.ZipFile) -> str:
         raise ValueError(f"Multiple fastqc_data.txt files found in archive: {candidates}")
 
     return candidates[0]
+
+
+def input_kind(fastqc_path: str | os.PathLike) -> str:
+    """Detect the kind of FastQC input at a path.
+
+    Files are identified by their first few bytes rather than by opening them as ZIP archives.
+
+    Args:
+        fastqc_path: Path to a FastQC ZIP archive file, FastQC output directory, or FastQC data file.
+
+    Returns:
+        The kind of input, one of [zip, directory, gzip, text].
+
+    Raises:
+        FileNotFoundError: A FastQC output directory does not contain a fastqc_data.txt file.
+        BadZipFile: The input is not a FastQC ZIP archive file, FastQC output directory, or FastQC data file.
+    """
+    path = Path(fastqc_path)
+    if path.is_dir():
+        find_fastqc_data_path(path)
+        return "directory"
+
+    with open(path, "rb") as fastqc_file:
+        return _sniff(fastqc_file.read(len(FASTQC_DATA_MAGIC)), fastqc_path)
+
+
+def _sniff(magic: bytes, fastqc_path: object) -> str:
+    if magic.startswith(ZIP_MAGICS):
+        return "zip"
+    if magic.startswith(GZIP_MAGIC):
+        return "gzip"
+    if magic.startswith(FASTQC_DATA_MAGIC):
+        return "text"
+
+    raise zipfile.BadZipFile(
+        f"FastQC archive file '{fastqc_path}' is not a valid ZIP file, FastQC output directory, or FastQC data file."
+    )
+
+
+@contextmanager
+def read_buffer(source: FastqcSource) -> Iterator[tuple[bytes | mmap.mmap, Iterator[bytes]]]:
+    """Open the fastqc_data.txt file of a FastQC input for reading as bytes.
+
+    Each input is opened once: the same file handle is used to identify the kind of input,
+    locate the fastqc_data.txt file, and read it.
+    ZIP archives and gzip-compressed files are decompressed in chunks so that reading can stop early.
+    Plain files, including the fastqc_data.txt file in an extracted FastQC output directory,
+    are memory mapped and handed out whole without copying them through a read buffer.
+
+    Open ZIP archives and file objects supplied by the caller are left open.
+
+    Args:
+        source: A FastQC input. Paths may point to a FastQC ZIP archive file, FastQC output directory, or FastQC data file.
+
+    Yields:
+        A tuple of the FastQC data available up front and an iterator over chunks of the rest of it.
+        Memory mapped files are available up front in full; streams are read entirely in chunks.
+
+    Raises:
+        BadZipFile: The input is not a FastQC ZIP archive file, FastQC output directory, or FastQC data file.
+    """
+    if isinstance(source, zipfile.ZipFile):
+        with _read_zip_chunks(source) as chunks:
+            yield b"", chunks
+        return
+
+    if not isinstance(source, (str, os.PathLike)):
+        with _read_stream_chunks(source) as chunks:
+            yield b"", chunks
+        return
+
+    path = Path(source)
+    if path.is_dir():
+        with _read_mapped(find_fastqc_data_path(path)) as fastqc_data:
+            yield fastqc_data, iter(())
+        return
+
+    with open(path, "rb") as fastqc_file:
+        kind = _sniff(fastqc_file.read(len(FASTQC_DATA_MAGIC)), source)
+        fastqc_file.seek(0)
+
+        if kind == "zip":
+            with zipfile.ZipFile(fastqc_file, "r") as archive, _read_zip_chunks(archive) as chunks:
+                yield b"", chunks
+        elif kind == "gzip":
+            with _read_stream_chunks(fastqc_file) as chunks:
+                yield b"", chunks
+        else:
+            with _read_mapped(fastqc_file) as fastqc_data:
+                yield fastqc_data, iter(())
+
+
+def _chunks(stream: BinaryIO) -> Iterator[bytes]:
+    return iter(partial(stream.read, _CHUNK_SIZE), b"")
+
+
+@contextmanager
+def _read_zip_chunks(archive: zipfile.ZipFile) -> Iterator[Iterator[bytes]]:
+    with archive.open(find_fastqc_data_file(archive), "r") as fastqc_data_bytes:
+        yield _chunks(fastqc_data_bytes)
+
+
+@contextmanager
+def _read_stream_chunks(stream: BinaryIO) -> Iterator[Iterator[bytes]]:
+    # buffer streams that cannot seek so that their first bytes can be peeked at
+    buffered = None if stream.seekable() else io.BufferedReader(stream)
+    try:
+        with _read_sniffed_stream_chunks(buffered or stream) as chunks:
+            yield chunks
+    finally:
+        # leave the caller's stream open
+        if buffered is not None:
+            buffered.detach()
+
+
+@contextmanager
+def _read_sniffed_stream_chunks(stream: BinaryIO) -> Iterator[Iterator[bytes]]:
+    # look at the first bytes of the stream without consuming them
+    if isinstance(stream, io.BufferedReader):
+        magic = stream.peek(len(FASTQC_DATA_MAGIC))[:len(FASTQC_DATA_MAGIC)]
+    else:
+        position = stream.tell()
+        magic = stream.read(len(FASTQC_DATA_MAGIC))
+        stream.seek(position)
+    kind = _sniff(magic, stream)
+
+    if kind == "zip":
+        with zipfile.ZipFile(stream, "r") as archive, _read_zip_chunks(archive) as chunks:
+            yield chunks
+    elif kind == "gzip":
+        # closing the gzip reader leaves the caller's stream open
+        with gzip.GzipFile(fileobj=stream, mode="rb") as fastqc_data_bytes:
+            yield _chunks(fastqc_data_bytes)
+    else:
+        yield _chunks(stream)
+
+
+@contextmanager
+def _read_mapped(fastqc_data: Path | BinaryIO) -> Iterator[bytes | mmap.mmap]:
+    with open(fastqc_data, "rb") if isinstance(fastqc_data, Path) else nullcontext(fastqc_data) as fastqc_data_bytes:
+        # empty files cannot be memory mapped
+        if os.fstat(fastqc_data_bytes.fileno()).st_size == 0:
+            yield b""
+            return
+
+        with mmap.mmap(fastqc_data_bytes.fileno(), 0, access=mmap.ACCESS_READ) as fastqc_data_map:
+            yield fastqc_data_map
+
+
+def find_fastqc_data_path(fastqc_dir: Path) -> Path:
+    """Find the fastqc_data.txt file in an extracted FastQC output directory.
+
+    The file is looked for directly in the directory and in its immediate subdirectories,
+    e.g. the '<sample>_fastqc' directory of an extracted FastQC ZIP archive.
+
+    Args:
+        fastqc_dir: Path to a FastQC output directory.
+
+    Returns:
+        Path to the fastqc_data.txt file.
+
+    Raises:
+        FileNotFoundError: The directory does not contain a fastqc_data.txt file.
+        ValueError: The directory contains multiple fastqc_data.txt files.
+    """
+    candidates = [fastqc_dir / "fastqc_data.txt"] if (fastqc_dir / "fastqc_data.txt").is_file() else []
+    candidates = candidates or sorted(fastqc_dir.glob("*/fastqc_data.txt"))
+
+    if not candidates:
+        raise FileNotFoundError(f"fastqc_data.txt not found in directory '{fastqc_dir}'")
+    if len(candidates) > 1:
+        raise ValueError(f"Multiple fastqc_data.txt files found in directory '{fastqc_dir}': {[str(c) for c in candidates]}")
+
+    return candidates[0]
@@ -0,0 +1,315 @@
+"""Serve summaries of FastQC archives over HTTP from a long-running process.
+
+The server keeps a pool of warm workers, so requests pay neither for starting an interpreter nor for importing the app.
+Concurrent requests for the same FastQC archive are coalesced into one computation,
+and recent summaries are kept in an in-memory least recently used cache keyed by the size and modification time
+of the FastQC archive, so that modified archives are always summarized again.
+
+Endpoints:
+
+| Endpoint | Response |
+| --- | --- |
+| `GET /summary?path=<path>` | Summaries of a FastQC archive, with optional `summaries` and `length_mode` parameters. |
+| `GET /metrics` | Request counts, cache hits, coalesced requests, queue depth, and latency quantiles. |
+| `GET /health` | Whether the server is up. |
+
+Typical usage examples:
+    >>> from fastqc_summary.serve import make_server, SummaryService
+    >>> with SummaryService(root="qc", workers=4) as service:
+    >>>     make_server(service, port=8000).serve_forever()
+"""
+
+from collections import deque, OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import multiprocessing
+import os
+from pathlib import Path
+import socketserver
+import threading
+import time
+from typing import Collection
+from urllib.parse import parse_qs, urlsplit
+import zipfile
+
+from fastqc_summary.aggregate import _quantile
+from fastqc_summary.batch import EXECUTORS, sample_name, summarize_archive, summary_options
+from fastqc_summary.summaries import DEFAULT_SUMMARIES, LENGTH_MODES, SUMMARIES
+
+LATENCY_WINDOW = 1024
+"""Number of most recent requests that latency quantiles are computed over."""
+
+LATENCY_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class SummaryService:
+    """Summarizer of FastQC archives for a long-running server.
+
+    Attributes:
+        root: Directory that requested paths are resolved against. Paths outside of it are refused.
+        workers: Number of warm workers to summarize FastQC archives with.
+        max_entries: Maximum number of summaries to keep in memory. The least recently used summaries are evicted first.
+    """
+
+    def __init__(
+        self,
+        root: str | Path = ".",
+        workers: int = 1,
+        executor: str = "process",
+        max_entries: int = 1024,
+    ) -> None:
+        if workers < 1:
+            raise ValueError(f"Number of workers must be at least 1, got {workers}.")
+        if executor not in EXECUTORS:
+            raise ValueError(f"Executor must be one of {list(EXECUTORS)}, got '{executor}'.")
+        if max_entries < 1:
+            raise ValueError(f"Cache size must be at least 1, got {max_entries}.")
+
+        self.root = Path(root).resolve()
+        self.workers = workers
+        self.max_entries = max_entries
+        self._pool = _make_warm_executor(executor, workers)
+        self._lock = threading.Lock()
+        self._summaries = OrderedDict()
+        self._in_flight: dict[tuple, Future] = {}
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._counts = dict.fromkeys(("requests", "hits", "misses", "coalesced", "errors"), 0)
+        self._active = 0
+        self._started = time.monotonic()
+
+    def __enter__(self) -> "SummaryService":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the workers."""
+        self._pool.shutdown(cancel_futures=True)
+
+    def resolve(self, path: str) -> Path:
+        """Resolve a requested path against the root directory.
+
+        Raises:
+            PermissionError: The path is outside of the root directory.
+            FileNotFoundError: The path does not exist.
+        """
+        resolved = (self.root / path).resolve()
+        if not resolved.is_relative_to(self.root):
+            raise PermissionError(f"Path '{path}' is outside of the served directory.")
+        if not resolved.exists():
+            raise FileNotFoundError(f"FastQC archive file '{path}' could not be found.")
+
+        return resolved
+
+    def summarize(
+        self,
+        path: str,
+        length_mode: str = "midpoint",
+        summary_names: Collection[str] = DEFAULT_SUMMARIES,
+    ) -> dict:
+        """Compute the summaries of a FastQC archive, reusing recent and in-flight computations.
+
+        Args:
+            path: Path to a FastQC input relative to the root directory.
+            length_mode: Length of reads in binned lengths, one of [lower, midpoint, upper].
+            summary_names: Names of registered summaries to compute.
+
+        Returns:
+            A dict mapping summary keys to summary values.
+        """
+        start = time.perf_counter()
+        with self._lock:
+            self._counts["requests"] += 1
+            self._active += 1
+        try:
+            return self._summarize(path, length_mode, tuple(summary_names))
+        except Exception:
+            with self._lock:
+                self._counts["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._latencies.append(time.perf_counter() - start)
+
+    def _summarize(self, path: str, length_mode: str, summary_names: tuple[str, ...]) -> dict:
+        resolved = self.resolve(path)
+        stat = resolved.stat()
+        key = (str(resolved), summary_options(length_mode, summary_names), stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            if key in self._summaries:
+                self._summaries.move_to_end(key)
+                self._counts["hits"] += 1
+                return self._summaries[key]
+
+            # join a computation of the same FastQC archive that is already under way
+            future = self._in_flight.get(key)
+            submitted = future is None
+            if submitted:
+                self._counts["misses"] += 1
+                future = self._pool.submit(summarize_archive, str(resolved), length_mode, summary_names)
+                self._in_flight[key] = future
+            else:
+                self._counts["coalesced"] += 1
+
+        # callbacks of finished futures run immediately, so the lock must be released before adding one
+        if submitted:
+            future.add_done_callback(lambda done: self._finish(key, done))
+
+        return future.result()
+
+    def _finish(self, key: tuple, future: Future) -> None:
+        with self._lock:
+            self._in_flight.pop(key, None)
+            if future.cancelled() or future.exception() is not None:
+                return
+            self._summaries[key] = future.result()
+            while len(self._summaries) > self.max_entries:
+                self._summaries.popitem(last=False)
+
+    def metrics(self) -> dict:
+        """Report the metrics of the service as a JSON serializable dict."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            return {
+                **self._counts,
+                "active_requests": self._active,
+                "queue_depth": len(self._in_flight),
+                "cached": len(self._summaries),
+                "workers": self.workers,
+                "uptime_seconds": time.monotonic() - self._started,
+                "latency_seconds": {
+                    "window": len(latencies),
+                    **{f"p{round(p * 100)}": _quantile(latencies, p) if latencies else None for p in LATENCY_QUANTILES},
+                    "max": latencies[-1] if latencies else None,
+                },
+            }
+
+
+def _warm() -> None:
+    # workers import the app when they first run a task, so run one up front
+    pass
+
+
+def _make_warm_executor(executor: str, workers: int) -> Executor:
+    if executor == "thread":
+        return ThreadPoolExecutor(max_workers=workers)
+
+    # the server is multi-threaded, and forking a multi-threaded process is unsafe, so spawn the workers
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    for future in [pool.submit(_warm) for _ in range(workers)]:
+        future.result()
+
+    return pool
+
+
+class SummaryRequestHandler(BaseHTTPRequestHandler):
+    """Handler of requests to a summary server, answering in JSON."""
+
+    server: "ThreadingHTTPServer"
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        service: SummaryService = self.server.service
+
+        if url.path == "/health":
+            self._respond(HTTPStatus.OK, {"status": "ok"})
+        elif url.path == "/metrics":
+            self._respond(HTTPStatus.OK, service.metrics())
+        elif url.path == "/summary":
+            self._summary(service, params)
+        else:
+            self._respond(HTTPStatus.NOT_FOUND, {"error": f"Unknown endpoint '{url.path}'."})
+
+    def _summary(self, service: SummaryService, params: dict[str, str]) -> None:
+        if "path" not in params:
+            self._respond(HTTPStatus.BAD_REQUEST, {"error": "Missing 'path' parameter."})
+            return
+
+        length_mode = params.get("length_mode", "midpoint")
+        summary_names = (
+            list(SUMMARIES) if params.get("summaries") == "all"
+            else [name.strip() for name in params.get("summaries", ",".join(DEFAULT_SUMMARIES)).split(",")]
+        )
+        unknown = [name for name in summary_names if name not in SUMMARIES]
+        if unknown:
+            self._respond(HTTPStatus.BAD_REQUEST, {"error": f"Unknown summaries {unknown}, choose from {list(SUMMARIES)} or 'all'."})
+            return
+        if length_mode not in LENGTH_MODES:
+            self._respond(HTTPStatus.BAD_REQUEST, {"error": f"Length mode must be one of {list(LENGTH_MODES)}, got '{length_mode}'."})
+            return
+
+        try:
+            summaries = service.summarize(params["path"], length_mode, summary_names)
+        except PermissionError as e:
+            self._respond(HTTPStatus.FORBIDDEN, {"error": str(e)})
+        except FileNotFoundError as e:
+            self._respond(HTTPStatus.NOT_FOUND, {"error": str(e)})
+        except (zipfile.BadZipFile, ValueError, KeyError) as e:
+            self._respond(HTTPStatus.UNPROCESSABLE_ENTITY, {"error": str(e)})
+        except Exception as e:
+            # any other failure, e.g. a truncated gzip file or a broken worker pool, still gets a response
+            self.log_error("Could not summarize '%s': %r", params["path"], e)
+            self._respond(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"})
+        else:
+            self._respond(HTTPStatus.OK, {"sample": sample_name(params["path"]), **summaries})
+
+    def _respond(self, status: HTTPStatus, body: dict) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def address_string(self) -> str:
+        # clients of Unix sockets have no address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    """HTTP server listening on a Unix socket."""
+
+    daemon_threads = True
+
+    def server_close(self) -> None:
+        super().server_close()
+        os.unlink(self.server_address)
+
+
+def make_server(
+    service: SummaryService,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    socket_path: str | None = None,
+    verbose: bool = False,
+) -> ThreadingHTTPServer | UnixHTTPServer:
+    """Make an HTTP server answering requests with a summary service.
+
+    Args:
+        service: The summary service to answer requests with.
+        host: Host to listen on.
+        port: Port to listen on. Use 0 to pick a free port.
+        socket_path: Path to a Unix socket to listen on instead of a host and port.
+        verbose: Log every request to stderr.
+
+    Returns:
+        The server, ready to `serve_forever()`.
+    """
+    if socket_path is not None:
+        server = UnixHTTPServer(socket_path, SummaryRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), SummaryRequestHandler)
+    server.service = service
+    server.verbose = verbose
+
+    return server
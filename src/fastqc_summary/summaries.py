@@ -3,22 +3,178 @@
 The summary functions take a representation of the apropriate FastQC module data
 and return a useful summary of that data.
 
+Summary functions are registered in a registry along with the modules and columns they need.
+The registry is used to work out the minimal set of modules to parse for a selection of summaries
+and to compute every selected summary from a single parse of the FastQC data.
+
 Typical usage example:
+    >>> from fastqc_summary.parser import parse_modules
+    >>> from fastqc_summary.summaries import compute_summaries, required_modules
+    >>> names = ["read_count", "base_count"]
+    >>> modules = parse_modules("SRR1067505_1_fastqc.zip", wanted=required_modules(names))
+    >>> summaries = compute_summaries(modules, names)
 """
 
-from decimal import Decimal
+from array import array
+import operator
+from typing import Callable, Collection, Iterable, NamedTuple, Sequence
 
+from fastqc_summary.constants import DEFAULT_SUMMARIES
 from fastqc_summary.parser import Module
 
 
+class Summary(NamedTuple):
+    """A registered summary.
+
+    Attributes:
+        name: A name for the summary.
+        modules: Names of the modules the summary function takes, in the order it takes them.
+        columns: Names of the columns of the modules the summary function reads.
+        function: The summary function.
+        options: Names of keyword options the summary function accepts.
+        optional: Whether the summary is None rather than an error when a module is missing.
+        merge: How the summary of a sample is merged from the summaries of its FastQC archives, one of [sum, mean, median, max].
+    """
+    name: str
+    modules: tuple[str, ...]
+    columns: tuple[str, ...]
+    function: Callable[..., dict]
+    options: tuple[str, ...]
+    optional: bool = False
+    merge: str = "mean"
+
+
+SUMMARIES: dict[str, Summary] = {}
+"""Registry of summaries by name."""
+
+MERGE_RULES = ("sum", "mean", "median", "max")
+"""Ways of merging the summaries of the FastQC archives of a sample, e.g. lanes and mates, see `fastqc_summary.merge`."""
+
+
+def register_summary(
+    name: str,
+    modules: Collection[str],
+    columns: Collection[str] = (),
+    optional: bool = False,
+    merge: str = "mean",
+) -> Callable:
+    """Register a summary function.
+
+    The summary function takes the modules it needs positionally, in the order they are listed in `modules`.
+    Keyword-only arguments of the summary function are options that can be supplied when computing summaries.
+
+    Args:
+        name: A name for the summary.
+        modules: Names of the modules the summary function takes.
+        columns: Names of the columns of the modules the summary function reads.
+            Modules with a header must have all of them, or computing the summary fails before the summary function is called.
+        optional: Report the summary as None rather than failing when a module is missing,
+            e.g. FastQC leaves out the quality modules for empty FASTQ files.
+        merge: How to merge the summaries of the FastQC archives of a sample, one of [sum, mean, median, max].
+            Counts are summed, and means and medians are weighted by the read count of each FastQC archive.
+
+    Returns:
+        A decorator that registers the summary function and returns it unchanged.
+
+    Raises:
+        ValueError: A summary with the same name is already registered, or the merge rule is invalid.
+    """
+    if merge not in MERGE_RULES:
+        raise ValueError(f"Merge rule must be one of {list(MERGE_RULES)}, got '{merge}'.")
+
+    def decorator(function: Callable[..., dict]) -> Callable[..., dict]:
+        if name in SUMMARIES:
+            raise ValueError(f"Summary '{name}' is already registered.")
+
+        # keyword-only arguments follow the positional arguments in the variable names of the code object
+        code = function.__code__
+        options = code.co_varnames[code.co_argcount:code.co_argcount + code.co_kwonlyargcount]
+        SUMMARIES[name] = Summary(name, tuple(modules), tuple(columns), function, options, optional, merge)
+
+        return function
+
+    return decorator
+
+
+def required_modules(names: Iterable[str] = DEFAULT_SUMMARIES) -> set[str]:
+    """Find the minimal set of modules needed to compute a selection of summaries.
+
+    Args:
+        names: Names of summaries.
+
+    Returns:
+        Names of the modules needed to compute the summaries.
+
+    Raises:
+        KeyError: A summary is not registered.
+    """
+    return {module for name in names for module in _get_summary(name).modules}
+
+
+def compute_summaries(modules: Iterable[Module], names: Iterable[str] = DEFAULT_SUMMARIES, **options) -> dict:
+    """Compute a selection of summaries in a single pass over parsed modules.
+
+    Modules not needed by any of the summaries are ignored.
+
+    Args:
+        modules: Parsed modules, e.g. from `parse_modules()`.
+        names: Names of summaries to compute.
+        **options: Options passed on to the summary functions that accept them, e.g. `length_mode`.
+
+    Returns:
+        A dict mapping summary keys to summary values.
+
+    Raises:
+        KeyError: A summary is not registered.
+        ValueError: A module needed by a summary that is not optional was not found,
+            or a module lacks a column needed by a summary.
+    """
+    selected = [_get_summary(name) for name in names]
+    needed = {module for summary in selected for module in summary.modules}
+
+    # collect the needed modules from a single pass over the modules
+    found = {}
+    for module in modules:
+        if module.name in needed:
+            found[module.name] = module
+
+    summaries = {}
+    for summary in selected:
+        missing = [module for module in summary.modules if module not in found]
+        if missing and summary.optional:
+            summaries[summary.name] = None
+            continue
+        if missing:
+            raise ValueError(f"Module '{missing[0]}' needed by summary '{summary.name}' not found.")
+
+        # modules without data, e.g. no overrepresented sequences, have no header to check
+        available = {column for module in summary.modules for column in found[module].columns}
+        missing = [column for column in summary.columns if column not in available]
+        if available and missing:
+            raise ValueError(f"Column '{missing[0]}' needed by summary '{summary.name}' not found in {list(summary.modules)}.")
+
+        summary_options = {option: options[option] for option in summary.options if option in options}
+        summaries.update(summary.function(*(found[module] for module in summary.modules), **summary_options))
+
+    return summaries
+
+
+def _get_summary(name: str) -> Summary:
+    try:
+        return SUMMARIES[name]
+    except KeyError:
+        raise KeyError(f"Summary '{name}' is not registered. Available summaries: {list(SUMMARIES)}") from None
+
+
+@register_summary("read_count", modules=["Basic Statistics"], columns=["Measure", "Value"], merge="sum")
 def summarize_read_count(basic_stats: Module) -> dict[str, int]:
     """Extract the total count of reads from basic statistics module."""
 
     read_count = None
-    # extract read count from total sequences line
-    for line in basic_stats.data:
-        if line.startswith("Total Sequences"):
-            read_count = line.split("\t")[1]
+    # extract read count from total sequences measure
+    for measure, value in zip(basic_stats.values("Measure"), basic_stats.values("Value")):
+        if measure == "Total Sequences":
+            read_count = value
             break
 
     # basic stats module must contain read counts
@@ -28,20 +184,200 @@ def summarize_read_count(basic_stats: Module) -> dict[str, int]:
     return {"read_count": int(read_count)}
 
 
-def summarize_base_count(seq_len_dist: Module) -> dict[str, int]:
-    """Compute the total count of bases from sequence length distribution module."""
+@register_summary("base_count", modules=["Sequence Length Distribution"], columns=["Length", "Count"], merge="sum")
+def summarize_base_count(seq_len_dist: Module, *, length_mode: str = "midpoint") -> dict[str, int]:
+    """Compute the total count of bases from sequence length distribution module.
 
-    base_count = 0
+    FastQC groups long or variable read lengths into bins, e.g. '35-39'.
+    The length of reads in a bin is taken to be the lower bound, midpoint, or upper bound of the bin.
+
+    Args:
+        seq_len_dist: Sequence Length Distribution module.
+        length_mode: Length of reads in binned lengths, one of [lower, midpoint, upper].
+
+    Returns:
+        A dict with the total count of bases, rounded to the nearest base.
+
+    Raises:
+        ValueError: The length mode is invalid or a length could not be parsed.
+    """
+    if length_mode not in LENGTH_MODES:
+        raise ValueError(f"Length mode must be one of {list(LENGTH_MODES)}, got '{length_mode}'.")
 
     # compute total count of bases
     # the total count of bases in a file of sequence reads can be computed from a frequency table of sequence lengths
     # that is, base_count = <length, count>, where <length, count> is the dot product of the two n-vectors length and count,
     # length_i is the number of bases in the ith element, and
     # count_i is the count of reads with the corresponding length
-    for line in seq_len_dist.data:
-        length_i, count_i = line.split("\t")
-        # handle conversion of counts with trailing ".0" or scientific notation to integer
-        count_i = int(Decimal(count_i))
-        base_count += int(length_i) * count_i
+    counts = seq_len_dist.column("Count", "q")
+
+    # fast path for unbinned lengths
+    if not any("-" in length_i for length_i in seq_len_dist.values("Length")):
+        lengths = seq_len_dist.column("Length", "q")
+        return {"base_count": sum(map(operator.mul, lengths, counts))}
+
+    lower, upper = _length_bounds(seq_len_dist.values("Length"))
+    if length_mode == "lower":
+        base_count = sum(map(operator.mul, lower, counts))
+    elif length_mode == "upper":
+        base_count = sum(map(operator.mul, upper, counts))
+    else:
+        # sum bounds rather than averaging them so that the dot product stays in exact integer arithmetic
+        double_base_count = sum(map(operator.mul, lower, counts)) + sum(map(operator.mul, upper, counts))
+        base_count = (double_base_count + 1) // 2
 
     return {"base_count": base_count}
+
+
+LENGTH_MODES = ("lower", "midpoint", "upper")
+
+
+def _length_bounds(lengths: Sequence[str]) -> tuple[array, array]:
+    lower, upper = array("q"), array("q")
+    for length_i in lengths:
+        lower_i, _, upper_i = length_i.partition("-")
+        lower.append(int(lower_i))
+        upper.append(int(upper_i or lower_i))
+
+    return lower, upper
+
+
+@register_summary(
+    "mean_quality",
+    modules=["Per base sequence quality"],
+    columns=["Base", "Mean"],
+    optional=True,
+)
+def summarize_mean_quality(per_base_quality: Module) -> dict[str, float | None]:
+    """Compute the mean quality over all base positions from per base sequence quality module.
+
+    FastQC groups positions of long reads into bins, e.g. '10-14', so each bin is weighted by the number of positions it spans.
+    """
+    widths = _bin_widths(per_base_quality.values("Base"))
+    positions = sum(widths)
+    if not positions:
+        return {"mean_quality": None}
+
+    means = per_base_quality.column("Mean")
+    return {"mean_quality": sum(map(operator.mul, means, widths)) / positions}
+
+
+@register_summary(
+    "median_quality",
+    modules=["Per base sequence quality"],
+    columns=["Base", "Median"],
+    optional=True,
+    merge="median",
+)
+def summarize_median_quality(per_base_quality: Module) -> dict[str, float | None]:
+    """Compute the median of the median qualities of all base positions from per base sequence quality module.
+
+    Binned positions, e.g. '10-14', are weighted by the number of positions they span.
+    Merged samples get the median of these medians weighted by read count, an approximation,
+    since FastQC reports do not hold the qualities of each read to take the exact median from.
+    """
+    widths = _bin_widths(per_base_quality.values("Base"))
+    medians = per_base_quality.column("Median")
+
+    return {"median_quality": weighted_median(medians, widths)}
+
+
+@register_summary(
+    "q30_fraction",
+    modules=["Per sequence quality scores"],
+    columns=["Quality", "Count"],
+    optional=True,
+)
+def summarize_q30_fraction(per_seq_quality: Module) -> dict[str, float | None]:
+    """Compute the fraction of reads with a mean quality of at least 30 from per sequence quality scores module."""
+    qualities = per_seq_quality.column("Quality")
+    counts = per_seq_quality.column("Count")
+    total = sum(counts)
+    if not total:
+        return {"q30_fraction": None}
+
+    q30 = sum(count for quality, count in zip(qualities, counts) if quality >= 30)
+    return {"q30_fraction": q30 / total}
+
+
+@register_summary(
+    "mean_gc",
+    modules=["Per sequence GC content"],
+    columns=["GC Content", "Count"],
+    optional=True,
+)
+def summarize_mean_gc(per_seq_gc: Module) -> dict[str, float | None]:
+    """Compute the mean GC content of reads, in percent, from per sequence GC content module."""
+    counts = per_seq_gc.column("Count")
+    total = sum(counts)
+    if not total:
+        return {"mean_gc": None}
+
+    gc_contents = per_seq_gc.column("GC Content")
+    return {"mean_gc": sum(map(operator.mul, gc_contents, counts)) / total}
+
+
+@register_summary("deduplicated_percentage", modules=["Sequence Duplication Levels"], optional=True)
+def summarize_deduplicated_percentage(seq_dup_levels: Module) -> dict[str, float]:
+    """Extract the percentage of reads remaining after deduplication from sequence duplication levels module."""
+    deduplicated_percentage = seq_dup_levels.properties.get("Total Deduplicated Percentage")
+
+    # sequence duplication levels module must contain the total deduplicated percentage
+    if not deduplicated_percentage:
+        raise ValueError("Total deduplicated percentage not found in 'Sequence Duplication Levels' module.")
+
+    return {"deduplicated_percentage": float(deduplicated_percentage)}
+
+
+@register_summary("max_adapter_fraction", modules=["Adapter Content"], columns=["Position"], optional=True, merge="max")
+def summarize_max_adapter_fraction(adapter_content: Module) -> dict[str, float | None]:
+    """Find the highest fraction of reads containing any adapter at any position from adapter content module.
+
+    FastQC reports the cumulative percentage of reads with each adapter at each position,
+    so the maximum is the fraction of reads with the most common adapter by the end of the reads.
+    Merged samples get the highest fraction of their FastQC archives, so adapters in any lane are not averaged away.
+    """
+    if not adapter_content.data:
+        return {"max_adapter_fraction": None}
+
+    # every column after the position holds the percentages of one adapter
+    percentages = (max(adapter_content.column(index)) for index in range(1, len(adapter_content.columns)))
+    return {"max_adapter_fraction": max(percentages, default=0.0) / 100}
+
+
+@register_summary(
+    "overrepresented_fraction",
+    modules=["Overrepresented sequences"],
+    columns=["Percentage"],
+    optional=True,
+)
+def summarize_overrepresented_fraction(overrepresented: Module) -> dict[str, float]:
+    """Compute the fraction of reads that are one of the overrepresented sequences from overrepresented sequences module.
+
+    Overrepresented sequences modules can hold many thousands of rows, so the percentages are summed row by row.
+    """
+    if not overrepresented.data:
+        return {"overrepresented_fraction": 0.0}
+
+    return {"overrepresented_fraction": sum(map(float, overrepresented.iter_values("Percentage"))) / 100}
+
+
+def _bin_widths(bins: Sequence[str]) -> array:
+    lower, upper = _length_bounds(bins)
+    return array("q", (upper_i - lower_i + 1 for lower_i, upper_i in zip(lower, upper)))
+
+
+def weighted_median(values: Sequence[float], weights: Sequence[float]) -> float | None:
+    """Find the lowest value at which the cumulative weight reaches half of the total weight, or None without weight.
+
+    Used for both binned base positions and merging the medians of FastQC archives weighted by read count.
+    """
+    total = sum(weights)
+    if not total:
+        return None
+
+    cumulative = 0
+    for value, weight in sorted(zip(values, weights)):
+        cumulative += weight
+        if 2 * cumulative >= total:
+            return value
@@ -0,0 +1,196 @@
+"""Time the phases of summarizing FastQC archives.
+
+Each FastQC archive is timed per phase with wall clock and CPU time, along with counts of the work done:
+
+| Phase | Time spent |
+| --- | --- |
+| read | Reading and decompressing chunks of the FastQC data. |
+| parse | Opening the FastQC input, locating modules, and building them, excluding reading. |
+| summarize | Summary functions, including column conversion, excluding parsing. |
+| export | Tabulating modules to export. |
+| write | Writing the summaries of the archive to the output. |
+
+Timings are only recorded when asked for, so summarizing without them pays no overhead.
+Time is attributed to the innermost active phase, so phases never overlap and add up to the total.
+
+Typical usage examples:
+    >>> from fastqc_summary.batch import summarize_many
+    >>> from fastqc_summary.timings import TimingsRecorder
+    >>> recorder = TimingsRecorder()
+    >>> for sample, summaries in recorder.fold(summarize_many(["a_fastqc.zip"], on_timings=recorder.add)):
+    >>>     print(sample, summaries)
+    >>> report = recorder.report()
+"""
+
+from dataclasses import asdict, dataclass, field
+import mmap
+import time
+from typing import Iterable, Iterator, TypeVar
+
+PHASES = ("read", "parse", "summarize", "export", "write")
+
+COUNT_CHUNK_SIZE = 1 << 20
+"""Bytes of a memory mapped file copied at a time to count its lines."""
+
+T = TypeVar("T")
+
+
+@dataclass
+class ArchiveTimings:
+    """Timings of summarizing one FastQC archive.
+
+    Attributes:
+        sample: Sample name of the FastQC archive.
+        wall_seconds: Wall clock seconds spent in each phase.
+        cpu_seconds: CPU seconds of the summarizing thread spent in each phase.
+        lines: Number of lines of FastQC data read.
+        bytes: Number of bytes of FastQC data read after decompression.
+        modules: Number of modules built.
+    """
+    sample: str = ""
+    wall_seconds: dict[str, float] = field(default_factory=dict)
+    cpu_seconds: dict[str, float] = field(default_factory=dict)
+    lines: int = 0
+    bytes: int = 0
+    modules: int = 0
+
+
+class ArchiveProfiler:
+    """Recorder of the time spent in each phase of summarizing one FastQC archive.
+
+    Phases are entered with `push()` and left with `pop()`, and may nest.
+    Time is charged to the innermost active phase, and time outside of every phase is not charged.
+    """
+
+    def __init__(self) -> None:
+        self.timings = ArchiveTimings(
+            wall_seconds=dict.fromkeys(PHASES, 0.0),
+            cpu_seconds=dict.fromkeys(PHASES, 0.0),
+        )
+        self._stack = []
+        self._wall = 0.0
+        self._cpu = 0.0
+
+    def push(self, phase: str) -> None:
+        """Enter a phase."""
+        self._charge()
+        self._stack.append(phase)
+
+    def pop(self) -> None:
+        """Leave the innermost phase."""
+        self._charge()
+        self._stack.pop()
+
+    def _charge(self) -> None:
+        wall, cpu = time.perf_counter(), time.thread_time()
+        if self._stack:
+            phase = self._stack[-1]
+            self.timings.wall_seconds[phase] += wall - self._wall
+            self.timings.cpu_seconds[phase] += cpu - self._cpu
+        self._wall, self._cpu = wall, cpu
+
+    def timed(self, items: Iterable[T], phase: str) -> Iterator[T]:
+        """Charge the time spent producing each item of an iterable to a phase."""
+        iterator = iter(items)
+        while True:
+            self.push(phase)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.pop()
+            yield item
+
+    def buffer(self, buffer: bytes | mmap.mmap, chunks: Iterable[bytes]) -> tuple[bytes | mmap.mmap, Iterator[bytes]]:
+        """Time reading FastQC data and count the lines and bytes read.
+
+        Data available up front, e.g. a memory mapped file, is counted at once; its page faults are charged to parsing.
+        """
+        timings = self.timings
+        timings.bytes += len(buffer)
+        timings.lines += _count_lines(buffer)
+
+        def timed_chunks() -> Iterator[bytes]:
+            for chunk in self.timed(chunks, "read"):
+                timings.bytes += len(chunk)
+                timings.lines += chunk.count(b"\n")
+                yield chunk
+
+        return buffer, timed_chunks()
+
+    def modules(self, modules: Iterable[T]) -> Iterator[T]:
+        """Time building modules and count them."""
+        for module in self.timed(modules, "parse"):
+            self.timings.modules += 1
+            yield module
+
+
+def _count_lines(buffer: bytes | mmap.mmap) -> int:
+    if isinstance(buffer, bytes):
+        return buffer.count(b"\n")
+
+    # count a memory mapped file in chunks rather than copying all of it at once
+    with memoryview(buffer) as view:
+        return sum(
+            view[start:start + COUNT_CHUNK_SIZE].tobytes().count(b"\n")
+            for start in range(0, len(view), COUNT_CHUNK_SIZE)
+        )
+
+
+class TimingsRecorder:
+    """Collector of the timings of many FastQC archives.
+
+    Use `add()` as the `on_timings` hook of `summarize_many()`,
+    and `fold()` over its results to also time writing the summaries.
+    """
+
+    def __init__(self) -> None:
+        self.archives: list[ArchiveTimings] = []
+        self._unwritten = {}
+        self._unmatched_write = {"wall_seconds": 0.0, "cpu_seconds": 0.0}
+
+    def add(self, timings: ArchiveTimings) -> None:
+        """Add the timings of a FastQC archive."""
+        self.archives.append(timings)
+        self._unwritten[timings.sample] = timings
+
+    def fold(self, results: Iterable[tuple[str, dict]]) -> Iterator[tuple[str, dict]]:
+        """Time the consumer of the summaries, i.e. writing them, yielding the summaries unchanged."""
+        for sample, summaries in results:
+            # the timings of an archive are added before its summaries are yielded
+            timings = self._unwritten.pop(sample, None)
+
+            wall, cpu = time.perf_counter(), time.thread_time()
+            yield sample, summaries
+            wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+
+            if timings is not None:
+                timings.wall_seconds["write"] += wall
+                timings.cpu_seconds["write"] += cpu
+            else:
+                # cached summaries have no timings of their own
+                self._unmatched_write["wall_seconds"] += wall
+                self._unmatched_write["cpu_seconds"] += cpu
+
+    def report(self) -> dict:
+        """Report the timings of every archive and their totals as a JSON serializable dict."""
+        totals = {
+            "archives": len(self.archives),
+            "wall_seconds": dict.fromkeys(PHASES, 0.0),
+            "cpu_seconds": dict.fromkeys(PHASES, 0.0),
+            "lines": 0,
+            "bytes": 0,
+            "modules": 0,
+        }
+        for timings in self.archives:
+            for clock in ("wall_seconds", "cpu_seconds"):
+                for phase, seconds in getattr(timings, clock).items():
+                    totals[clock][phase] += seconds
+            totals["lines"] += timings.lines
+            totals["bytes"] += timings.bytes
+            totals["modules"] += timings.modules
+        for clock in ("wall_seconds", "cpu_seconds"):
+            totals[clock]["write"] += self._unmatched_write[clock]
+
+        return {"archives": [asdict(timings) for timings in self.archives], "totals": totals}
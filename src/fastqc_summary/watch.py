@@ -0,0 +1,255 @@
+"""Incrementally summarize FastQC archives as they are written to a directory.
+
+Watch mode keeps a state file recording the size, modification time, and summaries of every FastQC archive
+it has summarized. Each pass over the directory only summarizes new or modified '_fastqc.zip' files,
+so the cost of a refresh scales with the new data rather than with every FastQC archive in the directory.
+
+The state file is an append-only NDJSON log with one line per summarized archive.
+An archive is recorded only after its summaries have been handed to the caller, so an interrupted run
+re-summarizes at most the archive it was interrupted on.
+Archives that could not be summarized, e.g. corrupt ones, are recorded with their error,
+and are only tried again once they change.
+
+Typical usage examples:
+    >>> from fastqc_summary.watch import watch, WatchState
+    >>> with WatchState("run/.fastqc-summary-state.ndjson") as state:
+    >>>     for sample, summaries in watch("run", state, poll=60):
+    >>>         print(sample, summaries)
+"""
+
+import json
+import os
+from pathlib import Path
+import time
+from typing import Callable, Collection, Iterator, NamedTuple
+import zipfile
+
+from fastqc_summary.batch import summarize_many, summary_options
+from fastqc_summary.cache import SummaryCache
+from fastqc_summary.constants import STATE_FILE_NAME
+from fastqc_summary.export import ModuleExporter
+from fastqc_summary.gate import QCGate
+from fastqc_summary.summaries import DEFAULT_SUMMARIES
+from fastqc_summary.timings import ArchiveTimings
+
+WATCH_PATTERN = "**/*_fastqc.zip"
+
+
+class StateEntry(NamedTuple):
+    """A FastQC archive recorded in the watch state, with the error it could not be summarized with, if any."""
+    path: str
+    size: int
+    mtime_ns: int
+    options: str
+    summaries: dict
+    error: str | None = None
+
+
+class WatchState:
+    """Record of the FastQC archives already summarized in watch mode.
+
+    Attributes:
+        path: Path to the NDJSON state file.
+    """
+
+    def __init__(self, state_file: str | Path) -> None:
+        self.path = Path(state_file)
+        self._entries = {}
+
+        lines = 0
+        if self.path.exists():
+            with open(self.path, "r") as state_log:
+                for line in state_log:
+                    if not line.strip():
+                        continue
+                    entry = StateEntry(**json.loads(line))
+                    self._entries[entry.path] = entry
+                    lines += 1
+
+        # compact the log once archives have been recorded more than once
+        if lines > len(self._entries):
+            self._compact()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._log = open(self.path, "a")
+
+    def __enter__(self) -> "WatchState":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the state file."""
+        self._log.close()
+
+    def get(self, fastqc_archive: str | Path) -> StateEntry | None:
+        """Get the recorded state of a FastQC archive, or None if it has not been summarized."""
+        return self._entries.get(str(Path(fastqc_archive).resolve()))
+
+    def is_current(self, fastqc_archive: str | Path, stat: os.stat_result, options: str) -> bool:
+        """Check whether a FastQC archive was summarized with the same options and is unchanged since.
+
+        Args:
+            fastqc_archive: Path to a FastQC ZIP archive file.
+            stat: Current file metadata of the FastQC archive.
+            options: A serialization of the options the summaries are computed with.
+
+        Returns:
+            True if the recorded summaries, or error, of the FastQC archive are up to date.
+        """
+        entry = self.get(fastqc_archive)
+        return (
+            entry is not None
+            and entry.size == stat.st_size
+            and entry.mtime_ns == stat.st_mtime_ns
+            and entry.options == options
+        )
+
+    def record(
+        self,
+        fastqc_archive: str | Path,
+        stat: os.stat_result,
+        options: str,
+        summaries: dict,
+        error: str | None = None,
+    ) -> None:
+        """Record the summaries of a FastQC archive, or the error it could not be summarized with.
+
+        Args:
+            fastqc_archive: Path to a FastQC ZIP archive file.
+            stat: File metadata of the FastQC archive when it was summarized.
+            options: A serialization of the options the summaries were computed with.
+            summaries: Summaries of the FastQC archive.
+            error: The error the FastQC archive could not be summarized with.
+        """
+        entry = StateEntry(str(Path(fastqc_archive).resolve()), stat.st_size, stat.st_mtime_ns, options, summaries, error)
+        self._entries[entry.path] = entry
+        self._log.write(json.dumps(entry._asdict()))
+        self._log.write("\n")
+        self._log.flush()
+
+    def _compact(self) -> None:
+        # write to a temporary file and swap it in so that the state is never left half written
+        compacted = self.path.with_name(f"{self.path.name}.tmp")
+        with open(compacted, "w") as state_log:
+            for entry in self._entries.values():
+                state_log.write(json.dumps(entry._asdict()))
+                state_log.write("\n")
+        os.replace(compacted, self.path)
+
+
+def summarize_changed(
+    watch_dir: str | Path,
+    state: WatchState,
+    pattern: str = WATCH_PATTERN,
+    workers: int = 1,
+    executor: str = "process",
+    cache: SummaryCache | None = None,
+    refresh: bool = False,
+    length_mode: str = "midpoint",
+    exporter: ModuleExporter | None = None,
+    summary_names: Collection[str] = DEFAULT_SUMMARIES,
+    on_timings: Callable[[ArchiveTimings], None] | None = None,
+    max_rows: int | None = None,
+    gate: QCGate | None = None,
+    on_error: Callable[[str, Exception], None] | None = None,
+) -> Iterator[tuple[str, dict]]:
+    """Compute the summaries of the new or modified FastQC archives in a directory.
+
+    Archives are compared to the state by file metadata alone, so unchanged archives are never opened.
+    Archives that are not yet complete ZIP archives, e.g. because FastQC is still writing them, are skipped
+    and picked up by a later pass.
+    Archives that are complete ZIP archives but cannot be summarized are recorded with their error and left out,
+    so that later passes skip them until they change.
+
+    Args:
+        watch_dir: Path to a directory of FastQC ZIP archive files.
+        state: Record of the FastQC archives already summarized. New summaries are recorded in it.
+        pattern: Glob pattern of FastQC ZIP archive files relative to the directory.
+        workers: Number of workers to summarize archives with.
+        executor: Kind of worker pool to use, one of [process, thread].
+        cache: A summary cache to read summaries from and write summaries to.
+        refresh: Recompute summaries of cached archives and overwrite their cache entries.
+        length_mode: Length of reads in binned lengths, one of [lower, midpoint, upper].
+        exporter: A writer of tables of modules to export.
+        summary_names: Names of registered summaries to compute.
+        on_timings: A hook called with the timings of each summarized archive. Leave as None to not time archives.
+        max_rows: Number of rows of a module above which its rows are spilled to disk. Leave as None to keep every row in memory.
+        gate: Quality control rules to evaluate against each archive. Leave as None to not gate archives.
+        on_error: A hook called with the path and the error of each archive that could not be summarized.
+
+    Yields:
+        A tuple of the sample name and the summaries for each new or modified archive.
+    """
+    options = summary_options(length_mode, summary_names, gate)
+
+    changed = []
+    for fastqc_archive in sorted(Path(watch_dir).glob(pattern)):
+        stat = fastqc_archive.stat()
+        if state.is_current(fastqc_archive, stat, options):
+            continue
+        # archives still being written have no central directory yet
+        if not zipfile.is_zipfile(fastqc_archive):
+            continue
+        changed.append((fastqc_archive, stat))
+
+    stats = {str(fastqc_archive): stat for fastqc_archive, stat in changed}
+    failed = set()
+
+    def record_error(fastqc_archive: str, error: Exception) -> None:
+        failed.add(fastqc_archive)
+        state.record(fastqc_archive, stats[fastqc_archive], options, {}, f"{type(error).__name__}: {error}")
+        if on_error is not None:
+            on_error(fastqc_archive, error)
+
+    results = summarize_many(
+        [str(fastqc_archive) for fastqc_archive, _ in changed],
+        workers=workers,
+        executor=executor,
+        cache=cache,
+        refresh=refresh,
+        length_mode=length_mode,
+        exporter=exporter,
+        summary_names=summary_names,
+        on_timings=on_timings,
+        max_rows=max_rows,
+        gate=gate,
+        on_error=record_error,
+    )
+    # failed archives are reported before any later archive is yielded, so results are pulled before the archives they belong to
+    succeeded = ((fastqc_archive, stat) for fastqc_archive, stat in changed if str(fastqc_archive) not in failed)
+    for (sample, summaries), (fastqc_archive, stat) in zip(results, succeeded):
+        yield sample, summaries
+        # record once the caller has taken the summaries so that interrupted runs do not lose records
+        state.record(fastqc_archive, stat, options, summaries)
+
+
+def watch(
+    watch_dir: str | Path,
+    state: WatchState,
+    poll: float | None = None,
+    **options,
+) -> Iterator[tuple[str, dict]]:
+    """Summarize new or modified FastQC archives in a directory, optionally polling for more.
+
+    Args:
+        watch_dir: Path to a directory of FastQC ZIP archive files.
+        state: Record of the FastQC archives already summarized.
+        poll: Seconds to wait between passes over the directory. Leave as None for a single pass.
+        **options: Options passed on to `summarize_changed()`.
+
+    Yields:
+        A tuple of the sample name and the summaries for each new or modified archive.
+
+    Raises:
+        ValueError: The poll interval is invalid.
+    """
+    if poll is not None and poll <= 0:
+        raise ValueError(f"Poll interval must be greater than 0, got {poll}.")
+
+    while True:
+        yield from summarize_changed(watch_dir, state, **options)
+        if poll is None:
+            return
+        time.sleep(poll)
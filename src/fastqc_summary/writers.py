@@ -0,0 +1,179 @@
+"""Write summaries of FastQC archives.
+
+Summaries are written one record per FastQC archive as soon as each archive is summarized,
+so memory stays constant no matter how many archives are summarized and downstream consumers
+can start reading before the whole run finishes.
+
+Typical usage examples:
+    >>> import sys
+    >>> from fastqc_summary.writers import make_writer
+    >>> with make_writer("ndjson", sys.stdout) as writer:
+    >>>     writer.write("SRR1067505_1", {"read_count": 18361776, "base_count": 661023936})
+"""
+
+import csv
+import json
+from typing import Sequence, TextIO
+
+FORMATS = ("json", "ndjson", "tsv", "csv")
+
+
+class SummaryWriter:
+    """Base class for writers of summaries.
+
+    Records are buffered by the underlying file object and flushed every `flush_every` records.
+
+    Attributes:
+        output: A file object to write summaries to.
+        flush_every: Number of records to write between flushes of the file object.
+    """
+
+    def __init__(self, output: TextIO, flush_every: int = 1) -> None:
+        if flush_every < 1:
+            raise ValueError(f"Records between flushes must be at least 1, got {flush_every}.")
+
+        self.output = output
+        self.flush_every = flush_every
+        self._records = 0
+
+    def __enter__(self) -> "SummaryWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, sample: str, summaries: dict) -> None:
+        """Write the summaries of a FastQC archive.
+
+        Args:
+            sample: Sample name of the FastQC archive.
+            summaries: Summaries of the FastQC archive.
+        """
+        self._write(sample, summaries)
+
+        self._records += 1
+        if self._records % self.flush_every == 0:
+            self.output.flush()
+
+    def close(self) -> None:
+        """Finish writing and flush any buffered records. The file object is left open."""
+        self.output.flush()
+
+    def _write(self, sample: str, summaries: dict) -> None:
+        raise NotImplementedError
+
+
+class JsonWriter(SummaryWriter):
+    """Write the summaries of a single FastQC archive as one JSON object."""
+
+    def _write(self, sample: str, summaries: dict) -> None:
+        if self._records:
+            raise ValueError("JSON output holds the summaries of a single FastQC archive. Use NDJSON output instead.")
+
+        json.dump(summaries, self.output)
+
+
+class NdjsonWriter(SummaryWriter):
+    """Write the summaries of each FastQC archive as one JSON object per line keyed by sample name."""
+
+    def _write(self, sample: str, summaries: dict) -> None:
+        self.output.write(json.dumps({"sample": sample, **summaries}))
+        self.output.write("\n")
+
+
+class DelimitedWriter(SummaryWriter):
+    """Write the summaries of each FastQC archive as one row of a delimited table keyed by sample name.
+
+    The header is given by `columns`, or taken from the summaries of the first FastQC archive otherwise.
+    Summaries missing from a FastQC archive are left empty.
+    With given columns, summaries outside of them are collected in the `other` column as 'key=value' pairs joined by ';',
+    or are an error without one, rather than silently left out.
+
+    Attributes:
+        columns: Columns of the table after the sample name. Leave as None to take them from the first FastQC archive.
+        other: Last column of the table, collecting summaries outside of the given columns. Leave as None to raise on them.
+    """
+
+    delimiter = ","
+
+    def __init__(
+        self,
+        output: TextIO,
+        flush_every: int = 1,
+        columns: Sequence[str] | None = None,
+        other: str | None = None,
+    ) -> None:
+        super().__init__(output, flush_every)
+        self.columns = list(columns) if columns is not None else None
+        self.other = other
+        self._writer = None
+
+    def _write(self, sample: str, summaries: dict) -> None:
+        if self._writer is None:
+            self._writer = csv.DictWriter(
+                self.output,
+                fieldnames=[
+                    "sample",
+                    *(self.columns if self.columns is not None else summaries),
+                    *([self.other] if self.columns is not None and self.other is not None else []),
+                ],
+                delimiter=self.delimiter,
+                extrasaction="ignore",
+                lineterminator="\n",
+            )
+            self._writer.writeheader()
+
+        if self.columns is not None:
+            unexpected = [key for key in summaries if key not in self._writer.fieldnames]
+            if unexpected and self.other is None:
+                raise ValueError(f"Summaries of '{sample}' hold {unexpected}, which are not columns of the table.")
+            if unexpected:
+                summaries = {**summaries, self.other: ";".join(f"{key}={summaries[key]}" for key in unexpected)}
+
+        self._writer.writerow({"sample": sample, **summaries})
+
+
+class CsvWriter(DelimitedWriter):
+    """Write the summaries of each FastQC archive as one row of a comma-separated table."""
+
+    delimiter = ","
+
+
+class TsvWriter(DelimitedWriter):
+    """Write the summaries of each FastQC archive as one row of a tab-separated table."""
+
+    delimiter = "\t"
+
+
+_WRITERS = {"json": JsonWriter, "ndjson": NdjsonWriter, "tsv": TsvWriter, "csv": CsvWriter}
+
+
+def make_writer(
+    output_format: str,
+    output: TextIO,
+    flush_every: int = 1,
+    columns: Sequence[str] | None = None,
+    other: str | None = None,
+) -> SummaryWriter:
+    """Make a writer of summaries.
+
+    Args:
+        output_format: Format to write summaries in, one of [json, ndjson, tsv, csv].
+        output: A file object to write summaries to.
+        flush_every: Number of records to write between flushes of the file object.
+        columns: Fixed columns of delimited tables, see `DelimitedWriter`. Ignored by other formats.
+        other: Column of delimited tables with fixed columns collecting the summaries outside of them.
+
+    Returns:
+        A writer of summaries.
+
+    Raises:
+        ValueError: The output format is invalid.
+    """
+    if output_format not in _WRITERS:
+        raise ValueError(f"Output format must be one of {list(FORMATS)}, got '{output_format}'.")
+
+    if issubclass(_WRITERS[output_format], DelimitedWriter):
+        return _WRITERS[output_format](output, flush_every, columns, other)
+
+    return _WRITERS[output_format](output, flush_every)
@@ -0,0 +1,110 @@
+import statistics
+
+import pytest
+
+from fastqc_summary.aggregate import CohortAggregator, RunningStats
+
+
+class TestRunningStats:
+    """Test RunningStats."""
+
+    def test_matches_batch_statistics(self) -> None:
+        values = [18361776, 50000, 0, 731, 1234567]
+        stats = RunningStats([f"s{i}" for i in range(len(values))])
+        for i, value in enumerate(values):
+            stats.add(i, value)
+
+        assert stats.count == 5
+        assert stats.total == sum(values)
+        assert stats.mean == pytest.approx(statistics.mean(values))
+        assert stats.variance == pytest.approx(statistics.variance(values))
+        assert (stats.minimum, stats.maximum) == (0, 18361776)
+        assert stats.quantiles([0.25, 0.5, 0.75]) == dict(zip(
+            ["0.25", "0.5", "0.75"],
+            statistics.quantiles(values, n=4, method="inclusive"),
+        ))
+
+
+    def test_flags_outliers_beyond_tukey_fences(self) -> None:
+        stats = RunningStats([f"s{i}" for i in range(6)])
+        for i, value in enumerate([100, 102, 98, 101, 99, 500]):
+            stats.add(i, value)
+
+        assert stats.outliers() == ["s5"]
+
+
+    def test_single_value_has_no_variance(self) -> None:
+        stats = RunningStats(["s0"])
+        stats.add(0, 3.5)
+
+        report = stats.as_dict()
+
+        assert report["variance"] is None
+        assert report["std"] is None
+        assert report["quantiles"]["0.5"] == 3.5
+        assert report["outliers"] == []
+
+
+class TestCohortAggregator:
+    """Test CohortAggregator."""
+
+    @pytest.fixture
+    def results(self) -> list[tuple[str, dict]]:
+        return [
+            ("ProjA_S1_L001", {"read_count": 10, "mean_gc": 40.0}),
+            ("ProjA_S1_L002", {"read_count": 20, "mean_gc": None}),
+            ("ProjB_S2_L001", {"read_count": 30, "mean_gc": 50.0}),
+            ("unnamed", {"read_count": 5, "mean_gc": 45.0}),
+        ]
+
+
+    def test_fold_yields_results_unchanged(self, results) -> None:
+        aggregator = CohortAggregator()
+
+        assert list(aggregator.fold(results)) == results
+        assert aggregator.report()["cohort"]["samples"] == 4
+        assert "groups" not in aggregator.report()
+
+
+    def test_report_skips_missing_summaries(self, results) -> None:
+        aggregator = CohortAggregator()
+        for sample, summaries in results:
+            aggregator.add(sample, summaries)
+
+        summaries = aggregator.report()["cohort"]["summaries"]
+
+        assert summaries["read_count"]["sum"] == 65
+        assert summaries["mean_gc"]["count"] == 3
+        assert summaries["mean_gc"]["mean"] == pytest.approx(45.0)
+
+
+    @pytest.mark.parametrize("group_by, expected_sums", [
+        (r"_(L\d{3})$", {"L001": 40, "L002": 20, "ungrouped": 5}),
+        (r"^Proj\w", {"ProjA": 30, "ProjB": 30, "ungrouped": 5}),
+        (r"^(Proj\w)_(S\d)", {"ProjA_S1": 30, "ProjB_S2": 30, "ungrouped": 5}),
+    ])
+    def test_report_groups_by_sample_name(self, results, group_by, expected_sums) -> None:
+        aggregator = CohortAggregator(group_by=group_by)
+        list(aggregator.fold(results))
+
+        groups = aggregator.report()["groups"]
+
+        assert {group: report["summaries"]["read_count"]["sum"] for group, report in groups.items()} == expected_sums
+
+
+    def test_report_outliers_by_sample_name(self) -> None:
+        aggregator = CohortAggregator(group_by=r"^(A|B)")
+        for i, value in enumerate([100, 102, 98, 101, 99, 500]):
+            aggregator.add(f"{'AB'[i % 2]}{i}", {"read_count": value, "mean_gc": 50.0})
+
+        report = aggregator.report()
+
+        # statistics of the cohort and of each group share one list of sample names
+        assert report["cohort"]["summaries"]["read_count"]["outliers"] == ["B5"]
+        assert report["groups"]["B"]["summaries"]["read_count"]["count"] == 3
+        assert report["groups"]["A"]["summaries"]["read_count"]["sum"] == 100 + 98 + 99
+
+
+    def test_fail_invalid_quantiles(self) -> None:
+        with pytest.raises(ValueError, match="Quantiles must be between 0 and 1"):
+            CohortAggregator(quantiles=[50])
@@ -0,0 +1,44 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+import pytest
+
+from fastqc_summary.aio import summarize_many_async
+
+
+async def collect(fastqc_archives, **kwargs) -> list:
+    return [result async for result in summarize_many_async(fastqc_archives, **kwargs)]
+
+
+class TestSummarizeManyAsync:
+    """Test summarize_many_async()."""
+
+    @pytest.mark.parametrize("concurrency", [1, 4])
+    def test_summarize_many_async_yields_every_archive(self, concurrency) -> None:
+        fastqc_archives = ["tests/data/SRR1067505_1_fastqc.zip", "tests/data/empty_fastqc.zip"]
+
+        results = asyncio.run(collect(fastqc_archives, concurrency=concurrency))
+
+        assert sorted(results) == [
+            ("SRR1067505_1", {"read_count": 18361776, "base_count": 661023936}),
+            ("empty", {"read_count": 0, "base_count": 0}),
+        ]
+
+
+    def test_summarize_many_async_process_executor(self) -> None:
+        # threads used to prefetch archives make forking unsafe, so spawn the workers
+        with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn")) as executor:
+            results = asyncio.run(collect(["tests/data/SRR1067505_1_fastqc.zip"], executor=executor))
+
+        assert results == [("SRR1067505_1", {"read_count": 18361776, "base_count": 661023936})]
+
+
+    def test_summarize_many_async_fails_missing_archive(self) -> None:
+        with pytest.raises(FileNotFoundError):
+            asyncio.run(collect(["tests/data/missing_fastqc.zip"]))
+
+
+    def test_summarize_many_async_fails_invalid_concurrency(self) -> None:
+        with pytest.raises(ValueError, match="Concurrency must be at least 1"):
+            asyncio.run(collect([], concurrency=0))
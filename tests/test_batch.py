@@ -0,0 +1,273 @@
+from pathlib import Path
+from unittest.mock import patch
+import zipfile
+
+import pytest
+
+from fastqc_summary import parser
+
+from fastqc_summary.batch import (
+    get_module,
+    read_many_statuses,
+    sample_name,
+    summarize_archive,
+    summarize_many,
+)
+from fastqc_summary.cache import SummaryCache
+from fastqc_summary.gate import make_gate
+from fastqc_summary.parser import index_modules, parse_modules
+from fastqc_summary.summaries import SUMMARIES
+
+
+class TestSampleName:
+    """Test sample_name()."""
+
+    @pytest.mark.parametrize("fastqc_archive, expected_sample", [
+        ("tests/data/SRR1067505_1_fastqc.zip", "SRR1067505_1"),
+        ("/data/sample.zip", "sample"),
+        ("sample", "sample"),
+        ("/data/SRR1067505_1_fastqc", "SRR1067505_1"),
+        ("/data/SRR1067505_1_fastqc/fastqc_data.txt", "SRR1067505_1"),
+        ("/data/SRR1067505_1_fastqc/fastqc_data.txt.gz", "SRR1067505_1"),
+    ])
+    def test_sample_name_strips_fastqc_suffix(self, fastqc_archive, expected_sample) -> None:
+        assert sample_name(fastqc_archive) == expected_sample
+
+
+class TestSummarizeArchive:
+    """Test summarize_archive()."""
+
+    @pytest.mark.parametrize("fastqc_archive, read_count, base_count", [
+        ("tests/data/SRR1067505_1_fastqc.zip", 18361776, 661023936),
+        ("tests/data/empty_fastqc.zip", 0, 0),
+    ])
+    def test_summarize_archive_succeeds(self, fastqc_archive, read_count, base_count) -> None:
+        assert summarize_archive(fastqc_archive) == {"read_count": read_count, "base_count": base_count}
+
+
+    def test_summarize_archive_parses_only_needed_modules(self) -> None:
+        with patch("fastqc_summary.batch.parse_modules", wraps=parse_modules) as parse_modules_spy:
+            summaries = summarize_archive("tests/data/SRR1067505_1_fastqc.zip", summary_names=["read_count"])
+
+        assert summaries == {"read_count": 18361776}
+        assert parse_modules_spy.call_args.kwargs["wanted"] == {"Basic Statistics"}
+
+
+    def test_summarize_archive_reuses_open_archive(self) -> None:
+        with zipfile.ZipFile("tests/data/SRR1067505_1_fastqc.zip") as archive:
+            assert summarize_archive(archive) == {"read_count": 18361776, "base_count": 661023936}
+            assert summarize_archive(archive) == {"read_count": 18361776, "base_count": 661023936}
+
+
+class TestGetModule:
+    """Test get_module()."""
+
+    @pytest.fixture
+    def adapter_content(self):
+        return next(parse_modules("tests/data/SRR1067505_1_fastqc.zip", wanted={"Adapter Content"}))
+
+
+    def test_get_module_without_cache(self, adapter_content) -> None:
+        assert get_module("tests/data/SRR1067505_1_fastqc.zip", "Adapter Content") == adapter_content
+
+
+    def test_get_module_caches_index(self, tmp_path, adapter_content) -> None:
+        with SummaryCache(tmp_path / "cache") as cache:
+            assert get_module("tests/data/SRR1067505_1_fastqc.zip", "Adapter Content", cache=cache) == adapter_content
+
+            # the cached index is reused rather than scanning the archive again
+            with patch("fastqc_summary.batch.index_modules", wraps=index_modules) as index_modules_spy:
+                module = get_module("tests/data/SRR1067505_1_fastqc.zip", "Basic Statistics", cache=cache)
+
+        assert module.data[0] == "Filename\tSRR1067505_1.fastq.gz"
+        index_modules_spy.assert_not_called()
+
+
+    @pytest.mark.parametrize("use_cache", [False, True])
+    def test_get_module_fails_missing_module(self, tmp_path, use_cache) -> None:
+        with SummaryCache(tmp_path / "cache") as cache, pytest.raises(KeyError, match="Module 'Kmer Content' not found"):
+            get_module("tests/data/empty_fastqc.zip", "Kmer Content", cache=cache if use_cache else None)
+
+
+class TestSummarizeMany:
+    """Test summarize_many()."""
+
+    @pytest.mark.parametrize("workers, executor", [
+        (1, "process"),
+        (2, "thread"),
+        (2, "process"),
+    ])
+    def test_summarize_many_preserves_order(self, workers, executor) -> None:
+        fastqc_archives = [
+            "tests/data/SRR1067505_1_fastqc.zip",
+            "tests/data/empty_fastqc.zip",
+            "tests/data/SRR1067505_1_fastqc.zip",
+        ]
+
+        results = list(summarize_many(fastqc_archives, workers=workers, executor=executor))
+
+        assert [sample for sample, _ in results] == ["SRR1067505_1", "empty", "SRR1067505_1"]
+        assert results[0][1] == {"read_count": 18361776, "base_count": 661023936}
+        assert results[1][1] == {"read_count": 0, "base_count": 0}
+
+
+    @pytest.mark.parametrize("workers, executor, ordered", [
+        (1, "process", True),
+        (2, "thread", False),
+        (2, "process", True),
+    ])
+    def test_summarize_many_reports_errors_and_continues(self, create_zip, workers, executor, ordered) -> None:
+        bad_archive = str(create_zip({"notes.txt": "no FastQC data"}, name="bad_fastqc.zip"))
+        fastqc_archives = ["tests/data/SRR1067505_1_fastqc.zip", bad_archive, "tests/data/empty_fastqc.zip"]
+        errors = []
+
+        results = list(summarize_many(
+            fastqc_archives, workers=workers, executor=executor, ordered=ordered,
+            on_error=lambda fastqc_archive, error: errors.append((fastqc_archive, type(error))),
+        ))
+
+        assert [sample for sample, _ in (results if ordered else sorted(results))] == ["SRR1067505_1", "empty"]
+        assert errors == [(bad_archive, FileNotFoundError)]
+
+
+    @pytest.mark.parametrize("workers, executor, ordered", [
+        (1, "process", True),
+        (2, "thread", False),
+        (2, "process", True),
+    ])
+    def test_summarize_many_reports_errors_with_cache(self, tmp_path, create_zip, workers, executor, ordered) -> None:
+        bad_archive = str(create_zip({"notes.txt": "no FastQC data"}, name="bad_fastqc.zip"))
+        corrupt_archive = tmp_path / "corrupt_fastqc.zip"
+        corrupt_archive.write_bytes(Path("tests/data/empty_fastqc.zip").read_bytes()[:100])
+        fastqc_archives = [bad_archive, "tests/data/SRR1067505_1_fastqc.zip", str(corrupt_archive), "tests/data/empty_fastqc.zip"]
+        errors = []
+
+        with SummaryCache(tmp_path / "cache") as cache:
+            # cache one of the archives so that cached, computed, and failed archives are mixed
+            list(summarize_many(fastqc_archives[3:], cache=cache))
+            results = list(summarize_many(
+                fastqc_archives, workers=workers, executor=executor, cache=cache, ordered=ordered,
+                on_error=lambda fastqc_archive, error: errors.append((fastqc_archive, type(error))),
+            ))
+
+        # archives that cannot be keyed are misses, reported when they fail to be summarized
+        assert [sample for sample, _ in (results if ordered else sorted(results))] == ["SRR1067505_1", "empty"]
+        assert sorted(errors) == sorted([(bad_archive, FileNotFoundError), (str(corrupt_archive), zipfile.BadZipFile)])
+
+
+    def test_summarize_many_raises_errors_without_hook(self, create_zip) -> None:
+        bad_archive = str(create_zip({"notes.txt": "no FastQC data"}, name="bad_fastqc.zip"))
+
+        with pytest.raises(FileNotFoundError, match="fastqc_data.txt not found in archive"):
+            list(summarize_many(["tests/data/empty_fastqc.zip", bad_archive]))
+
+
+    @pytest.mark.parametrize("workers, executor", [
+        (1, "process"),
+        (2, "thread"),
+    ])
+    def test_summarize_many_unordered_yields_every_archive(self, tmp_path, workers, executor) -> None:
+        fastqc_archives = ["tests/data/SRR1067505_1_fastqc.zip", "tests/data/empty_fastqc.zip"]
+
+        with SummaryCache(tmp_path / "cache") as cache:
+            # cache one of the archives so that cached and computed summaries are mixed
+            list(summarize_many(fastqc_archives[1:], cache=cache))
+            results = list(summarize_many(fastqc_archives, workers=workers, executor=executor, cache=cache, ordered=False))
+
+        assert sorted(results) == sorted(summarize_many(fastqc_archives))
+
+
+    def test_summarize_many_spills_large_modules(self, monkeypatch) -> None:
+        fastqc_archives = ["tests/data/SRR1067505_1_fastqc.zip", "tests/data/empty_fastqc.zip"]
+        expected_results = list(summarize_many(fastqc_archives, summary_names=list(SUMMARIES)))
+        monkeypatch.setattr(parser, "_CHUNK_SIZE", 64)
+
+        results = list(summarize_many(fastqc_archives, summary_names=list(SUMMARIES), max_rows=0))
+
+        assert results == expected_results
+
+
+    @pytest.mark.parametrize("workers, executor, message", [
+        (0, "process", "Number of workers must be at least 1"),
+        (1, "fiber", "Executor must be one of"),
+    ])
+    def test_summarize_many_fails_invalid_pool(self, workers, executor, message) -> None:
+        with pytest.raises(ValueError, match=message):
+            list(summarize_many([], workers=workers, executor=executor))
+
+
+    def test_summarize_many_reuses_cached_summaries(self, tmp_path) -> None:
+        fastqc_archives = ["tests/data/SRR1067505_1_fastqc.zip", "tests/data/empty_fastqc.zip"]
+
+        with SummaryCache(tmp_path / "cache") as cache:
+            expected_results = list(summarize_many(fastqc_archives, cache=cache))
+
+            # cache hits never parse the archives
+            with patch("fastqc_summary.batch.parse_modules") as parse_modules:
+                assert list(summarize_many(fastqc_archives, cache=cache)) == expected_results
+                parse_modules.assert_not_called()
+
+
+    @pytest.mark.parametrize("workers, executor", [(1, "process"), (2, "process")])
+    def test_summarize_many_gates_archives(self, tmp_path, workers, executor) -> None:
+        fastqc_archives = ["tests/data/SRR1067505_1_fastqc.zip", "tests/data/empty_fastqc.zip"]
+        gate = make_gate([{"summary": "read_count", "op": ">", "value": 0, "name": "reads"}], fail_fast=True)
+
+        with SummaryCache(tmp_path / "cache") as cache:
+            list(summarize_many(fastqc_archives, cache=cache))
+            results = list(summarize_many(fastqc_archives, workers=workers, executor=executor, cache=cache, gate=gate))
+
+        # summaries cached without the gate are not reused, and the failing archive is not parsed past its read count
+        assert results == [
+            ("SRR1067505_1", {"read_count": 18361776, "base_count": 661023936, "qc_gate": "pass", "qc:reads": "pass"}),
+            ("empty", {"read_count": 0, "base_count": None, "qc_gate": "fail", "qc:reads": "fail"}),
+        ]
+
+
+    def test_summarize_many_refresh_recomputes_cached_summaries(self, tmp_path) -> None:
+        fastqc_archives = ["tests/data/empty_fastqc.zip"]
+
+        with SummaryCache(tmp_path / "cache") as cache:
+            expected_results = list(summarize_many(fastqc_archives, cache=cache))
+
+            with patch("fastqc_summary.batch.parse_modules", wraps=parse_modules) as parse_modules_spy:
+                assert list(summarize_many(fastqc_archives, cache=cache, refresh=True)) == expected_results
+                parse_modules_spy.assert_called_once()
+
+
+    def test_summarize_many_caches_per_length_mode(self, tmp_path, create_zip) -> None:
+        fastqc_archive = str(create_zip({
+            "test_fastqc/fastqc_data.txt": (
+                ">>Basic Statistics\tpass\n#Measure\tValue\nTotal Sequences\t2\n>>END_MODULE\n"
+                ">>Sequence Length Distribution\tpass\n#Length\tCount\n35-39\t2.0\n>>END_MODULE\n"
+            ),
+        }, name="test_fastqc.zip"))
+
+        with SummaryCache(tmp_path / "cache") as cache:
+            for length_mode, base_count in [("lower", 70), ("upper", 78), ("lower", 70)]:
+                results = list(summarize_many([fastqc_archive], cache=cache, length_mode=length_mode))
+                assert results == [("test", {"read_count": 2, "base_count": base_count})]
+
+
+class TestReadManyStatuses:
+    """Test read_many_statuses()."""
+
+    @pytest.mark.parametrize("workers, executor", [
+        (1, "process"),
+        (2, "thread"),
+        (2, "process"),
+    ])
+    def test_read_many_statuses_preserves_order(self, workers, executor) -> None:
+        fastqc_archives = ["tests/data/SRR1067505_1_fastqc.zip", "tests/data/empty_fastqc.zip"]
+
+        results = list(read_many_statuses(fastqc_archives, workers=workers, executor=executor))
+
+        assert [sample for sample, _ in results] == ["SRR1067505_1", "empty"]
+        assert results[0][1]["Per tile sequence quality"] == "fail"
+        assert results[1][1]["Adapter Content"] == "warn"
+        assert "Kmer Content" not in results[1][1]
+
+
+    def test_read_many_statuses_fails_invalid_pool(self) -> None:
+        with pytest.raises(ValueError, match="Executor must be one of"):
+            list(read_many_statuses(["tests/data/empty_fastqc.zip"], executor="fiber"))
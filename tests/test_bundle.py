@@ -0,0 +1,118 @@
+import tarfile
+import zipfile
+
+import pytest
+
+from fastqc_summary.batch import summarize_archive
+from fastqc_summary.parser import read_statuses
+from fastqc_summary.bundle import is_bundle, read_bundle, read_input_statuses, summarize_bundle, summarize_inputs
+
+FASTQC_ARCHIVES = {
+    "run/SRR1067505_1_fastqc.zip": "tests/data/SRR1067505_1_fastqc.zip",
+    "run/empty_fastqc.zip": "tests/data/empty_fastqc.zip",
+}
+
+EXPECTED_RESULTS = [
+    ("SRR1067505_1", {"read_count": 18361776, "base_count": 661023936}),
+    ("empty", {"read_count": 0, "base_count": 0}),
+]
+
+
+@pytest.fixture(params=["run.tar", "run.tar.gz", "run.zip"])
+def bundle(request, tmp_path):
+    """Bundle of the test FastQC archives along with a file that is not a FastQC archive."""
+    path = tmp_path / request.param
+    if request.param.endswith(".zip"):
+        with zipfile.ZipFile(path, "w") as archive:
+            for name, fastqc_archive in FASTQC_ARCHIVES.items():
+                archive.write(fastqc_archive, name)
+            archive.writestr("run/multiqc_report.html", "<html></html>")
+    else:
+        (tmp_path / "multiqc_report.html").write_text("<html></html>")
+        with tarfile.open(path, "w:gz" if request.param.endswith(".gz") else "w") as tar:
+            for name, fastqc_archive in FASTQC_ARCHIVES.items():
+                tar.add(fastqc_archive, name)
+            tar.add(tmp_path / "multiqc_report.html", "run/multiqc_report.html")
+
+    return path
+
+
+class TestIsBundle:
+    """Test is_bundle()."""
+
+    def test_is_bundle(self, bundle) -> None:
+        assert is_bundle(bundle)
+
+
+    def test_fastqc_archive_is_not_bundle(self, tmp_path, create_zip) -> None:
+        assert not is_bundle("tests/data/SRR1067505_1_fastqc.zip")
+        # FastQC archives are recognized by their contents when they are not named like one
+        assert not is_bundle(create_zip({"sample_fastqc/fastqc_data.txt": "##FastQC\t0.12.1\n"}, name="sample.zip"))
+        (tmp_path / "notes.zip").write_text("not a ZIP file")
+        assert not is_bundle(tmp_path / "notes.zip")
+
+
+class TestSummarizeBundle:
+    """Test read_bundle() and summarize_bundle()."""
+
+    def test_read_bundle_yields_fastqc_archives(self, bundle) -> None:
+        members = list(read_bundle(bundle))
+
+        assert [name for name, _ in members] == list(FASTQC_ARCHIVES)
+        assert all(data.startswith(b"PK") for _, data in members)
+
+
+    @pytest.mark.parametrize("workers, executor", [
+        (1, "process"),
+        (2, "thread"),
+        (2, "process"),
+    ])
+    def test_summarize_bundle_preserves_order(self, bundle, workers, executor) -> None:
+        assert list(summarize_bundle(bundle, workers=workers, executor=executor)) == EXPECTED_RESULTS
+
+
+    def test_summarize_bundle_unordered_yields_every_archive(self, bundle) -> None:
+        results = list(summarize_bundle(bundle, workers=2, executor="thread", ordered=False))
+
+        assert sorted(results) == sorted(EXPECTED_RESULTS)
+
+
+    def test_summarize_inputs_keeps_input_order(self, bundle) -> None:
+        fastqc_archives = ["tests/data/empty_fastqc.zip", str(bundle), "tests/data/SRR1067505_1_fastqc.zip"]
+
+        results = list(summarize_inputs(fastqc_archives, bundles={str(bundle)}))
+
+        assert results == [
+            ("empty", summarize_archive("tests/data/empty_fastqc.zip")),
+            *EXPECTED_RESULTS,
+            EXPECTED_RESULTS[0],
+        ]
+
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_summarize_bundle_reports_errors_and_continues(self, tmp_path, workers) -> None:
+        bundle = tmp_path / "run.zip"
+        with zipfile.ZipFile(bundle, "w") as archive:
+            archive.writestr("run/bad_fastqc.zip", b"not a ZIP file")
+            archive.write("tests/data/empty_fastqc.zip", "run/empty_fastqc.zip")
+        errors = []
+
+        results = list(summarize_bundle(bundle, workers=workers, executor="thread", on_error=lambda member, error: errors.append(member)))
+
+        assert results == EXPECTED_RESULTS[1:]
+        assert errors == ["run/bad_fastqc.zip"]
+
+
+    def test_summarize_bundle_fails_invalid_pool(self, bundle) -> None:
+        with pytest.raises(ValueError, match="Number of workers must be at least 1"):
+            list(summarize_bundle(bundle, workers=0))
+
+
+    def test_read_input_statuses(self, bundle) -> None:
+        results = list(read_input_statuses(["tests/data/empty_fastqc.zip", str(bundle)], bundles={str(bundle)}))
+
+        assert results == [
+            ("empty", read_statuses("tests/data/empty_fastqc.zip")),
+            ("SRR1067505_1", read_statuses("tests/data/SRR1067505_1_fastqc.zip")),
+            ("empty", read_statuses("tests/data/empty_fastqc.zip")),
+        ]
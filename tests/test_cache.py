@@ -0,0 +1,114 @@
+import shutil
+
+import pytest
+
+from fastqc_summary import cache as cache_module
+from fastqc_summary.cache import CacheKey, SummaryCache
+
+
+@pytest.fixture
+def fastqc_archive(tmp_path):
+    """Copy of the SRR test FastQC archive that can be modified by tests."""
+
+    fastqc_archive = tmp_path / "SRR1067505_1_fastqc.zip"
+    shutil.copy("tests/data/SRR1067505_1_fastqc.zip", fastqc_archive)
+
+    return str(fastqc_archive)
+
+
+class TestSummaryCache:
+    """Test SummaryCache."""
+
+    def test_get_missing_returns_none(self, tmp_path, fastqc_archive) -> None:
+        with SummaryCache(tmp_path / "cache") as cache:
+            assert cache.get(cache.key(fastqc_archive)) is None
+
+
+    def test_put_then_get_returns_summaries(self, tmp_path, fastqc_archive) -> None:
+        summaries = {"read_count": 18361776, "base_count": 661023936}
+
+        with SummaryCache(tmp_path / "cache") as cache:
+            cache.put(cache.key(fastqc_archive), summaries)
+
+        # entries persist across connections
+        with SummaryCache(tmp_path / "cache") as cache:
+            assert cache.get(cache.key(fastqc_archive)) == summaries
+
+
+    def test_changed_archive_misses(self, tmp_path, fastqc_archive, create_zip) -> None:
+        with SummaryCache(tmp_path / "cache") as cache:
+            cache.put(cache.key(fastqc_archive), {"read_count": 1})
+
+            # overwrite the archive with different FastQC data
+            changed_archive = create_zip({"test/fastqc_data.txt": "##FastQC\t0.12.1"})
+            shutil.copy(changed_archive, fastqc_archive)
+
+            assert cache.get(cache.key(fastqc_archive)) is None
+
+
+    def test_evicts_least_recently_used(self, tmp_path, create_zip) -> None:
+        archives = [
+            str(create_zip({"test/fastqc_data.txt": f"##FastQC\t{i}"}, name=f"{i}_fastqc.zip"))
+            for i in range(3)
+        ]
+
+        with SummaryCache(tmp_path / "cache", max_entries=2) as cache:
+            cache.put(cache.key(archives[0]), {"read_count": 0})
+            cache.put(cache.key(archives[1]), {"read_count": 1})
+            # use the first entry so that the second entry is the least recently used
+            cache.get(cache.key(archives[0]))
+            cache.put(cache.key(archives[2]), {"read_count": 2})
+
+            assert len(cache) == 2
+            assert cache.get(cache.key(archives[0])) == {"read_count": 0}
+            assert cache.get(cache.key(archives[1])) is None
+            assert cache.get(cache.key(archives[2])) == {"read_count": 2}
+
+
+    def test_evicts_in_batches(self, tmp_path) -> None:
+        keys = [CacheKey(path=str(i), options="", size=0, mtime_ns=0, crc=0) for i in range(201)]
+
+        with SummaryCache(tmp_path / "cache", max_entries=200) as cache:
+            for key in keys[:200]:
+                cache.put(key, {"read_count": 0})
+            assert len(cache) == 200
+
+            # replacing an entry of a full cache evicts nothing
+            cache.put(keys[0], {"read_count": 0})
+            assert len(cache) == 200
+
+            # overflowing evicts 1% below the maximum, least recently used first
+            cache.put(keys[200], {"read_count": 0})
+            assert len(cache) == 198
+            assert cache.get(keys[1]) is None
+            assert cache.get(keys[0]) is not None
+
+
+    def test_batches_commits(self, tmp_path, monkeypatch, fastqc_archive) -> None:
+        monkeypatch.setattr(cache_module, "COMMIT_INTERVAL", float("inf"))
+
+        with SummaryCache(tmp_path / "cache") as cache, SummaryCache(tmp_path / "cache") as other:
+            cache.put(cache.key(fastqc_archive), {"read_count": 1})
+            assert other.get(other.key(fastqc_archive)) is None
+
+            cache.flush()
+            assert other.get(other.key(fastqc_archive)) == {"read_count": 1}
+
+
+    def test_fail_invalid_size(self, tmp_path) -> None:
+        with pytest.raises(ValueError, match="Cache size must be at least 1"):
+            SummaryCache(tmp_path / "cache", max_entries=0)
+
+
+    def test_key_unzipped_fastqc_data(self, tmp_path) -> None:
+        fastqc_dir = tmp_path / "sample_fastqc"
+        fastqc_dir.mkdir()
+        (fastqc_dir / "fastqc_data.txt").write_text("##FastQC\t0.12.1\n")
+
+        with SummaryCache(tmp_path / "cache") as cache:
+            cache.put(cache.key(str(fastqc_dir)), {"read_count": 1})
+            assert cache.get(cache.key(str(fastqc_dir))) == {"read_count": 1}
+
+            # changing the FastQC data in the directory invalidates the entry
+            (fastqc_dir / "fastqc_data.txt").write_text("##FastQC\t0.12.1\n>>Basic Statistics\tpass\n")
+            assert cache.get(cache.key(str(fastqc_dir))) is None
@@ -4,7 +4,8 @@ import zipfile
 
 import pytest
 
-from fastqc_summary.cli import Args, get_args
+from fastqc_summary.cli import Args, get_args, get_serve_args
+from fastqc_summary.merge import ILLUMINA_PATTERN
 
 
 class TestCLIFastqcArchive:
@@ -38,9 +39,10 @@ class TestCLIFastqcArchive:
 
         args = get_args(test_argv)
 
-        assert args.fastqc_archive == str(fastqc_archive)
-        assert Path(args.fastqc_archive).exists()
-        assert zipfile.is_zipfile(args.fastqc_archive)
+        assert args.fastqc_archives == [str(fastqc_archive)]
+        assert Path(args.fastqc_archives[0]).exists()
+        assert zipfile.is_zipfile(args.fastqc_archives[0])
+        assert not args.batch
 
 
     @pytest.mark.parametrize("test_argv", [
@@ -59,19 +61,288 @@ class TestCLIFastqcArchive:
             get_args(test_argv)
 
 
+    @pytest.mark.parametrize("files", [
+        # extracted FastQC output directory
+        {"SRR1067505_1_fastqc/fastqc_data.txt": "##FastQC\t0.12.1\n"},
+        # bare FastQC data file
+        {"fastqc_data.txt": "##FastQC\t0.12.1\n"},
+    ])
+    def test_succeeds_unzipped_fastqc_data(self, tmp_path, files) -> None:
+        for name, content in files.items():
+            (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / name).write_text(content)
+        fastqc_path = str(tmp_path / next(iter(files)).split("/")[0])
+
+        args = get_args([fastqc_path])
+
+        assert args.fastqc_archives == [fastqc_path]
+
+
     @pytest.mark.parametrize("test_argv", [
         ([]),
     ])
-    def test_fail_fastqc_archive_file_not_zip_file(self, tmp_path, test_argv) -> None:
-        # create a FastQC data file and add it to the arguments list
-        fastqc_data_file = tmp_path / "fastqc_data.txt"
-        fastqc_data_file.write_text("##FastQC\t0.12.1")
+    def test_defers_validation_of_fastqc_archive_contents(self, tmp_path, test_argv) -> None:
+        # create a file that is neither a ZIP file nor FastQC data and add it to the arguments list
+        fastqc_data_file = tmp_path / "notes.txt"
+        fastqc_data_file.write_text("not FastQC data")
         test_argv.append(str(fastqc_data_file))
 
-        with pytest.raises(zipfile.BadZipFile, match="FastQC archive file '.*' is not a valid ZIP file."):
+        # the file is not opened until it is summarized
+        args = get_args(test_argv)
+
+        assert args.fastqc_archives == [str(fastqc_data_file)]
+
+
+class TestCLIBatch:
+    """Test behavior of batch mode arguments."""
+
+    def test_multiple_fastqc_archives_enable_batch(self) -> None:
+        test_argv = ["tests/data/SRR1067505_1_fastqc.zip", "tests/data/empty_fastqc.zip"]
+
+        args = get_args(test_argv)
+
+        assert args.fastqc_archives == test_argv
+        assert args.batch
+
+
+    def test_glob_expands_fastqc_archives(self) -> None:
+        args = get_args(["tests/data/*_fastqc.zip"])
+
+        assert args.fastqc_archives == ["tests/data/SRR1067505_1_fastqc.zip", "tests/data/empty_fastqc.zip"]
+        assert args.batch
+
+
+    def test_manifest_lists_fastqc_archives(self, tmp_path) -> None:
+        manifest = tmp_path / "manifest.txt"
+        manifest.write_text("# FastQC archives\ntests/data/SRR1067505_1_fastqc.zip\n\n")
+
+        args = get_args(["-m", str(manifest)])
+
+        assert args.fastqc_archives == ["tests/data/SRR1067505_1_fastqc.zip"]
+        assert args.batch
+
+
+    def test_bundle_enables_batch(self, tmp_path) -> None:
+        bundle = tmp_path / "run.zip"
+        with zipfile.ZipFile(bundle, "w") as archive:
+            archive.write("tests/data/empty_fastqc.zip", "run/empty_fastqc.zip")
+
+        args = get_args([str(bundle)])
+
+        assert args.fastqc_archives == [str(bundle)]
+        assert args.bundles == [str(bundle)]
+        assert args.batch
+
+
+    def test_watch_directory(self, tmp_path) -> None:
+        args = get_args(["--watch", str(tmp_path), "--poll", "30"])
+
+        assert args.watch_dir == str(tmp_path)
+        assert args.state_file == str(tmp_path / ".fastqc-summary-state.ndjson")
+        assert args.poll == 30
+        assert args.batch
+        assert args.output_format == "ndjson"
+
+
+    @pytest.mark.parametrize("test_argv", [
+        ["--watch", "tests/data", "tests/data/SRR1067505_1_fastqc.zip"],
+        ["--watch", "tests/data", "--format", "tsv"],
+        ["--watch", "tests/data", "--poll", "0"],
+        ["tests/data/SRR1067505_1_fastqc.zip", "--poll", "30"],
+    ])
+    def test_fail_invalid_watch(self, test_argv) -> None:
+        with pytest.raises(SystemExit):
             get_args(test_argv)
 
 
+    def test_fail_watch_directory_does_not_exist(self) -> None:
+        with pytest.raises(FileNotFoundError, match="Watch directory 'run' could not be found."):
+            get_args(["--watch", "run"])
+
+
+    def test_report_group_by(self) -> None:
+        args = get_args(["tests/data/SRR1067505_1_fastqc.zip", "--report", "report.json", "--group-by", "_(L\\d{3})_"])
+
+        assert args.report == "report.json"
+        assert args.group_by == "_(L\\d{3})_"
+
+
+    @pytest.mark.parametrize("test_argv", [
+        ["tests/data/SRR1067505_1_fastqc.zip", "--group-by", "_(L\\d{3})_"],
+        ["tests/data/SRR1067505_1_fastqc.zip", "--report", "report.json", "--group-by", "_(L"],
+    ])
+    def test_fail_invalid_group_by(self, test_argv) -> None:
+        with pytest.raises(SystemExit):
+            get_args(test_argv)
+
+
+    def test_fail_manifest_does_not_exist(self) -> None:
+        with pytest.raises(FileNotFoundError, match="Manifest file 'manifest.txt' could not be found."):
+            get_args(["--manifest", "manifest.txt"])
+
+
+    @pytest.mark.parametrize("workers_flag, workers, expected_workers", [
+        ("-j", "4", 4),
+        ("--workers", "2", 2),
+    ])
+    def test_succeeds_workers(self, workers_flag, workers, expected_workers) -> None:
+        args = get_args(["tests/data/SRR1067505_1_fastqc.zip", workers_flag, workers])
+
+        assert args.workers == expected_workers
+
+
+    def test_merge_samples(self, tmp_path) -> None:
+        sample_sheet = tmp_path / "samples.csv"
+        sample_sheet.write_text("file,sample\nSRR1067505_1.fastq.gz,patient1\n")
+
+        args = get_args(["tests/data/SRR1067505_1_fastqc.zip", "--merge-samples"])
+        assert (args.merge_samples, args.sample_sheet, args.batch) == (ILLUMINA_PATTERN, None, True)
+
+        args = get_args(["tests/data/SRR1067505_1_fastqc.zip", "--merge-samples", "^(SRR\\d+)_"])
+        assert args.merge_samples == "^(SRR\\d+)_"
+
+        args = get_args(["tests/data/SRR1067505_1_fastqc.zip", "--sample-sheet", str(sample_sheet)])
+        assert (args.merge_samples, args.sample_sheet) == (ILLUMINA_PATTERN, str(sample_sheet))
+
+
+    @pytest.mark.parametrize("test_argv", [
+        ["tests/data/SRR1067505_1_fastqc.zip", "--merge-samples", "_(L"],
+        ["--watch", "tests/data", "--merge-samples"],
+    ])
+    def test_fail_invalid_merge_samples(self, test_argv) -> None:
+        with pytest.raises(SystemExit):
+            get_args(test_argv)
+
+
+    def test_fail_sample_sheet_does_not_exist(self) -> None:
+        with pytest.raises(FileNotFoundError, match="Sample sheet 'samples.csv' could not be found."):
+            get_args(["tests/data/SRR1067505_1_fastqc.zip", "--sample-sheet", "samples.csv"])
+
+
+    def test_gate(self, tmp_path) -> None:
+        rules_file = tmp_path / "rules.json"
+        rules_file.write_text("[]")
+
+        args = get_args(["tests/data/SRR1067505_1_fastqc.zip", "--gate", str(rules_file), "--fail-fast"])
+
+        assert (args.gate, args.fail_fast) == (str(rules_file), True)
+
+
+    def test_fail_fail_fast_without_gate(self) -> None:
+        with pytest.raises(SystemExit):
+            get_args(["tests/data/SRR1067505_1_fastqc.zip", "--fail-fast"])
+
+
+    def test_fail_gate_does_not_exist(self) -> None:
+        with pytest.raises(FileNotFoundError, match="Rules file 'rules.json' could not be found."):
+            get_args(["tests/data/SRR1067505_1_fastqc.zip", "--gate", "rules.json"])
+
+
+    def test_statuses(self) -> None:
+        assert not get_args(["tests/data/SRR1067505_1_fastqc.zip"]).statuses
+        assert get_args(["tests/data/SRR1067505_1_fastqc.zip", "--statuses"]).statuses
+
+
+    @pytest.mark.parametrize("option", [["--report", "report.json"], ["--export-dir", "tables"], ["--timings", "-"]])
+    def test_fail_statuses_with_summary_options(self, option) -> None:
+        with pytest.raises(SystemExit):
+            get_args(["tests/data/SRR1067505_1_fastqc.zip", "--statuses", *option])
+
+
+    def test_max_module_rows(self) -> None:
+        assert get_args(["tests/data/SRR1067505_1_fastqc.zip"]).max_rows is None
+        assert get_args(["tests/data/SRR1067505_1_fastqc.zip", "--max-module-rows", "1000"]).max_rows == 1000
+        with pytest.raises(SystemExit):
+            get_args(["tests/data/SRR1067505_1_fastqc.zip", "--max-module-rows", "-1"])
+
+
+    def test_fail_negative_workers(self) -> None:
+        with pytest.raises(SystemExit):
+            get_args(["tests/data/SRR1067505_1_fastqc.zip", "-j", "-1"])
+
+
+class TestCLIFormat:
+    """Test behavior of output format arguments."""
+
+    @pytest.mark.parametrize("test_argv, expected_format", [
+        (["tests/data/SRR1067505_1_fastqc.zip"], "json"),
+        (["tests/data/SRR1067505_1_fastqc.zip", "tests/data/empty_fastqc.zip"], "ndjson"),
+        (["tests/data/SRR1067505_1_fastqc.zip", "-f", "tsv"], "tsv"),
+        (["tests/data/SRR1067505_1_fastqc.zip", "tests/data/empty_fastqc.zip", "--format", "csv"], "csv"),
+    ])
+    def test_succeeds_format(self, test_argv, expected_format) -> None:
+        args = get_args(test_argv)
+
+        assert args.output_format == expected_format
+
+
+    def test_fail_json_format_in_batch_mode(self) -> None:
+        with pytest.raises(SystemExit):
+            get_args(["tests/data/SRR1067505_1_fastqc.zip", "tests/data/empty_fastqc.zip", "-f", "json"])
+
+
+    def test_unordered_disables_ordering(self) -> None:
+        assert get_args(["tests/data/SRR1067505_1_fastqc.zip"]).ordered
+        assert not get_args(["tests/data/SRR1067505_1_fastqc.zip", "--unordered"]).ordered
+
+
+class TestCLISummaries:
+    """Test behavior of summary selection arguments."""
+
+    @pytest.mark.parametrize("test_argv, expected_summary_names", [
+        ([], ["read_count", "base_count"]),
+        (["-s", "base_count"], ["base_count"]),
+        (["--summaries", "base_count, read_count"], ["base_count", "read_count"]),
+    ])
+    def test_succeeds_summaries(self, test_argv, expected_summary_names) -> None:
+        args = get_args(["tests/data/SRR1067505_1_fastqc.zip", *test_argv])
+
+        assert args.summary_names == expected_summary_names
+
+
+    def test_all_summaries(self) -> None:
+        from fastqc_summary.summaries import SUMMARIES
+
+        assert get_args(["tests/data/SRR1067505_1_fastqc.zip", "-s", "all"]).summary_names == list(SUMMARIES)
+
+
+    def test_fail_unknown_summary(self) -> None:
+        with pytest.raises(SystemExit):
+            get_args(["tests/data/SRR1067505_1_fastqc.zip", "-s", "read_count,gc"])
+
+
+class TestCLICache:
+    """Test behavior of cache arguments."""
+
+    def test_cache_disabled_by_default(self, monkeypatch) -> None:
+        monkeypatch.delenv("FASTQC_SUMMARY_CACHE_DIR", raising=False)
+
+        args = get_args(["tests/data/SRR1067505_1_fastqc.zip"])
+
+        assert args.cache_dir is None
+        assert not args.refresh
+
+
+    def test_cache_dir_from_environment(self, monkeypatch) -> None:
+        monkeypatch.setenv("FASTQC_SUMMARY_CACHE_DIR", "cache")
+
+        args = get_args(["tests/data/SRR1067505_1_fastqc.zip", "--refresh"])
+
+        assert args.cache_dir == "cache"
+        assert args.refresh
+
+
+    def test_no_cache_disables_cache(self) -> None:
+        args = get_args(["tests/data/SRR1067505_1_fastqc.zip", "--cache-dir", "cache", "--no-cache"])
+
+        assert args.cache_dir is None
+
+
+    def test_fail_invalid_cache_size(self) -> None:
+        with pytest.raises(SystemExit):
+            get_args(["tests/data/SRR1067505_1_fastqc.zip", "--cache-size", "0"])
+
+
 class TestCLIOutput:
     """Test behavior of optional output argument."""
 
@@ -91,9 +362,10 @@ class TestCLIOutput:
         args = get_args(test_argv)
 
         # check assumptions about FastQC archive file
-        assert args.fastqc_archive == str(fastqc_archive)
-        assert Path(args.fastqc_archive).exists()
-        assert zipfile.is_zipfile(args.fastqc_archive)
+        assert args.fastqc_archives == [str(fastqc_archive)]
+        assert Path(args.fastqc_archives[0]).exists()
+        assert zipfile.is_zipfile(args.fastqc_archives[0])
+        assert not args.batch
         # check assumptions about output path
         assert args.output == str(output_path)
 
@@ -113,9 +385,10 @@ class TestCLIOutput:
         args = get_args(test_argv)
 
         # check assumptions about FastQC archive file
-        assert args.fastqc_archive == str(fastqc_archive)
-        assert Path(args.fastqc_archive).exists()
-        assert zipfile.is_zipfile(args.fastqc_archive)
+        assert args.fastqc_archives == [str(fastqc_archive)]
+        assert Path(args.fastqc_archives[0]).exists()
+        assert zipfile.is_zipfile(args.fastqc_archives[0])
+        assert not args.batch
         # check assumptions about output path
         assert args.output == sys.stdout
 
@@ -135,9 +408,10 @@ class TestCLIOutput:
         args = get_args(test_argv)
 
         # check assumptions about FastQC archive file
-        assert args.fastqc_archive == str(fastqc_archive)
-        assert Path(args.fastqc_archive).exists()
-        assert zipfile.is_zipfile(args.fastqc_archive)
+        assert args.fastqc_archives == [str(fastqc_archive)]
+        assert Path(args.fastqc_archives[0]).exists()
+        assert zipfile.is_zipfile(args.fastqc_archives[0])
+        assert not args.batch
         # check assumptions about output path
         assert args.output == sys.stdout
 
@@ -155,8 +429,40 @@ class TestCLIOutput:
         args = get_args(test_argv)
 
         # check assumptions about FastQC archive file
-        assert args.fastqc_archive == str(fastqc_archive)
-        assert Path(args.fastqc_archive).exists()
-        assert zipfile.is_zipfile(args.fastqc_archive)
+        assert args.fastqc_archives == [str(fastqc_archive)]
+        assert Path(args.fastqc_archives[0]).exists()
+        assert zipfile.is_zipfile(args.fastqc_archives[0])
+        assert not args.batch
         # check assumptions about output path
         assert args.output == sys.stdout
+
+
+class TestCLIServe:
+    """Test behavior of serve subcommand arguments."""
+
+    def test_serve_defaults(self) -> None:
+        args = get_serve_args([])
+
+        assert (args.host, args.port, args.socket_path, args.root) == ("127.0.0.1", 8000, None, ".")
+        assert (args.workers, args.executor, args.lru_size) == (1, "process", 1024)
+
+
+    def test_serve_socket_and_workers(self, tmp_path) -> None:
+        args = get_serve_args(["--socket", str(tmp_path / "summary.sock"), "--root", str(tmp_path), "-j", "0"])
+
+        assert args.socket_path == str(tmp_path / "summary.sock")
+        assert args.workers >= 1
+
+
+    @pytest.mark.parametrize("test_argv", [
+        (["--lru-size", "0"]),
+        (["-j", "-1"]),
+    ])
+    def test_fail_invalid_serve_args(self, test_argv) -> None:
+        with pytest.raises(SystemExit):
+            get_serve_args(test_argv)
+
+
+    def test_fail_root_does_not_exist(self) -> None:
+        with pytest.raises(FileNotFoundError, match="Root directory 'missing' could not be found."):
+            get_serve_args(["--root", "missing"])
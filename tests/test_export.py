@@ -0,0 +1,106 @@
+import csv
+import gzip
+
+import pytest
+
+from fastqc_summary.batch import summarize_many
+from fastqc_summary.export import (
+    module_slug,
+    module_table,
+    ModuleExporter,
+)
+from fastqc_summary.parser import Module
+
+
+@pytest.fixture
+def overrepresented_sequences() -> Module:
+    """Overrepresented sequences module with a non-numeric column."""
+
+    return Module(
+        name="Overrepresented sequences",
+        status="warn",
+        columns=["Sequence", "Count", "Percentage", "Possible Source"],
+        data=[
+            "GATCGGAAGAGCACACGTCTGAACTCCAGTCAC\t120\t0.24\tTruSeq Adapter",
+            "AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA\t80\t0.16\tNo Hit",
+        ],
+    )
+
+
+class TestModuleTable:
+    """Test module_table()."""
+
+    def test_module_table_melts_columns(self, overrepresented_sequences) -> None:
+        table = module_table(overrepresented_sequences)
+
+        assert table["Sequence"] == [
+            "GATCGGAAGAGCACACGTCTGAACTCCAGTCAC",
+            "AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA",
+        ] * 3
+        assert table["variable"] == ["Count", "Count", "Percentage", "Percentage", "Possible Source", "Possible Source"]
+        assert table["value"] == [120.0, 80.0, 0.24, 0.16, None, None]
+
+
+    def test_module_table_empty_module(self) -> None:
+        module = Module(name="Overrepresented sequences", status="pass", columns=[], data=[])
+
+        assert module_table(module) == {"": [], "variable": [], "value": []}
+
+
+class TestModuleSlug:
+    """Test module_slug()."""
+
+    @pytest.mark.parametrize("name, expected_slug", [
+        ("Adapter Content", "adapter_content"),
+        ("Per base N content", "per_base_n_content"),
+    ])
+    def test_module_slug(self, name, expected_slug) -> None:
+        assert module_slug(name) == expected_slug
+
+
+class TestModuleExporter:
+    """Test ModuleExporter."""
+
+    def test_exports_tsv_tables_from_many_archives(self, tmp_path) -> None:
+        fastqc_archives = ["tests/data/SRR1067505_1_fastqc.zip", "tests/data/empty_fastqc.zip"]
+
+        with ModuleExporter(tmp_path, ["Per base sequence quality"], "tsv") as exporter:
+            list(summarize_many(fastqc_archives, exporter=exporter))
+
+        with gzip.open(tmp_path / "per_base_sequence_quality.tsv.gz", "rt") as table_file:
+            rows = list(csv.DictReader(table_file, delimiter="\t"))
+
+        assert list(rows[0]) == ["sample", "Base", "variable", "value"]
+        assert {row["sample"] for row in rows} == {"SRR1067505_1"}
+        assert {row["variable"] for row in rows} >= {"Mean", "Median"}
+
+
+    def test_exports_parquet_tables(self, tmp_path) -> None:
+        pq = pytest.importorskip("pyarrow.parquet")
+
+        with ModuleExporter(tmp_path, ["Adapter Content"], "parquet") as exporter:
+            list(summarize_many(["tests/data/SRR1067505_1_fastqc.zip"], exporter=exporter))
+
+        table = pq.read_table(tmp_path / "adapter_content.parquet")
+        assert table.column_names == ["sample", "Position", "variable", "value"]
+
+
+    def test_exports_parquet_row_groups_of_many_archives(self, tmp_path) -> None:
+        pq = pytest.importorskip("pyarrow.parquet")
+        fastqc_archives = ["tests/data/SRR1067505_1_fastqc.zip"] * 5
+        with ModuleExporter(tmp_path, ["Adapter Content"], "parquet") as exporter:
+            list(summarize_many(fastqc_archives, exporter=exporter))
+        rows = pq.read_table(tmp_path / "adapter_content.parquet").num_rows
+
+        # rows are buffered across FastQC archives, and the rest is written on close
+        with ModuleExporter(tmp_path / "groups", ["Adapter Content"], "parquet", row_group_size=rows * 2 // 5) as exporter:
+            list(summarize_many(fastqc_archives, exporter=exporter))
+
+        metadata = pq.ParquetFile(tmp_path / "groups" / "adapter_content.parquet").metadata
+        assert metadata.num_rows == rows
+        assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [rows * 2 // 5] * 2 + [rows // 5]
+
+
+    def test_fails_invalid_export_format(self, tmp_path) -> None:
+        with pytest.raises(ValueError, match="Export format must be one of"):
+            ModuleExporter(tmp_path, export_format="xlsx")
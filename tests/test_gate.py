@@ -0,0 +1,199 @@
+import io
+import json
+import sys
+
+import pytest
+
+from fastqc_summary import gate
+from fastqc_summary.gate import (
+    evaluate_archive,
+    GateEvaluation,
+    GateTally,
+    load_gate,
+    make_gate,
+)
+from fastqc_summary.parser import Module, parse_modules
+
+
+@pytest.fixture
+def rules() -> list[dict]:
+    return [
+        {"summary": "read_count", "op": ">=", "value": 1000},
+        {"module": "Adapter Content", "op": "<=", "value": "warn"},
+        {"summary": "mean_quality", "op": ">=", "value": 30, "fatal": False, "name": "mean quality"},
+    ]
+
+
+class TestMakeGate:
+    """Test make_gate() and load_gate()."""
+
+    def test_make_gate_names_rules(self, rules) -> None:
+        gate = make_gate(rules)
+
+        assert [rule.name for rule in gate.rules] == ["read_count >= 1000", "Adapter Content status <= warn", "mean quality"]
+        assert [rule.fatal for rule in gate.rules] == [True, True, False]
+        assert gate.summary_names == ("read_count", "mean_quality")
+        assert gate.modules == {"Basic Statistics", "Adapter Content", "Per base sequence quality"}
+
+
+    @pytest.mark.parametrize("rule, message", [
+        ({"op": ">=", "value": 1}, "either a 'summary' or a 'module' key"),
+        ({"summary": "read_count", "module": "Adapter Content", "op": ">=", "value": 1}, "either a 'summary' or a 'module' key"),
+        ({"summary": "read_count", "op": "=>", "value": 1}, "Rule operator must be one of"),
+        ({"summary": "read_count", "op": ">="}, "Rule must have a 'value'"),
+        ({"summary": "gc", "op": ">=", "value": 1}, "Rule summary must be one of"),
+        ({"summary": "read_count", "op": ">=", "value": "1"}, "must be a number"),
+        ({"module": "Adapter Content", "op": "!=", "value": "failed"}, "must be one of \\['pass', 'warn', 'fail'\\]"),
+        ({"summary": "read_count", "op": ">=", "value": 1, "severity": "high"}, "unknown keys \\['severity'\\]"),
+    ])
+    def test_make_gate_fails_invalid_rule(self, rule, message) -> None:
+        with pytest.raises(ValueError, match=message):
+            make_gate([rule])
+
+
+    def test_make_gate_fails_duplicate_names(self) -> None:
+        with pytest.raises(ValueError, match="Rule names must be unique"):
+            make_gate([{"summary": "read_count", "op": ">=", "value": 1}] * 2)
+
+
+    @pytest.mark.parametrize("wrap", [True, False])
+    def test_load_gate_json(self, tmp_path, rules, wrap) -> None:
+        rules_file = tmp_path / "rules.json"
+        rules_file.write_text(json.dumps({"rules": rules} if wrap else rules))
+
+        gate = load_gate(rules_file, fail_fast=True)
+
+        assert gate == make_gate(rules, fail_fast=True)
+
+
+    def test_load_gate_yaml(self, tmp_path) -> None:
+        pytest.importorskip("yaml")
+        rules_file = tmp_path / "rules.yaml"
+        rules_file.write_text("rules:\n  - summary: read_count\n    op: '>='\n    value: 1000\n")
+
+        assert load_gate(rules_file) == make_gate([{"summary": "read_count", "op": ">=", "value": 1000}])
+
+
+    def test_load_gate_yaml_requires_pyyaml(self, tmp_path, monkeypatch) -> None:
+        rules_file = tmp_path / "rules.yml"
+        rules_file.write_text("- summary: read_count\n")
+        monkeypatch.setitem(sys.modules, "yaml", None)
+
+        with pytest.raises(ImportError, match="YAML rules files require PyYAML"):
+            load_gate(rules_file)
+
+
+    @pytest.mark.parametrize("content, message", [
+        ("{", "is not valid JSON"),
+        ('{"rules": []}', "must hold a non-empty list of rules"),
+    ])
+    def test_load_gate_fails_invalid_file(self, tmp_path, content, message) -> None:
+        rules_file = tmp_path / "rules.json"
+        rules_file.write_text(content)
+
+        with pytest.raises(ValueError, match=message):
+            load_gate(rules_file)
+
+
+    def test_load_gate_fails_file_does_not_exist(self) -> None:
+        with pytest.raises(FileNotFoundError, match="Rules file 'rules.json' could not be found."):
+            load_gate("rules.json")
+
+
+class TestGateEvaluation:
+    """Test GateEvaluation and evaluate_archive()."""
+
+    def test_evaluate_archive_passes(self, rules) -> None:
+        gate = make_gate(rules)
+        modules = parse_modules("tests/data/SRR1067505_1_fastqc.zip", wanted=gate.modules)
+
+        assert evaluate_archive(gate, modules, ["read_count"]) == {
+            "read_count": 18361776,
+            "qc_gate": "pass",
+            "qc:read_count >= 1000": "pass",
+            "qc:Adapter Content status <= warn": "pass",
+            "qc:mean quality": "pass",
+        }
+
+
+    def test_evaluate_archive_fails_missing_modules(self, rules) -> None:
+        gate = make_gate(rules[1:])
+        modules = parse_modules("tests/data/empty_fastqc.zip", wanted=gate.modules | {"Basic Statistics"})
+
+        # the empty FASTQ file has no quality modules, so the non-fatal rule on mean quality fails
+        assert evaluate_archive(gate, modules, ["read_count"]) == {
+            "read_count": 0,
+            "qc_gate": "warn",
+            "qc:Adapter Content status <= warn": "pass",
+            "qc:mean quality": "fail",
+        }
+
+
+    def test_evaluate_archive_fails_rule_on_summary_missing_module(self, rules) -> None:
+        gate = make_gate(rules[:1])
+        fastqc_data = b"##FastQC\t0.12.1\n>>Per sequence GC content\tpass\n#GC Content\tCount\n50\t10.0\n>>END_MODULE\n"
+
+        # read counts are not optional, yet their missing module fails the rule rather than raising
+        summaries = evaluate_archive(gate, parse_modules(io.BytesIO(fastqc_data), wanted=gate.modules | {"Per sequence GC content"}), ["mean_gc"])
+
+        assert summaries == {"mean_gc": 50.0, "qc_gate": "fail", "qc:read_count >= 1000": "fail"}
+
+
+    def test_summaries_reuse_summaries_of_rules(self, rules, monkeypatch) -> None:
+        evaluation = GateEvaluation(make_gate(rules[:1]))
+        for module in parse_modules("tests/data/SRR1067505_1_fastqc.zip", wanted={"Basic Statistics"}):
+            evaluation.add(module)
+
+        # the read count computed to decide the rule is not computed again
+        monkeypatch.setattr(gate, "compute_summaries", lambda *args, **kwargs: {})
+
+        assert evaluation.summaries(["read_count"])["read_count"] == 18361776
+
+
+    def test_evaluate_archive_fail_fast_stops_parsing(self, rules) -> None:
+        gate = make_gate(rules, fail_fast=True)
+        pulled = []
+
+        def modules():
+            for module in parse_modules("tests/data/empty_fastqc.zip", wanted=gate.modules | {"Sequence Length Distribution"}):
+                pulled.append(module.name)
+                yield module
+
+        summaries = evaluate_archive(gate, modules(), ["read_count", "base_count"])
+
+        assert pulled == ["Basic Statistics"]
+        assert summaries == {
+            "read_count": 0,
+            "base_count": None,
+            "qc_gate": "fail",
+            "qc:read_count >= 1000": "fail",
+            "qc:Adapter Content status <= warn": "skipped",
+            "qc:mean quality": "skipped",
+        }
+
+
+    @pytest.mark.parametrize("op, value, status, expected", [
+        ("!=", "fail", "warn", True),
+        ("!=", "fail", "fail", False),
+        ("<", "warn", "pass", True),
+        ("<", "warn", "warn", False),
+        ("==", "pass", "pass", True),
+    ])
+    def test_status_rules_order_statuses(self, op, value, status, expected) -> None:
+        evaluation = GateEvaluation(make_gate([{"module": "Adapter Content", "op": op, "value": value}]))
+
+        evaluation.add(Module("Adapter Content", status, [], []))
+
+        assert evaluation.outcomes == {f"Adapter Content status {op} {value}": "pass" if expected else "fail"}
+
+
+class TestGateTally:
+    """Test GateTally."""
+
+    def test_tallies_verdicts(self) -> None:
+        tally = GateTally()
+        results = [("a", {"qc_gate": "pass"}), ("b", {"qc_gate": "fail"}), ("c", {"qc_gate": "warn"}), ("d", {})]
+
+        assert list(tally.fold(results)) == results
+        assert tally.counts == {"pass": 1, "warn": 1, "fail": 1}
+        assert tally.failed == ["b"]
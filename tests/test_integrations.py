@@ -12,8 +12,13 @@ Typical usage examples:
 """
 
 import json
+import pstats
+import shutil
 import subprocess
+import sys
+import tarfile
 from unittest.mock import patch
+import zipfile
 
 import pytest
 
@@ -38,6 +43,62 @@ class TestIntegrationCLI:
         assert result.stderr.startswith("usage: fastqc-summary")
 
 
+    def test_single_archive_skips_full_cli_imports(self) -> None:
+        code = (
+            "import sys\n"
+            "from fastqc_summary import main\n"
+            "sys.argv = ['fastqc-summary', 'tests/data/SRR1067505_1_fastqc.zip']\n"
+            "main()\n"
+            "print()\n"
+            "print([m for m in ['argparse', 'concurrent.futures', 'sqlite3', 'csv', 'dataclasses', 'inspect'] if m in sys.modules])\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        summaries, imported = result.stdout.splitlines()
+        assert json.loads(summaries) == {"read_count": 18361776, "base_count": 661023936}
+        assert imported == "[]"
+
+
+    def test_single_archive_reads_cache_without_full_cli(self, tmp_path) -> None:
+        code = (
+            "import sys\n"
+            "from fastqc_summary import main\n"
+            "sys.argv = ['fastqc-summary', 'tests/data/SRR1067505_1_fastqc.zip']\n"
+            "main()\n"
+            "print()\n"
+            "print('argparse' in sys.modules)\n"
+        )
+        environment = {"FASTQC_SUMMARY_CACHE_DIR": str(tmp_path / "cache")}
+
+        for _ in range(2):
+            result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=environment)
+            summaries, imported = result.stdout.splitlines()
+            assert json.loads(summaries) == {"read_count": 18361776, "base_count": 661023936}
+            assert imported == "False"
+
+        from fastqc_summary.cache import SummaryCache
+
+        with SummaryCache(tmp_path / "cache") as cache:
+            assert len(cache) == 1
+
+
+    def test_help_skips_summarizer_imports(self) -> None:
+        code = (
+            "import sys\n"
+            "from fastqc_summary import main\n"
+            "sys.argv = ['fastqc-summary', '--help']\n"
+            "try:\n"
+            "    main()\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "heavy = ['parser', 'summaries', 'batch', 'bundle', 'cache', 'export', 'watch', 'timings', 'aggregate', 'writers']\n"
+            "print([m for m in [*(f'fastqc_summary.{m}' for m in heavy), 'zipfile', 'csv'] if m in sys.modules])\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        assert result.stdout.splitlines()[-1] == "[]"
+
+
 class TestIntegrationMain:
     """Integration testing at main function level.
 
@@ -193,3 +254,218 @@ class TestIntegrationMain:
             # check output file expected summaries directed to stdout
             actual_summary_output = json.loads(captured.out)
             assert actual_summary_output == expected_summary_output
+
+
+    def test_succeeds_batch_outputs_json_lines(self, capsys) -> None:
+        test_argv = ["fastqc-summary", "tests/data/SRR1067505_1_fastqc.zip", "tests/data/empty_fastqc.zip", "-j", "2"]
+        expected_summary_output = [
+            {"sample": "SRR1067505_1", "read_count": 18361776, "base_count": 661023936},
+            {"sample": "empty", "read_count": 0, "base_count": 0},
+        ]
+
+        # mock args for testing main
+        with patch("sys.argv", test_argv):
+            main()
+            captured = capsys.readouterr()
+
+            # check one JSON object per line keyed by sample
+            actual_summary_output = [json.loads(line) for line in captured.out.splitlines()]
+            assert actual_summary_output == expected_summary_output
+
+
+    def test_succeeds_batch_outputs_tsv(self, tmp_path) -> None:
+        output_path = tmp_path / "summaries.tsv"
+        test_argv = [
+            "fastqc-summary", "tests/data/SRR1067505_1_fastqc.zip", "tests/data/empty_fastqc.zip",
+            "--format", "tsv", "-o", str(output_path),
+        ]
+
+        # mock args for testing main
+        with patch("sys.argv", test_argv):
+            main()
+
+            assert output_path.read_text().splitlines() == [
+                "sample\tread_count\tbase_count",
+                "SRR1067505_1\t18361776\t661023936",
+                "empty\t0\t0",
+            ]
+
+
+    def test_succeeds_bundle(self, capsys, tmp_path) -> None:
+        bundle = tmp_path / "run.tar.gz"
+        with tarfile.open(bundle, "w:gz") as tar:
+            tar.add("tests/data/SRR1067505_1_fastqc.zip", "run/SRR1067505_1_fastqc.zip")
+            tar.add("tests/data/empty_fastqc.zip", "run/empty_fastqc.zip")
+        test_argv = ["fastqc-summary", str(bundle)]
+
+        # mock args for testing main
+        with patch("sys.argv", test_argv):
+            main()
+            captured = capsys.readouterr()
+
+            # a bundle is summarized in batch mode, one record per FastQC archive
+            assert [json.loads(line) for line in captured.out.splitlines()] == [
+                {"sample": "SRR1067505_1", "read_count": 18361776, "base_count": 661023936},
+                {"sample": "empty", "read_count": 0, "base_count": 0},
+            ]
+
+
+    def test_succeeds_merge_samples(self, capsys, tmp_path) -> None:
+        for lane in ("L001", "L002"):
+            for mate in ("R1", "R2"):
+                shutil.copy("tests/data/SRR1067505_1_fastqc.zip", tmp_path / f"S1_S1_{lane}_{mate}_001_fastqc.zip")
+        shutil.copy("tests/data/empty_fastqc.zip", tmp_path / "S2_S2_L001_R1_001_fastqc.zip")
+        test_argv = ["fastqc-summary", str(tmp_path / "*_fastqc.zip"), "--merge-samples", "-s", "base_count,mean_quality", "-j", "2"]
+
+        # mock args for testing main
+        with patch("sys.argv", test_argv):
+            main()
+            captured = capsys.readouterr()
+
+            # read counts only weight the merged means and are left out of the records
+            assert [json.loads(line) for line in captured.out.splitlines()] == [
+                {"sample": "S1", "base_count": 4 * 661023936, "mean_quality": pytest.approx(31.73495407585362), "archives": 4},
+                {"sample": "S2", "base_count": 0, "mean_quality": None, "archives": 1},
+            ]
+
+
+    def test_succeeds_statuses(self, capsys) -> None:
+        test_argv = ["fastqc-summary", "tests/data/empty_fastqc.zip", "tests/data/SRR1067505_1_fastqc.zip", "--statuses", "-f", "tsv"]
+
+        # mock args for testing main
+        with patch("sys.argv", test_argv):
+            main()
+            captured = capsys.readouterr()
+
+            # columns are every FastQC module, so modules missing from the first FastQC archive are kept for later ones
+            lines = [line.split("\t") for line in captured.out.splitlines()]
+            assert lines[0][:4] == ["sample", "Basic Statistics", "Per base sequence quality", "Per tile sequence quality"]
+            assert lines[1][:4] == ["empty", "pass", "", ""]
+            assert lines[2][:4] == ["SRR1067505_1", "pass", "pass", "fail"]
+            assert lines[2][-2:] == ["fail", ""]
+
+
+    def test_statuses_collect_other_modules(self, capsys, tmp_path) -> None:
+        # FastQC 0.10 reports a per base GC content module that later versions dropped
+        old_archive = tmp_path / "old_fastqc.zip"
+        with zipfile.ZipFile(old_archive, "w") as archive:
+            archive.writestr("old_fastqc/fastqc_data.txt", "##FastQC\t0.10.1\n")
+            archive.writestr("old_fastqc/summary.txt", "PASS\tBasic Statistics\told.fastq\nWARN\tPer base GC content\told.fastq\n")
+        test_argv = ["fastqc-summary", "tests/data/empty_fastqc.zip", str(old_archive), "--statuses", "-f", "csv"]
+
+        # mock args for testing main
+        with patch("sys.argv", test_argv):
+            main()
+            captured = capsys.readouterr()
+
+            lines = captured.out.splitlines()
+            assert lines[0].endswith(",Kmer Content,other")
+            assert lines[2] == "old,pass" + "," * 11 + ",Per base GC content=warn"
+
+
+    def test_unreadable_archive_exits_after_other_records(self, capsys, tmp_path) -> None:
+        bad_archive = tmp_path / "bad_fastqc.zip"
+        with zipfile.ZipFile(bad_archive, "w") as archive:
+            archive.writestr("bad_fastqc/notes.txt", "no FastQC data")
+        test_argv = ["fastqc-summary", str(bad_archive), "tests/data/empty_fastqc.zip", "-j", "2"]
+
+        # mock args for testing main
+        with patch("sys.argv", test_argv), pytest.raises(SystemExit) as exit_info:
+            main()
+
+        captured = capsys.readouterr()
+        assert exit_info.value.code == 1
+        assert [json.loads(line) for line in captured.out.splitlines()] == [{"sample": "empty", "read_count": 0, "base_count": 0}]
+        assert f"Could not summarize '{bad_archive}': fastqc_data.txt not found in archive" in captured.err
+        assert f"1 FastQC archives could not be summarized: {bad_archive}" in captured.err
+
+
+    def test_gate_exits_with_failed_samples(self, capsys, tmp_path) -> None:
+        rules_file = tmp_path / "rules.json"
+        rules_file.write_text(json.dumps([{"summary": "read_count", "op": ">=", "value": 1000, "name": "reads"}]))
+        test_argv = [
+            "fastqc-summary", "tests/data/SRR1067505_1_fastqc.zip", "tests/data/empty_fastqc.zip",
+            "--gate", str(rules_file), "--fail-fast", "-s", "read_count",
+        ]
+
+        # mock args for testing main
+        with patch("sys.argv", test_argv), pytest.raises(SystemExit) as exit_info:
+            main()
+
+        # every record is written before exiting
+        captured = capsys.readouterr()
+        assert exit_info.value.code == 1
+        assert [json.loads(line) for line in captured.out.splitlines()] == [
+            {"sample": "SRR1067505_1", "read_count": 18361776, "qc_gate": "pass", "qc:reads": "pass"},
+            {"sample": "empty", "read_count": 0, "qc_gate": "fail", "qc:reads": "fail"},
+        ]
+        assert "1 of 2 samples failed the QC gate: empty" in captured.err
+
+
+    def test_succeeds_watch_appends_new_records(self, tmp_path) -> None:
+        watch_dir = tmp_path / "run"
+        watch_dir.mkdir()
+        shutil.copy("tests/data/SRR1067505_1_fastqc.zip", watch_dir)
+        output_path = tmp_path / "summaries.ndjson"
+        test_argv = ["fastqc-summary", "--watch", str(watch_dir), "-o", str(output_path)]
+
+        # mock args for testing main
+        with patch("sys.argv", test_argv):
+            main()
+            shutil.copy("tests/data/empty_fastqc.zip", watch_dir)
+            main()
+            main()
+
+            actual_summary_output = [json.loads(line) for line in output_path.read_text().splitlines()]
+            assert actual_summary_output == [
+                {"sample": "SRR1067505_1", "read_count": 18361776, "base_count": 661023936},
+                {"sample": "empty", "read_count": 0, "base_count": 0},
+            ]
+            assert (watch_dir / ".fastqc-summary-state.ndjson").exists()
+
+
+    def test_succeeds_cohort_report(self, tmp_path) -> None:
+        report_path = tmp_path / "report.json"
+        test_argv = [
+            "fastqc-summary", "tests/data/SRR1067505_1_fastqc.zip", "tests/data/empty_fastqc.zip",
+            "-o", str(tmp_path / "summaries.ndjson"), "--report", str(report_path), "--group-by", "^SRR",
+        ]
+
+        # mock args for testing main
+        with patch("sys.argv", test_argv):
+            main()
+
+            report = json.loads(report_path.read_text())
+            assert report["cohort"]["samples"] == 2
+            assert report["cohort"]["summaries"]["read_count"]["sum"] == 18361776
+            assert report["cohort"]["summaries"]["base_count"]["max"] == 661023936
+            assert report["groups"]["SRR"]["summaries"]["read_count"]["count"] == 1
+            assert report["groups"]["ungrouped"]["summaries"]["read_count"]["sum"] == 0
+
+
+    def test_succeeds_timings_and_profile(self, tmp_path) -> None:
+        timings_path = tmp_path / "timings.json"
+        profile_path = tmp_path / "run.prof"
+        test_argv = [
+            "fastqc-summary", "tests/data/SRR1067505_1_fastqc.zip", "tests/data/empty_fastqc.zip",
+            "-o", str(tmp_path / "summaries.ndjson"), "--timings", str(timings_path), "--profile", str(profile_path),
+        ]
+
+        # mock args for testing main
+        with patch("sys.argv", test_argv):
+            main()
+
+            timings = json.loads(timings_path.read_text())
+            assert [archive["sample"] for archive in timings["archives"]] == ["SRR1067505_1", "empty"]
+            assert timings["totals"]["wall_seconds"]["write"] > 0
+            assert pstats.Stats(str(profile_path)).total_calls > 0
+
+
+    def test_fails_not_fastqc_archive(self, tmp_path) -> None:
+        not_fastqc_archive = tmp_path / "notes.txt"
+        not_fastqc_archive.write_text("not FastQC data")
+
+        # mock args for testing main
+        with patch("sys.argv", ["fastqc-summary", str(not_fastqc_archive)]):
+            with pytest.raises(zipfile.BadZipFile, match="FastQC archive file '.*' is not a valid ZIP file"):
+                main()
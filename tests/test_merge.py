@@ -0,0 +1,165 @@
+import pytest
+
+from fastqc_summary.merge import (
+    archive_name,
+    merge_summaries,
+    read_sample_sheet,
+    SampleGrouper,
+    SampleMerger,
+)
+
+
+class TestSampleGrouper:
+    """Test SampleGrouper and read_sample_sheet()."""
+
+    @pytest.mark.parametrize("name, expected_sample", [
+        ("Sample1_S1_L001_R1_001", "Sample1"),
+        ("qc/Sample1_S1_L004_R2_001_fastqc.zip", "Sample1"),
+        ("Sample_A_L002_R1", "Sample_A"),
+        ("Sample1_R2_001.fastq.gz", "Sample1"),
+        ("SRR1067505_1", "SRR1067505_1"),
+        ("empty", "empty"),
+    ])
+    def test_sample_from_illumina_naming(self, name, expected_sample) -> None:
+        assert SampleGrouper().sample(name) == expected_sample
+
+
+    def test_sample_from_pattern(self) -> None:
+        grouper = SampleGrouper(r"^(SRR\d+)_[12]$")
+
+        assert grouper.sample("SRR1067505_1") == "SRR1067505"
+        assert grouper.sample("other_1") == "other_1"
+        assert grouper.expected(["SRR1_1_fastqc.zip", "SRR1_2_fastqc.zip", "SRR2_1_fastqc.zip"]) == {"SRR1": 2, "SRR2": 1}
+
+
+    def test_archive_name_strips_fastq_suffixes(self) -> None:
+        assert archive_name("reads/Sample1_S1_L001_R1_001.fastq.gz") == "Sample1_S1_L001_R1_001"
+        assert archive_name("Sample1_S1_L001_R1_001_fastqc.zip") == "Sample1_S1_L001_R1_001"
+
+
+    def test_sample_sheet_of_files(self, tmp_path) -> None:
+        sample_sheet = tmp_path / "samples.tsv"
+        sample_sheet.write_text("file\tsample\nrun1/a_R1.fastq.gz\tpatient1\nb_fastqc.zip\tpatient1\n")
+
+        grouper = SampleGrouper(sample_sheet=read_sample_sheet(sample_sheet))
+
+        assert grouper.sample("a_R1") == "patient1"
+        assert grouper.sample("b") == "patient1"
+        assert grouper.sample("c_R1") == "c"
+
+
+    def test_illumina_sample_sheet(self, tmp_path) -> None:
+        sample_sheet = tmp_path / "SampleSheet.csv"
+        sample_sheet.write_text(
+            "[Header]\nFileFormatVersion,2\n\n"
+            "[BCLConvert_Data]\nLane,Sample_ID,Sample_Name,index\n1,S-001,Tumor,ACGT\n2,S-002,,TTTT\n\n"
+            "[Cloud_Data]\nSample_ID,ProjectName\nS-001,P1\n"
+        )
+
+        grouper = SampleGrouper(sample_sheet=read_sample_sheet(sample_sheet))
+
+        assert grouper.sample("Tumor_S1_L001_R1_001") == "S-001"
+        assert grouper.sample("S-002_S2_L002_R2_001") == "S-002"
+
+
+    @pytest.mark.parametrize("content", ["sample,path\na,b\n", ""])
+    def test_fail_sample_sheet_without_columns(self, tmp_path, content) -> None:
+        sample_sheet = tmp_path / "samples.csv"
+        sample_sheet.write_text(content)
+
+        with pytest.raises(ValueError, match="must have 'file' and 'sample' columns"):
+            read_sample_sheet(sample_sheet)
+
+
+    def test_fail_sample_sheet_does_not_exist(self) -> None:
+        with pytest.raises(FileNotFoundError, match="Sample sheet 'samples.csv' could not be found."):
+            read_sample_sheet("samples.csv")
+
+
+class TestMergeSummaries:
+    """Test merge_summaries()."""
+
+    def test_sums_counts_and_weights_by_read_count(self) -> None:
+        merged = merge_summaries([
+            {"read_count": 10, "base_count": 1000, "mean_quality": 30.0, "median_quality": 30.0, "mean_gc": None},
+            {"read_count": 30, "base_count": 3000, "mean_quality": 34.0, "median_quality": 36.0, "mean_gc": 50.0},
+        ])
+
+        assert merged == {
+            "read_count": 40,
+            "base_count": 4000,
+            "mean_quality": 33.0,
+            "median_quality": 36.0,
+            "mean_gc": 50.0,
+        }
+
+
+    def test_unweighted_without_reads(self) -> None:
+        merged = merge_summaries([
+            {"read_count": 0, "deduplicated_percentage": 100.0, "q30_fraction": None},
+            {"read_count": 0, "deduplicated_percentage": 90.0, "q30_fraction": None},
+        ])
+
+        assert merged == {"read_count": 0, "deduplicated_percentage": 95.0, "q30_fraction": None}
+
+
+    def test_weighted_median_of_medians(self) -> None:
+        merged = merge_summaries([
+            {"read_count": 10, "median_quality": 36.0},
+            {"read_count": 10, "median_quality": 30.0},
+            {"read_count": 5, "median_quality": 20.0},
+        ])
+
+        # half of the reads have a median of at most 30
+        assert merged == {"read_count": 25, "median_quality": 30.0}
+
+
+    def test_keeps_max_adapter_fraction(self) -> None:
+        merged = merge_summaries([
+            {"read_count": 90, "max_adapter_fraction": 0.01},
+            {"read_count": 10, "max_adapter_fraction": 0.2},
+        ])
+
+        assert merged == {"read_count": 100, "max_adapter_fraction": 0.2}
+
+
+    def test_keeps_worst_gate_outcome(self) -> None:
+        merged = merge_summaries([
+            {"read_count": 10, "qc_gate": "pass", "qc:reads": "pass", "qc:adapters": "pass"},
+            {"read_count": 0, "qc_gate": "fail", "qc:reads": "fail", "qc:adapters": "skipped"},
+        ])
+
+        assert merged == {"read_count": 10, "qc_gate": "fail", "qc:reads": "fail", "qc:adapters": "skipped"}
+
+
+class TestSampleMerger:
+    """Test SampleMerger."""
+
+    @pytest.fixture
+    def results(self) -> list[tuple[str, dict]]:
+        return [
+            ("A_S1_L001_R1_001", {"read_count": 10, "mean_gc": 40.0}),
+            ("B_S2_L001_R1_001", {"read_count": 5, "mean_gc": 45.0}),
+            ("A_S1_L001_R2_001", {"read_count": 30, "mean_gc": 60.0}),
+            ("C_S3_L001_R1_001", {"read_count": 1, "mean_gc": 50.0}),
+        ]
+
+
+    def test_yields_complete_samples_first(self, results) -> None:
+        merger = SampleMerger(expected={"A": 2, "B": 2, "C": 1})
+        merged = merger.fold(iter(results))
+
+        assert next(merged) == ("A", {"read_count": 40, "mean_gc": 55.0, "archives": 2})
+        assert next(merged) == ("C", {"read_count": 1, "mean_gc": 50.0, "archives": 1})
+        # samples with FastQC archives missing are yielded at the end
+        assert list(merged) == [("B", {"read_count": 5, "mean_gc": 45.0, "archives": 1})]
+
+
+    def test_drops_summaries(self, results) -> None:
+        merger = SampleMerger(drop=["read_count"])
+
+        assert list(merger.fold(results)) == [
+            ("A", {"mean_gc": 55.0, "archives": 2}),
+            ("B", {"mean_gc": 45.0, "archives": 1}),
+            ("C", {"mean_gc": 50.0, "archives": 1}),
+        ]
@@ -1,16 +1,71 @@
+from array import array
+import gzip
 import io
 from pathlib import Path
 import zipfile
 
 import pytest
 
+from fastqc_summary import parser
+
 from fastqc_summary.parser import (
     find_fastqc_data_file,
+    find_fastqc_data_path,
+    index_modules,
+    input_kind,
+    LazyRows,
     parse_modules,
+    read_module,
+    read_statuses,
     Module,
 )
 
 
+class TestModule:
+    """Test Module."""
+
+    @pytest.fixture
+    def seq_len_dist(self) -> Module:
+        return Module(
+            name="Sequence Length Distribution",
+            status="pass",
+            columns=["Length", "Count"],
+            data=["35\t1.0", "36\t2.5E1", "37\t3"],
+        )
+
+
+    def test_values_splits_column(self, seq_len_dist) -> None:
+        assert seq_len_dist.values("Length") == ("35", "36", "37")
+        assert seq_len_dist.values(1) == ("1.0", "2.5E1", "3")
+
+
+    @pytest.mark.parametrize("typecode, expected_counts", [
+        ("d", array("d", [1.0, 25.0, 3.0])),
+        ("q", array("q", [1, 25, 3])),
+    ])
+    def test_column_converts_to_typed_array(self, seq_len_dist, typecode, expected_counts) -> None:
+        assert seq_len_dist.column("Count", typecode) == expected_counts
+
+
+    def test_column_is_cached(self, seq_len_dist) -> None:
+        assert seq_len_dist.column("Count", "q") is seq_len_dist.column("Count", "q")
+
+
+    def test_column_fails_missing_column(self, seq_len_dist) -> None:
+        with pytest.raises(KeyError, match="Column 'Quality' not found in 'Sequence Length Distribution' module."):
+            seq_len_dist.column("Quality")
+
+
+    def test_column_fails_invalid_typecode(self, seq_len_dist) -> None:
+        with pytest.raises(ValueError, match="Type code must be one of"):
+            seq_len_dist.column("Count", "s")
+
+
+    def test_module_has_no_instance_dict(self, seq_len_dist) -> None:
+        with pytest.raises(AttributeError):
+            seq_len_dist.extra = "value"
+
+
 class TestParseModules:
     """Test parse_modules()."""
 
@@ -37,6 +92,281 @@ class TestParseModules:
         assert any(data_row.startswith("Total Sequences\t") for data_row in basic_stats_module.data)
 
 
+    @pytest.mark.parametrize("fastqc_zip_path, wanted", [
+        ("tests/data/SRR1067505_1_fastqc.zip", ["Sequence Length Distribution", "Basic Statistics"]),
+        ("tests/data/SRR1067505_1_fastqc.zip", ["Kmer Content"]),
+        ("tests/data/empty_fastqc.zip", ["Basic Statistics"]),
+    ])
+    def test_parse_modules_yields_only_wanted_modules(self, fastqc_zip_path, wanted) -> None:
+        all_modules = {module.name: module for module in parse_modules(fastqc_zip_path)}
+        wanted_modules = list(parse_modules(fastqc_zip_path, wanted=wanted))
+
+        assert sorted(module.name for module in wanted_modules) == sorted(wanted)
+        for module in wanted_modules:
+            assert module == all_modules[module.name]
+
+
+    def test_parse_modules_stops_after_wanted_modules(self, create_zip) -> None:
+        fastqc_zip_path = create_zip({
+            "test_fastqc/fastqc_data.txt": (
+                "##FastQC\t0.12.1\n"
+                ">>Basic Statistics\tpass\n"
+                "#Measure\tValue\n"
+                "Total Sequences\t10\n"
+                ">>END_MODULE\n"
+                ">>Broken module\n"
+            ),
+        })
+
+        # the malformed module header is never reached
+        modules = list(parse_modules(fastqc_zip_path, wanted={"Basic Statistics"}))
+
+        assert [module.name for module in modules] == ["Basic Statistics"]
+        assert modules[0].data == ["Total Sequences\t10"]
+
+
+    def test_parse_modules_keeps_header_properties(self) -> None:
+        seq_dup_levels = next(parse_modules("tests/data/SRR1067505_1_fastqc.zip", wanted={"Sequence Duplication Levels"}))
+
+        assert seq_dup_levels.properties == {"Total Deduplicated Percentage": "91.78842860607058"}
+        assert seq_dup_levels.columns == ["Duplication Level", "Percentage of deduplicated", "Percentage of total"]
+        assert seq_dup_levels.data[0].startswith("1\t")
+
+
+    def test_parse_modules_empty_wanted_yields_nothing(self) -> None:
+        assert list(parse_modules("tests/data/SRR1067505_1_fastqc.zip", wanted=set())) == []
+
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+    def test_parse_modules_across_chunk_boundaries(self, monkeypatch, chunk_size) -> None:
+        expected_modules = list(parse_modules("tests/data/SRR1067505_1_fastqc.zip"))
+        monkeypatch.setattr(parser, "_CHUNK_SIZE", chunk_size)
+
+        assert list(parse_modules("tests/data/SRR1067505_1_fastqc.zip")) == expected_modules
+
+
+    def test_parse_modules_strips_carriage_returns(self) -> None:
+        stream = io.BytesIO(
+            b"##FastQC\t0.12.1\r\n"
+            b">>Basic Statistics\tpass\r\n"
+            b"#Measure\tValue\r\n"
+            b"Total Sequences\t10\r\n"
+            b">>END_MODULE\r\n"
+        )
+
+        module = next(parse_modules(stream))
+
+        assert (module.name, module.status, module.columns) == ("Basic Statistics", "pass", ["Measure", "Value"])
+        assert module.data == ["Total Sequences\t10"]
+
+
+    def test_parse_modules_empty_module(self) -> None:
+        stream = io.BytesIO(b"##FastQC\t0.12.1\n>>Adapter Content\tpass\n>>END_MODULE\n")
+
+        module = next(parse_modules(stream))
+
+        assert (module.columns, len(module.data), list(module.data)) == ([], 0, [])
+
+
+    def test_parse_modules_spills_large_modules(self, monkeypatch) -> None:
+        expected_modules = list(parse_modules("tests/data/SRR1067505_1_fastqc.zip"))
+        monkeypatch.setattr(parser, "_CHUNK_SIZE", 7)
+
+        modules = list(parse_modules("tests/data/SRR1067505_1_fastqc.zip", max_rows=50))
+
+        assert modules == expected_modules
+        spilled = {module.name for module in modules if not isinstance(module.data._buffer, bytearray)}
+        assert spilled == {"Per tile sequence quality", "Per sequence GC content"}
+
+
+    def test_parse_modules_fails_negative_max_rows(self) -> None:
+        with pytest.raises(ValueError, match="Maximum number of rows must be at least 0"):
+            next(parse_modules("tests/data/SRR1067505_1_fastqc.zip", max_rows=-1))
+
+
+class TestModuleIndex:
+    """Test index_modules() and read_module()."""
+
+    @pytest.fixture
+    def fastqc_data(self) -> bytes:
+        with zipfile.ZipFile("tests/data/SRR1067505_1_fastqc.zip") as archive:
+            return archive.read("SRR1067505_1_fastqc/fastqc_data.txt")
+
+
+    def test_index_modules_spans_module_bodies(self, fastqc_data) -> None:
+        index = index_modules("tests/data/SRR1067505_1_fastqc.zip")
+
+        assert list(index) == [module.name for module in parse_modules("tests/data/SRR1067505_1_fastqc.zip")]
+        span = index["Basic Statistics"]
+        assert span.status == "pass"
+        assert fastqc_data[span.start:span.end].startswith(b"#Measure\tValue\n")
+        assert fastqc_data[span.end:].startswith(b"\n>>END_MODULE")
+
+
+    @pytest.mark.parametrize("chunk_size", [5, 4096])
+    @pytest.mark.parametrize("name", ["fastqc_data.txt", "fastqc_data.txt.gz", "archive.zip"])
+    def test_read_module_matches_parse_modules(self, tmp_path, monkeypatch, fastqc_data, chunk_size, name) -> None:
+        monkeypatch.setattr(parser, "_CHUNK_SIZE", chunk_size)
+        if name == "archive.zip":
+            with zipfile.ZipFile(tmp_path / name, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                archive.writestr("sample_fastqc/fastqc_data.txt", fastqc_data)
+        else:
+            (tmp_path / name).write_bytes(gzip.compress(fastqc_data) if name.endswith(".gz") else fastqc_data)
+
+        index = index_modules(str(tmp_path / name))
+
+        for module in parse_modules(str(tmp_path / name)):
+            assert read_module(str(tmp_path / name), index[module.name]) == module
+
+
+    def test_read_module_empty_module(self) -> None:
+        fastqc_data = b"##FastQC\t0.12.1\n>>Adapter Content\tpass\n>>END_MODULE\n"
+
+        span = index_modules(io.BytesIO(fastqc_data))["Adapter Content"]
+
+        assert span.start == span.end
+        assert read_module(io.BytesIO(fastqc_data), span) == Module("Adapter Content", "pass", [], [])
+
+
+class TestLazyRows:
+    """Test LazyRows."""
+
+    def test_counts_rows_without_decoding(self) -> None:
+        rows = LazyRows(b"1\t2\n3\t4")
+
+        assert len(rows) == 2
+        assert rows._rows is None
+
+
+    def test_decodes_rows_once(self) -> None:
+        rows = LazyRows(b"1\t2 \n3\t4")
+
+        assert rows[0] == "1\t2"
+        assert list(rows) == ["1\t2", "3\t4"]
+        assert rows == ["1\t2", "3\t4"]
+        assert not LazyRows(b"")
+
+
+    def test_streams_rows_from_file(self, tmp_path) -> None:
+        spill = (tmp_path / "rows").open("w+b")
+        spill.write(b"#Sequence\tCount\n1\t2\n3\t4\r\n")
+
+        rows = LazyRows(spill, start=16)
+
+        assert len(rows) == 2
+        assert list(rows) == ["1\t2", "3\t4"]
+        assert rows._rows is None
+        assert rows[1] == "3\t4"
+        assert spill.closed
+
+
+class TestModuleValues:
+    """Test Module.iter_values()."""
+
+    def test_iter_values_streams_column(self) -> None:
+        module = Module("Overrepresented sequences", "warn", ["Sequence", "Count", "Percentage"], ["A\t1\t0.5", "C\t2"])
+
+        assert list(module.iter_values("Percentage")) == ["0.5", ""]
+        assert list(module.iter_values(0)) == ["A", "C"]
+        with pytest.raises(KeyError, match="Column 'Source' not found"):
+            next(module.iter_values("Source"))
+
+
+class TestParseModulesInputs:
+    """Test parse_modules() on unzipped FastQC inputs."""
+
+    @pytest.fixture
+    def fastqc_data(self) -> bytes:
+        with zipfile.ZipFile("tests/data/SRR1067505_1_fastqc.zip") as archive:
+            return archive.read("SRR1067505_1_fastqc/fastqc_data.txt")
+
+
+    @pytest.fixture
+    def expected_modules(self) -> list[Module]:
+        return list(parse_modules("tests/data/SRR1067505_1_fastqc.zip"))
+
+
+    def test_parse_modules_extracted_directory(self, tmp_path, fastqc_data, expected_modules) -> None:
+        (tmp_path / "SRR1067505_1_fastqc").mkdir()
+        (tmp_path / "SRR1067505_1_fastqc" / "fastqc_data.txt").write_bytes(fastqc_data)
+
+        # both the parent of the FastQC output directory and the FastQC output directory itself are accepted
+        assert list(parse_modules(str(tmp_path))) == expected_modules
+        assert list(parse_modules(str(tmp_path / "SRR1067505_1_fastqc"))) == expected_modules
+
+
+    def test_parse_modules_plain_file(self, tmp_path, fastqc_data, expected_modules) -> None:
+        fastqc_data_path = tmp_path / "fastqc_data.txt"
+        fastqc_data_path.write_bytes(fastqc_data)
+
+        assert list(parse_modules(str(fastqc_data_path))) == expected_modules
+
+
+    def test_parse_modules_gzip_file(self, tmp_path, fastqc_data, expected_modules) -> None:
+        fastqc_data_path = tmp_path / "fastqc_data.txt.gz"
+        fastqc_data_path.write_bytes(gzip.compress(fastqc_data))
+
+        assert list(parse_modules(str(fastqc_data_path))) == expected_modules
+
+
+    @pytest.mark.parametrize("name, content, expected_kind", [
+        ("fastqc_data.txt", b"##FastQC\t0.12.1\n", "text"),
+        ("fastqc_data.txt.gz", gzip.compress(b"##FastQC\t0.12.1\n"), "gzip"),
+        # inputs are identified by content rather than by name
+        ("fastqc_data", gzip.compress(b"##FastQC\t0.12.1\n"), "gzip"),
+    ])
+    def test_input_kind(self, tmp_path, name, content, expected_kind) -> None:
+        (tmp_path / name).write_bytes(content)
+
+        assert input_kind(tmp_path / name) == expected_kind
+        assert input_kind("tests/data/SRR1067505_1_fastqc.zip") == "zip"
+
+
+    def test_parse_modules_open_zip_file(self, expected_modules) -> None:
+        with zipfile.ZipFile("tests/data/SRR1067505_1_fastqc.zip") as archive:
+            assert list(parse_modules(archive)) == expected_modules
+            # the archive is left open for reuse
+            assert list(parse_modules(archive, wanted={"Basic Statistics"})) == expected_modules[:1]
+
+
+    @pytest.mark.parametrize("compress", [
+        (lambda data: data),
+        (gzip.compress),
+    ])
+    def test_parse_modules_file_object(self, fastqc_data, expected_modules, compress) -> None:
+        stream = io.BytesIO(compress(fastqc_data))
+
+        assert list(parse_modules(stream)) == expected_modules
+        assert not stream.closed
+
+
+    def test_parse_modules_zip_file_object(self, expected_modules) -> None:
+        with open("tests/data/SRR1067505_1_fastqc.zip", "rb") as stream:
+            assert list(parse_modules(io.BytesIO(stream.read()))) == expected_modules
+
+
+    def test_parse_modules_fails_not_fastqc_data(self, tmp_path) -> None:
+        not_fastqc_data = tmp_path / "notes.txt"
+        not_fastqc_data.write_text("not FastQC data")
+
+        with pytest.raises(zipfile.BadZipFile, match="is not a valid ZIP file, FastQC output directory, or FastQC data file."):
+            list(parse_modules(str(not_fastqc_data)))
+
+
+    def test_find_fastqc_data_path_no_file(self, tmp_path) -> None:
+        with pytest.raises(FileNotFoundError, match="fastqc_data.txt not found in directory"):
+            find_fastqc_data_path(tmp_path)
+
+
+    def test_find_fastqc_data_path_multiple_files(self, tmp_path) -> None:
+        for sample in ("sample1_fastqc", "sample2_fastqc"):
+            (tmp_path / sample).mkdir()
+            (tmp_path / sample / "fastqc_data.txt").write_text("##FastQC\t0.12.1\n")
+
+        with pytest.raises(ValueError, match="Multiple fastqc_data.txt files found in directory"):
+            find_fastqc_data_path(tmp_path)
+
+
 class TestFindFastqcDataFile:
     """Test find_fastqc_data_file()."""
 
@@ -73,3 +403,53 @@ class TestFindFastqcDataFile:
         with zipfile.ZipFile(zip_buffer) as archive:
             with pytest.raises(ValueError, match="Multiple fastqc_data.txt files found in archive: "):
                 find_fastqc_data_file(archive)
+
+
+class TestReadStatuses:
+    """Test read_statuses()."""
+
+    @pytest.fixture
+    def fastqc_data(self) -> bytes:
+        with zipfile.ZipFile("tests/data/SRR1067505_1_fastqc.zip") as archive:
+            return archive.read("SRR1067505_1_fastqc/fastqc_data.txt")
+
+
+    @pytest.fixture
+    def expected_statuses(self) -> dict[str, str]:
+        return {module.name: module.status for module in parse_modules("tests/data/SRR1067505_1_fastqc.zip")}
+
+
+    def test_read_statuses_summary_file(self, monkeypatch, expected_statuses) -> None:
+        # the statuses of FastQC archives are read from summary.txt without scanning fastqc_data.txt
+        monkeypatch.setattr(parser, "index_modules", None)
+
+        assert read_statuses("tests/data/SRR1067505_1_fastqc.zip") == expected_statuses
+        with open("tests/data/SRR1067505_1_fastqc.zip", "rb") as fastqc_file:
+            assert read_statuses(io.BytesIO(fastqc_file.read())) == expected_statuses
+        with zipfile.ZipFile("tests/data/SRR1067505_1_fastqc.zip") as archive:
+            assert read_statuses(archive) == expected_statuses
+
+
+    def test_read_statuses_directory(self, tmp_path, fastqc_data, expected_statuses) -> None:
+        (tmp_path / "SRR1067505_1_fastqc").mkdir()
+        (tmp_path / "SRR1067505_1_fastqc" / "fastqc_data.txt").write_bytes(fastqc_data)
+        assert read_statuses(str(tmp_path)) == expected_statuses
+
+        (tmp_path / "SRR1067505_1_fastqc" / "summary.txt").write_text("WARN\tBasic Statistics\tSRR1067505_1.fastq.gz\n")
+        assert read_statuses(str(tmp_path)) == {"Basic Statistics": "warn"}
+
+
+    @pytest.mark.parametrize("name", ["fastqc_data.txt", "fastqc_data.txt.gz"])
+    def test_read_statuses_module_headers(self, tmp_path, fastqc_data, expected_statuses, name) -> None:
+        (tmp_path / name).write_bytes(gzip.compress(fastqc_data) if name.endswith(".gz") else fastqc_data)
+
+        assert read_statuses(str(tmp_path / name)) == expected_statuses
+
+
+    @pytest.mark.parametrize("summary", [None, "", "Basic Statistics\tpass\n"])
+    def test_read_statuses_falls_back_to_module_headers(self, create_zip, fastqc_data, expected_statuses, summary) -> None:
+        files = {"sample_fastqc/fastqc_data.txt": fastqc_data}
+        if summary is not None:
+            files["sample_fastqc/summary.txt"] = summary
+
+        assert read_statuses(str(create_zip(files))) == expected_statuses
@@ -0,0 +1,183 @@
+import gzip
+import http.client
+import json
+import shutil
+import socket
+import threading
+import time
+from unittest.mock import patch
+import urllib.error
+import urllib.request
+import zipfile
+
+import pytest
+
+from fastqc_summary.batch import summarize_archive
+from fastqc_summary.serve import make_server, SummaryService
+
+
+@pytest.fixture
+def service():
+    with SummaryService("tests/data", workers=2, executor="thread", max_entries=1) as service:
+        yield service
+
+
+@pytest.fixture
+def server_url(service):
+    """URL of a summary server running in a background thread."""
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def get(url: str) -> tuple[int, dict]:
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+class TestSummaryService:
+    """Test SummaryService."""
+
+    def test_summarize_reuses_recent_summaries(self, service) -> None:
+        first = service.summarize("SRR1067505_1_fastqc.zip")
+        second = service.summarize("SRR1067505_1_fastqc.zip")
+
+        assert first == second == summarize_archive("tests/data/SRR1067505_1_fastqc.zip")
+        metrics = service.metrics()
+        assert (metrics["requests"], metrics["hits"], metrics["misses"]) == (2, 1, 1)
+
+
+    def test_summarize_evicts_least_recently_used(self, service) -> None:
+        service.summarize("SRR1067505_1_fastqc.zip")
+        service.summarize("empty_fastqc.zip")
+        service.summarize("SRR1067505_1_fastqc.zip")
+
+        assert service.metrics()["hits"] == 0
+        assert service.metrics()["cached"] == 1
+
+
+    def test_summarize_recomputes_modified_archive(self, tmp_path) -> None:
+        shutil.copy("tests/data/empty_fastqc.zip", tmp_path / "sample_fastqc.zip")
+        with SummaryService(tmp_path, executor="thread") as service:
+            service.summarize("sample_fastqc.zip")
+            shutil.copy("tests/data/SRR1067505_1_fastqc.zip", tmp_path / "sample_fastqc.zip")
+
+            assert service.summarize("sample_fastqc.zip")["read_count"] == 18361776
+
+
+    def test_summarize_coalesces_concurrent_requests(self, service) -> None:
+        release = threading.Event()
+
+        def blocked_summarize_archive(*args):
+            release.wait(timeout=5)
+            return summarize_archive(*args)
+
+        with patch("fastqc_summary.serve.summarize_archive", blocked_summarize_archive):
+            results = []
+            threads = [
+                threading.Thread(target=lambda: results.append(service.summarize("SRR1067505_1_fastqc.zip")))
+                for _ in range(3)
+            ]
+            for thread in threads:
+                thread.start()
+            # wait for every request to be waiting on the same computation
+            while service.metrics()["active_requests"] < 3:
+                time.sleep(0.001)
+            assert service.metrics()["queue_depth"] == 1
+            release.set()
+            for thread in threads:
+                thread.join()
+
+        metrics = service.metrics()
+        assert (metrics["misses"], metrics["coalesced"]) == (1, 2)
+        assert len(results) == 3 and all(result["read_count"] == 18361776 for result in results)
+
+
+    def test_summarize_refuses_paths_outside_root(self, service) -> None:
+        with pytest.raises(PermissionError, match="outside of the served directory"):
+            service.summarize("../pyproject.toml")
+
+
+    def test_summarize_process_workers(self) -> None:
+        with SummaryService("tests/data", workers=2, executor="process") as service:
+            assert service.summarize("empty_fastqc.zip") == {"read_count": 0, "base_count": 0}
+
+
+class TestSummaryServer:
+    """Test the HTTP endpoints of make_server()."""
+
+    def test_summary(self, server_url) -> None:
+        status, body = get(f"{server_url}/summary?path=SRR1067505_1_fastqc.zip&summaries=read_count")
+
+        assert status == 200
+        assert body == {"sample": "SRR1067505_1", "read_count": 18361776}
+
+
+    @pytest.mark.parametrize("query, expected_status", [
+        ("", 400),
+        ("?path=SRR1067505_1_fastqc.zip&summaries=unknown", 400),
+        ("?path=SRR1067505_1_fastqc.zip&length_mode=unknown", 400),
+        ("?path=missing_fastqc.zip", 404),
+        ("?path=../pyproject.toml", 403),
+    ])
+    def test_summary_fails_invalid_request(self, server_url, query, expected_status) -> None:
+        status, body = get(f"{server_url}/summary{query}")
+
+        assert status == expected_status
+        assert "error" in body
+
+
+    def test_summary_fails_unexpected_error(self, tmp_path) -> None:
+        # a truncated gzip file raises EOFError, which is none of the errors of invalid requests
+        with zipfile.ZipFile("tests/data/SRR1067505_1_fastqc.zip") as archive:
+            payload = gzip.compress(archive.read("SRR1067505_1_fastqc/fastqc_data.txt"))
+        (tmp_path / "fastqc_data.txt.gz").write_bytes(payload[:len(payload) // 2])
+
+        with SummaryService(tmp_path, executor="thread") as service:
+            server = make_server(service, port=0)
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                status, body = get(f"http://127.0.0.1:{server.server_address[1]}/summary?path=fastqc_data.txt.gz")
+            finally:
+                server.shutdown()
+                server.server_close()
+
+        assert status == 500
+        assert body["error"].startswith("EOFError")
+
+
+    def test_metrics(self, server_url) -> None:
+        get(f"{server_url}/summary?path=empty_fastqc.zip")
+
+        status, body = get(f"{server_url}/metrics")
+
+        assert status == 200
+        assert body["requests"] == 1
+        assert body["latency_seconds"]["window"] == 1
+        assert body["latency_seconds"]["p99"] > 0
+
+
+    def test_unix_socket(self, service, tmp_path) -> None:
+        socket_path = str(tmp_path / "summary.sock")
+        server = make_server(service, socket_path=socket_path)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(socket_path)
+        connection = http.client.HTTPConnection("localhost")
+        connection.sock = client
+        connection.request("GET", "/health")
+        response = connection.getresponse()
+
+        assert (response.status, json.load(response)) == (200, {"status": "ok"})
+        connection.close()
+        server.shutdown()
+        server.server_close()
+        assert not (tmp_path / "summary.sock").exists()
@@ -1,12 +1,86 @@
 import pytest
 
-from fastqc_summary.parser import Module
+from fastqc_summary.constants import SUMMARY_NAMES
+from fastqc_summary.parser import Module, parse_modules
 from fastqc_summary.summaries import (
+    compute_summaries,
+    register_summary,
+    required_modules,
     summarize_base_count,
+    summarize_deduplicated_percentage,
+    summarize_max_adapter_fraction,
+    summarize_overrepresented_fraction,
+    summarize_mean_gc,
+    summarize_mean_quality,
+    summarize_median_quality,
+    summarize_q30_fraction,
     summarize_read_count,
+    SUMMARIES,
 )
 
 
+class TestSummaryRegistry:
+    @pytest.fixture
+    def registered_summary(self):
+        @register_summary("test_module_count", modules=["Basic Statistics", "Kmer Content"])
+        def summarize_test(basic_stats: Module, kmer_content: Module, *, scale: int = 1) -> dict[str, int]:
+            return {"test_module_count": 2 * scale}
+
+        yield SUMMARIES["test_module_count"]
+        del SUMMARIES["test_module_count"]
+
+
+    def test_summary_names_match_registry(self):
+        # the CLI validates summaries against the names without importing the registry
+        assert tuple(SUMMARIES) == SUMMARY_NAMES
+
+
+    def test_required_modules_defaults(self):
+        assert required_modules() == {"Basic Statistics", "Sequence Length Distribution"}
+
+
+    def test_registered_summary_declares_modules_and_options(self, registered_summary):
+        assert registered_summary.modules == ("Basic Statistics", "Kmer Content")
+        assert registered_summary.options == ("scale",)
+        assert required_modules(["read_count", "test_module_count"]) == {"Basic Statistics", "Kmer Content"}
+
+
+    def test_compute_summaries_single_pass(self, registered_summary):
+        names = ["read_count", "test_module_count"]
+        modules = parse_modules("tests/data/SRR1067505_1_fastqc.zip", wanted=required_modules(names))
+
+        summaries = compute_summaries(modules, names, scale=3, length_mode="upper")
+
+        assert summaries == {"read_count": 18361776, "test_module_count": 6}
+
+
+    def test_compute_summaries_error_missing_module(self):
+        with pytest.raises(ValueError, match="Module 'Basic Statistics' needed by summary 'read_count' not found."):
+            compute_summaries([], ["read_count"])
+
+
+    def test_compute_summaries_error_missing_column(self):
+        per_seq_gc = Module(name="Per sequence GC content", status="pass", columns=["GC Content", "Reads"], data=["40\t1.0"])
+
+        with pytest.raises(ValueError, match=r"Column 'Count' needed by summary 'mean_gc' not found in \['Per sequence GC content'\]."):
+            compute_summaries([per_seq_gc], ["mean_gc"])
+
+
+    def test_compute_summaries_error_unknown_summary(self):
+        with pytest.raises(KeyError, match="Summary 'gc' is not registered."):
+            compute_summaries([], ["gc"])
+
+
+    def test_register_summary_error_invalid_merge(self):
+        with pytest.raises(ValueError, match="Merge rule must be one of"):
+            register_summary("test_invalid_merge", modules=["Basic Statistics"], merge="mode")
+
+
+    def test_register_summary_error_duplicate_name(self):
+        with pytest.raises(ValueError, match="Summary 'read_count' is already registered."):
+            register_summary("read_count", modules=["Basic Statistics"])(summarize_read_count)
+
+
 class TestSummarizeReadCount:
     @pytest.mark.parametrize("basic_stats_module, expected_read_count", [
         ("basic_stats_empty", 0),
@@ -51,6 +125,177 @@ class TestSummarizeBaseCount:
         assert actual_base_count.get("base_count") == expected_base_count
 
 
+    @pytest.mark.parametrize("length_mode, expected_base_count", [
+        ("lower", 35 * 2 + 40 * 3 + 50),
+        ("midpoint", 37 * 2 + 42 * 3 + 50),
+        ("upper", 39 * 2 + 44 * 3 + 50),
+    ])
+    def test_summarize_base_count_binned_lengths(self, seq_len_dist_binned, length_mode, expected_base_count):
+        actual_base_count = summarize_base_count(seq_len_dist_binned, length_mode=length_mode)
+
+        assert actual_base_count.get("base_count") == expected_base_count
+
+
+    def test_summarize_base_count_midpoint_rounds_to_nearest_base(self):
+        seq_len_dist = Module(
+            name="Sequence Length Distribution",
+            status="warn",
+            columns=["Length", "Count"],
+            data=["35-38\t3.0"],
+        )
+
+        assert summarize_base_count(seq_len_dist).get("base_count") == 110
+
+
+    @pytest.mark.parametrize("count, expected_base_count", [
+        # exactly representable as a float
+        ("1.8361776E7", 36 * 18361776),
+        # too many digits to be represented exactly as a float
+        ("12345678901234567.0", 36 * 12345678901234567),
+        ("1.2345678901234567E16", 36 * 12345678901234567),
+    ])
+    def test_summarize_base_count_exact_counts(self, count, expected_base_count):
+        seq_len_dist = Module(
+            name="Sequence Length Distribution",
+            status="warn",
+            columns=["Length", "Count"],
+            data=[f"36\t{count}"],
+        )
+
+        assert summarize_base_count(seq_len_dist).get("base_count") == expected_base_count
+
+
+    def test_summarize_base_count_error_invalid_length_mode(self, seq_len_dist_ngs_test):
+        with pytest.raises(ValueError, match="Length mode must be one of"):
+            summarize_base_count(seq_len_dist_ngs_test, length_mode="mean")
+
+
+class TestQualitySummaries:
+    @pytest.mark.parametrize("fastqc_zip_path, expected_summaries", [
+        ("tests/data/SRR1067505_1_fastqc.zip", {
+            "mean_quality": pytest.approx(31.73495407585362),
+            "median_quality": 34.0,
+            "q30_fraction": pytest.approx(0.8516989315194783),
+            "mean_gc": pytest.approx(47.265967775592976),
+            "deduplicated_percentage": pytest.approx(91.78842860607058),
+            "max_adapter_fraction": pytest.approx(1.2035872782676361e-05),
+            "overrepresented_fraction": 0.0,
+        }),
+        # FastQC leaves out the quality modules and the adapter content for empty FASTQ files
+        ("tests/data/empty_fastqc.zip", {
+            "mean_quality": None,
+            "median_quality": None,
+            "q30_fraction": None,
+            "mean_gc": None,
+            "deduplicated_percentage": 100.0,
+            "max_adapter_fraction": None,
+            "overrepresented_fraction": 0.0,
+        }),
+    ])
+    def test_compute_summaries_from_archive(self, fastqc_zip_path, expected_summaries):
+        names = list(expected_summaries)
+        modules = parse_modules(fastqc_zip_path, wanted=required_modules(names))
+
+        assert compute_summaries(modules, names) == expected_summaries
+
+
+    def test_summarize_mean_and_median_quality_weight_binned_positions(self, per_base_quality_binned):
+        assert summarize_mean_quality(per_base_quality_binned) == {"mean_quality": (30.0 + 4 * 20.0 + 5 * 36.0) / 10}
+        assert summarize_median_quality(per_base_quality_binned) == {"median_quality": 31.0}
+
+
+    def test_summarize_q30_fraction(self):
+        per_seq_quality = Module(
+            name="Per sequence quality scores",
+            status="pass",
+            columns=["Quality", "Count"],
+            data=["28\t1.0", "29\t2.0", "30\t3.0", "35\t4.0"],
+        )
+
+        assert summarize_q30_fraction(per_seq_quality) == {"q30_fraction": 0.7}
+
+
+    def test_summarize_mean_gc(self):
+        per_seq_gc = Module(
+            name="Per sequence GC content",
+            status="pass",
+            columns=["GC Content", "Count"],
+            data=["40\t1.0", "50\t2.5", "60\t1.5"],
+        )
+
+        assert summarize_mean_gc(per_seq_gc) == {"mean_gc": 51.0}
+
+
+    def test_summarize_max_adapter_fraction(self):
+        adapter_content = Module(
+            name="Adapter Content",
+            status="warn",
+            columns=["Position", "Illumina Universal Adapter", "Nextera Transposase Sequence"],
+            data=["1\t0.0\t0.5", "2\t2.5\t1.0", "3-4\t12.5\t1.5"],
+        )
+
+        assert summarize_max_adapter_fraction(adapter_content) == {"max_adapter_fraction": 0.125}
+
+
+    def test_summarize_overrepresented_fraction(self):
+        overrepresented = Module(
+            name="Overrepresented sequences",
+            status="warn",
+            columns=["Sequence", "Count", "Percentage", "Possible Source"],
+            data=["ACGT\t30\t1.5\tNo Hit", "TTTT\t20\t1.0\tNo Hit"],
+        )
+
+        assert summarize_overrepresented_fraction(overrepresented) == {"overrepresented_fraction": 0.025}
+
+
+    def test_summarize_deduplicated_percentage_error_no_property(self):
+        seq_dup_levels = Module(
+            name="Sequence Duplication Levels",
+            status="pass",
+            columns=["Duplication Level", "Percentage of total"],
+            data=["1\t100.0"],
+        )
+
+        with pytest.raises(ValueError, match="Total deduplicated percentage not found"):
+            summarize_deduplicated_percentage(seq_dup_levels)
+
+
+@pytest.fixture
+def per_base_quality_binned() -> Module:
+    """Per base sequence quality module with binned positions."""
+
+    per_base_quality = Module(
+        name="Per base sequence quality",
+        status="pass",
+        columns=["Base", "Mean", "Median"],
+        data=[
+            "1\t30.0\t31.0",
+            "2-5\t20.0\t22.0",
+            "6-10\t36.0\t36.0",
+        ]
+    )
+
+    return per_base_quality
+
+
+@pytest.fixture
+def seq_len_dist_binned() -> Module:
+    """Sequence Lengh Distribution module with binned lengths."""
+
+    seq_len_dist = Module(
+        name="Sequence Length Distribution",
+        status="warn",
+        columns=["Length", "Count"],
+        data=[
+            "35-39\t2.0",
+            "40-44\t3.0",
+            "50\t1.0",
+        ]
+    )
+
+    return seq_len_dist
+
+
 @pytest.fixture
 def basic_stats_empty() -> Module:
     """Basic Statistics module from FastQC file from empty FASTQ."""
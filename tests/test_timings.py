@@ -0,0 +1,88 @@
+import mmap
+from types import SimpleNamespace
+
+import pytest
+
+from fastqc_summary import timings
+from fastqc_summary.batch import summarize_many
+from fastqc_summary.cache import SummaryCache
+from fastqc_summary.timings import ArchiveProfiler, PHASES, TimingsRecorder
+
+
+class TestArchiveProfiler:
+    """Test ArchiveProfiler."""
+
+    def test_charges_innermost_phase(self, monkeypatch) -> None:
+        # a fake clock that only moves when told to keeps the test exact under load
+        clock = [0.0]
+        monkeypatch.setattr(timings, "time", SimpleNamespace(perf_counter=lambda: clock[0], thread_time=lambda: clock[0] / 2))
+        profiler = ArchiveProfiler()
+
+        profiler.push("summarize")
+        clock[0] += 0.01
+        profiler.push("parse")
+        clock[0] += 0.02
+        profiler.pop()
+        clock[0] += 0.03
+        profiler.pop()
+        # time outside of every phase is not charged
+        clock[0] += 0.04
+
+        assert profiler.timings.wall_seconds == pytest.approx({"read": 0.0, "parse": 0.02, "summarize": 0.04, "export": 0.0, "write": 0.0})
+        assert profiler.timings.cpu_seconds["parse"] == pytest.approx(0.01)
+
+
+    def test_counts_lines_and_modules(self) -> None:
+        profiler = ArchiveProfiler()
+
+        buffer, chunks = profiler.buffer(b"##FastQC\t0.12.1\n", [b">>END_MODULE\n"])
+        assert (buffer, list(chunks)) == (b"##FastQC\t0.12.1\n", [b">>END_MODULE\n"])
+        assert list(profiler.modules("ab")) == ["a", "b"]
+        assert (profiler.timings.lines, profiler.timings.bytes, profiler.timings.modules) == (2, 29, 2)
+
+
+    def test_counts_lines_of_memory_mapped_files(self, tmp_path, monkeypatch) -> None:
+        monkeypatch.setattr(timings, "COUNT_CHUNK_SIZE", 4)
+        path = tmp_path / "fastqc_data.txt"
+        path.write_bytes(b"a\nbc\n\ndefgh\nij")
+        profiler = ArchiveProfiler()
+
+        with path.open("rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            assert profiler.buffer(buffer, [])[0] is buffer
+
+        assert (profiler.timings.lines, profiler.timings.bytes) == (4, 14)
+
+
+class TestTimingsRecorder:
+    """Test TimingsRecorder."""
+
+    @pytest.mark.parametrize("workers, executor, ordered", [
+        (1, "process", True),
+        (2, "thread", True),
+        (2, "thread", False),
+    ])
+    def test_records_every_archive(self, workers, executor, ordered) -> None:
+        recorder = TimingsRecorder()
+        fastqc_archives = ["tests/data/SRR1067505_1_fastqc.zip", "tests/data/empty_fastqc.zip"]
+
+        results = summarize_many(fastqc_archives, workers=workers, executor=executor, ordered=ordered, on_timings=recorder.add)
+        samples = [sample for sample, _ in recorder.fold(results)]
+
+        report = recorder.report()
+        assert sorted(timings["sample"] for timings in report["archives"]) == sorted(samples)
+        assert set(report["totals"]["wall_seconds"]) == set(PHASES)
+        assert report["totals"]["archives"] == 2
+        assert report["totals"]["modules"] == 4
+        assert report["totals"]["lines"] > 0
+        assert all(timings["wall_seconds"]["parse"] > 0 for timings in report["archives"])
+
+
+    def test_cached_summaries_are_not_timed(self, tmp_path) -> None:
+        fastqc_archives = ["tests/data/SRR1067505_1_fastqc.zip"]
+        with SummaryCache(tmp_path) as cache:
+            list(summarize_many(fastqc_archives, cache=cache))
+
+            recorder = TimingsRecorder()
+            list(recorder.fold(summarize_many(fastqc_archives, cache=cache, on_timings=recorder.add)))
+
+        assert recorder.report()["archives"] == []
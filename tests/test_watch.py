@@ -0,0 +1,150 @@
+import os
+import shutil
+import zipfile
+
+import pytest
+
+from fastqc_summary.batch import summary_options
+from fastqc_summary.watch import summarize_changed, watch, WatchState
+
+
+@pytest.fixture
+def watch_dir(tmp_path):
+    """Directory with two FastQC archives, one in a subdirectory."""
+    watch_dir = tmp_path / "run"
+    (watch_dir / "lane1").mkdir(parents=True)
+    shutil.copy("tests/data/SRR1067505_1_fastqc.zip", watch_dir / "SRR1067505_1_fastqc.zip")
+    shutil.copy("tests/data/empty_fastqc.zip", watch_dir / "lane1" / "empty_fastqc.zip")
+
+    return watch_dir
+
+
+class TestWatchState:
+    """Test WatchState."""
+
+    def test_state_persists_records(self, tmp_path) -> None:
+        archive = tmp_path / "a_fastqc.zip"
+        archive.write_bytes(b"PK")
+        stat = archive.stat()
+
+        with WatchState(tmp_path / "state.ndjson") as state:
+            state.record(archive, stat, "{}", {"read_count": 1})
+
+        with WatchState(tmp_path / "state.ndjson") as state:
+            assert state.get(archive).summaries == {"read_count": 1}
+            assert state.is_current(archive, stat, "{}")
+            assert not state.is_current(archive, stat, '{"length_mode": "upper"}')
+
+
+    def test_state_compacts_repeated_records(self, tmp_path) -> None:
+        archive = tmp_path / "a_fastqc.zip"
+        archive.write_bytes(b"PK")
+
+        with WatchState(tmp_path / "state.ndjson") as state:
+            state.record(archive, archive.stat(), "{}", {"read_count": 1})
+            state.record(archive, archive.stat(), "{}", {"read_count": 2})
+
+        with WatchState(tmp_path / "state.ndjson") as state:
+            assert state.get(archive).summaries == {"read_count": 2}
+
+        assert len((tmp_path / "state.ndjson").read_text().splitlines()) == 1
+
+
+class TestSummarizeChanged:
+    """Test summarize_changed()."""
+
+    def test_summarizes_only_new_or_modified_archives(self, watch_dir, tmp_path) -> None:
+        with WatchState(tmp_path / "state.ndjson") as state:
+            first = list(summarize_changed(watch_dir, state))
+            second = list(summarize_changed(watch_dir, state))
+
+            # a modified archive is summarized again
+            archive = watch_dir / "lane1" / "empty_fastqc.zip"
+            os.utime(archive, ns=(archive.stat().st_atime_ns, archive.stat().st_mtime_ns + 1_000_000_000))
+            third = list(summarize_changed(watch_dir, state))
+
+        assert first == [
+            ("SRR1067505_1", {"read_count": 18361776, "base_count": 661023936}),
+            ("empty", {"read_count": 0, "base_count": 0}),
+        ]
+        assert second == []
+        assert third == [("empty", {"read_count": 0, "base_count": 0})]
+
+
+    def test_summarizes_again_with_new_options(self, watch_dir, tmp_path) -> None:
+        with WatchState(tmp_path / "state.ndjson") as state:
+            list(summarize_changed(watch_dir, state))
+            results = list(summarize_changed(watch_dir, state, summary_names=["read_count"]))
+
+            assert state.get(watch_dir / "SRR1067505_1_fastqc.zip").options == summary_options(summary_names=["read_count"])
+
+        assert results == [("SRR1067505_1", {"read_count": 18361776}), ("empty", {"read_count": 0})]
+
+
+    def test_skips_incomplete_archives(self, watch_dir, tmp_path) -> None:
+        partial = watch_dir / "partial_fastqc.zip"
+        partial.write_bytes(open("tests/data/empty_fastqc.zip", "rb").read()[:1024])
+
+        with WatchState(tmp_path / "state.ndjson") as state:
+            samples = [sample for sample, _ in summarize_changed(watch_dir, state)]
+
+            assert state.get(partial) is None
+
+        assert samples == ["SRR1067505_1", "empty"]
+
+
+    def test_records_failed_archives_until_they_change(self, watch_dir, tmp_path) -> None:
+        # a complete ZIP archive without FastQC data, which fails every time it is summarized
+        bad = watch_dir / "bad_fastqc.zip"
+        with zipfile.ZipFile(bad, "w") as archive:
+            archive.writestr("bad_fastqc/notes.txt", "no FastQC data")
+        errors = []
+
+        with WatchState(tmp_path / "state.ndjson") as state:
+            samples = [sample for sample, _ in summarize_changed(watch_dir, state, on_error=lambda path, error: errors.append(path))]
+
+        assert samples == ["SRR1067505_1", "empty"]
+        assert errors == [str(bad)]
+
+        # the failure is recorded, so a restarted watcher skips the archive until it changes
+        with WatchState(tmp_path / "state.ndjson") as state:
+            assert state.get(bad).error == "FileNotFoundError: fastqc_data.txt not found in archive"
+            assert list(summarize_changed(watch_dir, state, on_error=lambda path, error: errors.append(path))) == []
+
+            shutil.copy("tests/data/empty_fastqc.zip", bad)
+            os.utime(bad, ns=(bad.stat().st_atime_ns, bad.stat().st_mtime_ns + 1))
+            assert [sample for sample, _ in summarize_changed(watch_dir, state)] == ["bad"]
+            assert state.get(bad).error is None
+
+        assert errors == [str(bad)]
+
+
+    def test_records_only_taken_summaries(self, watch_dir, tmp_path) -> None:
+        with WatchState(tmp_path / "state.ndjson") as state:
+            results = summarize_changed(watch_dir, state)
+            next(results)
+            results.close()
+
+            # the archive handed out when interrupted is summarized again
+            assert [sample for sample, _ in summarize_changed(watch_dir, state)] == ["SRR1067505_1", "empty"]
+
+
+class TestWatch:
+    """Test watch()."""
+
+    def test_polls_for_new_archives(self, watch_dir, tmp_path) -> None:
+        with WatchState(tmp_path / "state.ndjson") as state:
+            results = watch(watch_dir, state, poll=0.01)
+            samples = [next(results)[0], next(results)[0]]
+
+            shutil.copy("tests/data/empty_fastqc.zip", watch_dir / "new_fastqc.zip")
+            samples.append(next(results)[0])
+            results.close()
+
+        assert samples == ["SRR1067505_1", "empty", "new"]
+
+
+    def test_fail_invalid_poll(self, watch_dir, tmp_path) -> None:
+        with WatchState(tmp_path / "state.ndjson") as state:
+            with pytest.raises(ValueError, match="Poll interval must be greater than 0"):
+                next(watch(watch_dir, state, poll=0))
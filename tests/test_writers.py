@@ -0,0 +1,118 @@
+import io
+import json
+
+import pytest
+
+from fastqc_summary.writers import make_writer
+
+
+RECORDS = [
+    ("SRR1067505_1", {"read_count": 18361776, "base_count": 661023936}),
+    ("empty", {"read_count": 0, "base_count": 0}),
+]
+
+
+class TestWriters:
+    """Test writers of summaries."""
+
+    def test_json_writes_single_object(self) -> None:
+        output = io.StringIO()
+
+        with make_writer("json", output) as writer:
+            writer.write(*RECORDS[0])
+
+        assert json.loads(output.getvalue()) == RECORDS[0][1]
+
+
+    def test_json_fails_multiple_records(self) -> None:
+        with make_writer("json", io.StringIO()) as writer:
+            writer.write(*RECORDS[0])
+            with pytest.raises(ValueError, match="Use NDJSON output instead."):
+                writer.write(*RECORDS[1])
+
+
+    def test_ndjson_writes_one_object_per_line(self) -> None:
+        output = io.StringIO()
+
+        with make_writer("ndjson", output) as writer:
+            for record in RECORDS:
+                writer.write(*record)
+
+        assert [json.loads(line) for line in output.getvalue().splitlines()] == [
+            {"sample": "SRR1067505_1", "read_count": 18361776, "base_count": 661023936},
+            {"sample": "empty", "read_count": 0, "base_count": 0},
+        ]
+
+
+    @pytest.mark.parametrize("output_format, delimiter", [
+        ("tsv", "\t"),
+        ("csv", ","),
+    ])
+    def test_delimited_writes_header_and_rows(self, output_format, delimiter) -> None:
+        output = io.StringIO()
+
+        with make_writer(output_format, output) as writer:
+            for record in RECORDS:
+                writer.write(*record)
+
+        assert output.getvalue().splitlines() == [
+            delimiter.join(["sample", "read_count", "base_count"]),
+            delimiter.join(["SRR1067505_1", "18361776", "661023936"]),
+            delimiter.join(["empty", "0", "0"]),
+        ]
+
+
+    def test_delimited_writes_fixed_columns(self) -> None:
+        output = io.StringIO()
+
+        with make_writer("tsv", output, columns=["Basic Statistics", "Adapter Content"]) as writer:
+            writer.write("a", {"Basic Statistics": "pass"})
+            writer.write("b", {"Basic Statistics": "pass", "Adapter Content": "warn"})
+
+            # columns outside of the fixed header are not silently dropped
+            with pytest.raises(ValueError, match="Summaries of 'c' hold \\['Kmer Content'\\], which are not columns"):
+                writer.write("c", {"Kmer Content": "fail"})
+
+        assert output.getvalue().splitlines() == [
+            "sample\tBasic Statistics\tAdapter Content",
+            "a\tpass\t",
+            "b\tpass\twarn",
+        ]
+
+
+    def test_delimited_collects_other_columns(self) -> None:
+        output = io.StringIO()
+
+        with make_writer("csv", output, columns=["Basic Statistics"], other="other") as writer:
+            writer.write("a", {"Basic Statistics": "pass"})
+            writer.write("b", {"Basic Statistics": "warn", "Per base GC content": "fail", "Kmer Content": "pass"})
+
+        assert output.getvalue().splitlines() == [
+            "sample,Basic Statistics,other",
+            "a,pass,",
+            "b,warn,Per base GC content=fail;Kmer Content=pass",
+        ]
+
+
+    def test_flushes_every_n_records(self) -> None:
+        class CountingStringIO(io.StringIO):
+            flushes = 0
+
+            def flush(self) -> None:
+                self.flushes += 1
+
+        output = CountingStringIO()
+        writer = make_writer("ndjson", output, flush_every=2)
+        for record in RECORDS * 2:
+            writer.write(*record)
+
+        assert output.flushes == 2
+
+
+    @pytest.mark.parametrize("output_format, flush_every, message", [
+        ("parquet", 1, "Output format must be one of"),
+        ("ndjson", 0, "Records between flushes must be at least 1"),
+    ])
+    def test_fails_invalid_writer(self, output_format, flush_every, message) -> None:
+        with pytest.raises(ValueError, match=message):
+            make_writer(output_format, io.StringIO(), flush_every)